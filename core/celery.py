@@ -1,7 +1,7 @@
 from __future__ import absolute_import, unicode_literals
 import os
 from celery import Celery
-from celery.signals import task_postrun, task_prerun
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown
 from django.db import close_old_connections
 
 # Set the default Django settings module for the 'celery' program.
@@ -16,38 +16,40 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
 
-# Configure Celery to use Django-DB as result backend
+# Results are ignored by default (CELERY_TASK_IGNORE_RESULT); only the
+# long-running tasks in CELERY_DURABLE_RESULT_TASKS store them in Postgres.
+# Everything else is covered by the telemetry hooks below.
 app.conf.update(
     result_backend='django-db',
-    task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     worker_max_tasks_per_child=50,  # Restart worker after 50 tasks
     task_serializer='json',
     result_serializer='json',
     accept_content=['json'],
     result_extended=True,
-    task_store_errors_even_if_ignored=True,
 )
 
 @task_prerun.connect
-def task_prerun_handler(task_id, task, *args, **kwargs):
-    """Ensure task name is stored."""
-    from django_celery_results.models import TaskResult
-    TaskResult.objects.store_result(
-        task_id=task_id,
-        task_name=task.name,
-        status='STARTED',
-        content_type='application/json',
-        content_encoding='utf-8',
-        result=None
-    )
+def task_prerun_handler(task_id=None, task=None, **kwargs):
+    """Cheap per-task telemetry instead of a TaskResult row per task"""
+    from core.utils.task_telemetry import record_task_started
+    queue = (task.request.delivery_info or {}).get('routing_key')
+    record_task_started(task_id, task.name, queue)
 
 @task_postrun.connect
 def close_db_connections(sender=None, task_id=None, task=None, args=None, kwargs=None,
                         retval=None, state=None, **kwds):
-    """Close database connections after each task."""
+    """Record the outcome and close database connections after each task."""
+    from core.utils.task_telemetry import record_task_finished
+    record_task_finished(task_id, task.name, state)
     close_old_connections()
 
+@worker_process_shutdown.connect
+def flush_task_telemetry(**kwargs):
+    """Don't lose the last interval's aggregates when a child is recycled"""
+    from core.utils.task_telemetry import flush_telemetry
+    flush_telemetry()
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
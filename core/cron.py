@@ -4,7 +4,8 @@ from django.utils import timezone
 from dotenv import load_dotenv
 import requests
 import os
-from core.tasks import categorize_news_pages_with_gpt, crawl_news_sources_sync, create_social_sharing_image, find_digital_pr_examples, guess_journalist_email_addresses, process_all_journalists_sync, process_journalist_descriptions_sync, update_page_embeddings_sync
+from core.tasks import categorize_news_pages_with_gpt, crawl_news_sources_sync, create_social_sharing_image, find_digital_pr_examples, guess_journalist_email_addresses, process_all_journalists_sync, process_journalist_descriptions_sync
+from core.embeddings import update_journalist_embeddings
 from core.models import Journalist, NewsPage, NewsSource
 from django.conf import settings
 from django.core.management import call_command
@@ -98,8 +99,8 @@ def guess_emails_job():
 
 
 def generate_social_share_image_job():
+    # Writes the one image to media storage, and only when the counts changed
     create_social_sharing_image()
-    call_command('collectstatic', '--noinput')
     
 
 def find_digital_pr_examples_job():
@@ -116,7 +117,7 @@ def sync_journalist_categories_job():
 
 
 def update_embeddings_job():
-    update_page_embeddings_sync(limit=100)
+    update_journalist_embeddings(limit=1000)
 
 
 def clean_db_job():
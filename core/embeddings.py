@@ -0,0 +1,331 @@
+import hashlib
+import logging
+import math
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import BooleanField, Exists, ExpressionWrapper, F, OuterRef, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from pgvector.django import CosineDistance
+from openai import AzureOpenAI, APIConnectionError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from core.models import Journalist, NewsPage
+from core.utils.batching import iter_keyset_batches
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIMENSIONS = 1536
+EMBEDDING_INDEX_NAME = 'journalist_embedding_idx'
+EMBEDDING_CACHE_TTL = 60 * 60 * 24 * 30  # 30 days, vectors for a given text never change
+RECENT_TITLES_LIMIT = 10
+EMBEDDING_TEXT_MAX_CHARS = 8000  # Roughly 2k tokens, well under the model's input limit
+BULK_UPDATE_BATCH_SIZE = 100  # Each row carries a 1536-float vector, keep statements small
+
+
+class Embedder:
+    """Turns a list of texts into a list of vectors, in the same order"""
+    model = None
+
+    def embed(self, texts):
+        raise NotImplementedError
+
+
+class AzureOpenAIEmbedder(Embedder):
+    def __init__(self, model=None, timeout_seconds=60.0):
+        self.model = model or settings.EMBEDDING_MODEL
+        self.timeout_seconds = timeout_seconds
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = AzureOpenAI(
+                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", "").rstrip("/").strip('"').strip("'"),
+                api_version="2024-02-15-preview",
+                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                max_retries=0,  # Retries are handled by tenacity below
+                timeout=self.timeout_seconds,
+            )
+        return self._client
+
+    def _request(self, texts):
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    @retry(
+        retry=retry_if_exception_type((RateLimitError, APIConnectionError)),
+        stop=stop_after_attempt(5),
+        wait=wait_exponential(multiplier=1, min=4, max=60),
+        reraise=True
+    )
+    def embed(self, texts):
+        return self._request(texts)
+
+
+class QueryEmbedder(AzureOpenAIEmbedder):
+    """One attempt with a short timeout, for embedding search queries on the web request path"""
+
+    def embed(self, texts):
+        return self._request(texts)
+
+
+class FakeEmbedder(Embedder):
+    """
+    Deterministic offline embedder for tests and local development.
+    The same text always maps to the same unit vector; no network calls are made.
+    """
+    model = 'fake'
+
+    def __init__(self, dimensions=EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return [self._vector(text) for text in texts]
+
+    def _vector(self, text):
+        rng = random.Random(hashlib.sha256(text.encode('utf-8')).digest())
+        vector = [rng.gauss(0, 1) for _ in range(self.dimensions)]
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+
+def get_embedder():
+    if settings.EMBEDDING_BACKEND == 'fake':
+        return FakeEmbedder()
+    return AzureOpenAIEmbedder()
+
+
+_query_embedders = {}
+
+
+def get_query_embedder(timeout_seconds):
+    """Process-wide query embedder for a timeout, so web requests share one API client"""
+    if settings.EMBEDDING_BACKEND == 'fake':
+        return FakeEmbedder()
+    if timeout_seconds not in _query_embedders:
+        _query_embedders[timeout_seconds] = QueryEmbedder(timeout_seconds=timeout_seconds)
+    return _query_embedders[timeout_seconds]
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def embed_texts(texts, embedder=None, batch_size=None, concurrency=None):
+    """
+    Embed texts, returning vectors aligned with the input.
+    Cached vectors are reused; the remaining unique texts go to the API in
+    batches, with up to `concurrency` batches in flight at once.
+    """
+    embedder = embedder or get_embedder()
+    batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+    concurrency = concurrency or settings.EMBEDDING_CONCURRENCY
+
+    keys = [f'embedding:{embedder.model}:{text_hash(text)}' for text in texts]
+    vectors = cache.get_many(set(keys))
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+
+    missing_keys = list(missing)
+    chunks = [missing_keys[i:i + batch_size] for i in range(0, len(missing_keys), batch_size)]
+
+    def embed_chunk(chunk):
+        return dict(zip(chunk, embedder.embed([missing[key] for key in chunk])))
+
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+            for chunk_vectors in executor.map(embed_chunk, chunks):
+                cache.set_many(chunk_vectors, EMBEDDING_CACHE_TTL)
+                vectors.update(chunk_vectors)
+
+    logger.info(f"Embedded {len(texts)} texts: {len(texts) - len(missing)} cached, {len(missing)} via {embedder.model} in {len(chunks)} batches")
+    return [vectors[key] for key in keys]
+
+
+def embed_query(query, embedder=None):
+    """Embed a search query. Queries are normalised first so repeats hit the cache."""
+    normalised = ' '.join(query.lower().split())
+    return embed_texts([normalised], embedder=embedder)[0]
+
+
+def nearest_journalists(vector, limit=10, probes=None, exact=False, queryset=None):
+    """
+    Return [(journalist_id, cosine_distance)] for the nearest embeddings.
+    probes sets how many ivfflat lists are scanned: more probes, better recall,
+    slower queries. exact=True skips the index to get ground truth.
+    """
+    queryset = queryset if queryset is not None else Journalist.objects.all()
+    with transaction.atomic(), connection.cursor() as cursor:
+        # set_config(..., true) is scoped to this transaction, like SET LOCAL
+        if exact:
+            cursor.execute("SELECT set_config('enable_indexscan', 'off', true)")
+        else:
+            probes = probes or settings.SEARCH_IVFFLAT_PROBES
+            cursor.execute("SELECT set_config('ivfflat.probes', %s, true)", [str(int(probes))])
+        return list(
+            queryset.filter(embedding__isnull=False).annotate(
+                distance=CosineDistance('embedding', vector)
+            ).order_by('distance').values_list('id', 'distance')[:limit]
+        )
+
+
+def stale_journalists(max_age_days=None):
+    """Journalists with no embedding, an expired one, or articles crawled since it was computed"""
+    max_age_days = max_age_days or settings.EMBEDDING_MAX_AGE_DAYS
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    new_articles = NewsPage.journalists.through.objects.filter(
+        journalist_id=OuterRef('pk'),
+        newspage__is_news_article=True,
+        newspage__crawled_at__gt=OuterRef('embedding_updated_at'),
+    )
+    return Journalist.objects.filter(
+        Q(embedding__isnull=True) |
+        Q(embedding_updated_at__isnull=True) |
+        Q(embedding_updated_at__lt=cutoff) |
+        Exists(new_articles)
+    )
+
+
+def build_embedding_texts(journalists):
+    """Return {journalist_id: text} built from name, description and recent article titles"""
+    journalist_ids = [journalist.pk for journalist in journalists]
+
+    # Top N titles per journalist in one query
+    recent_titles = NewsPage.journalists.through.objects.filter(
+        journalist_id__in=journalist_ids,
+        newspage__is_news_article=True,
+        newspage__title__isnull=False,
+    ).annotate(
+        recency=Window(
+            RowNumber(),
+            partition_by=F('journalist_id'),
+            order_by=[F('newspage__published_date').desc(nulls_last=True), F('newspage_id').desc()],
+        )
+    ).filter(recency__lte=RECENT_TITLES_LIMIT).values_list('journalist_id', 'newspage__title')
+
+    titles = {}
+    for journalist_id, title in recent_titles:
+        titles.setdefault(journalist_id, []).append(title)
+
+    texts = {}
+    for journalist in journalists:
+        parts = [journalist.name]
+        if journalist.description:
+            parts.append(journalist.description)
+        if titles.get(journalist.pk):
+            parts.append('Recent articles:\n' + '\n'.join(f'- {title}' for title in titles[journalist.pk]))
+        texts[journalist.pk] = '\n'.join(parts)[:EMBEDDING_TEXT_MAX_CHARS]
+    return texts
+
+
+def update_journalist_embeddings(limit=None, embedder=None) -> int:
+    """
+    Compute embeddings for stale or missing journalists and bulk-write them back.
+    Journalists whose input text hasn't changed only get their timestamp bumped.
+    Returns the number of embeddings written.
+    """
+    embedder = embedder or get_embedder()
+    journalists = stale_journalists()
+    if limit:
+        journalists = Journalist.objects.filter(pk__in=list(journalists.order_by('pk').values_list('pk', flat=True)[:limit]))
+
+    journalists = journalists.only('id', 'name', 'description', 'embedding_text_hash').annotate(
+        has_embedding=ExpressionWrapper(Q(embedding__isnull=False), output_field=BooleanField())
+    )
+
+    # One DB batch feeds every concurrent API batch
+    batch_size = settings.EMBEDDING_BATCH_SIZE * settings.EMBEDDING_CONCURRENCY
+    written = 0
+    for batch in iter_keyset_batches(journalists, batch_size):
+        texts = build_embedding_texts(batch)
+        now = timezone.now()
+
+        changed = []
+        unchanged_ids = []
+        for journalist in batch:
+            journalist_text_hash = text_hash(texts[journalist.pk])
+            if journalist.has_embedding and journalist.embedding_text_hash == journalist_text_hash:
+                unchanged_ids.append(journalist.pk)
+            else:
+                journalist.embedding_text_hash = journalist_text_hash
+                changed.append(journalist)
+
+        if unchanged_ids:
+            Journalist.objects.filter(pk__in=unchanged_ids).update(embedding_updated_at=now)
+
+        if changed:
+            vectors = embed_texts([texts[journalist.pk] for journalist in changed], embedder=embedder)
+            for journalist, vector in zip(changed, vectors):
+                journalist.embedding = vector
+                journalist.embedding_updated_at = now
+            # bulk_update skips save() so no per-row Typesense sync is triggered
+            Journalist.objects.bulk_update(
+                changed,
+                ['embedding', 'embedding_text_hash', 'embedding_updated_at'],
+                batch_size=BULK_UPDATE_BATCH_SIZE,
+            )
+            written += len(changed)
+
+        logger.info(f"Embedding batch done: {len(changed)} written, {len(unchanged_ids)} unchanged")
+
+    return written
+
+
+def recommended_ivfflat_lists(row_count):
+    """pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond that"""
+    if row_count <= 1_000_000:
+        return max(10, row_count // 1000)
+    return int(math.sqrt(row_count))
+
+
+def current_ivfflat_lists():
+    """Return the lists setting of the live embedding index, or None if it doesn't exist"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reloptions FROM pg_class WHERE relname = %s", [EMBEDDING_INDEX_NAME])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    for option in row[0] or []:
+        name, _, value = option.partition('=')
+        if name == 'lists':
+            return int(value)
+    return None
+
+
+def rebuild_embedding_index(force=False) -> bool:
+    """
+    Rebuild the ivfflat index when the table has grown or shrunk enough that
+    the lists setting is off by 2x or more. The new index is built concurrently
+    next to the old one and swapped in, so searches never run without an index.
+    Returns True if the index was rebuilt.
+    """
+    row_count = Journalist.objects.filter(embedding__isnull=False).count()
+    target_lists = recommended_ivfflat_lists(row_count)
+    current_lists = current_ivfflat_lists()
+
+    if not force and current_lists and current_lists / 2 < target_lists < current_lists * 2:
+        return False
+
+    table = connection.ops.quote_name(Journalist._meta.db_table)
+    new_index = f'{EMBEDDING_INDEX_NAME}_new'
+    logger.info(f"Rebuilding {EMBEDDING_INDEX_NAME} for {row_count} rows: lists {current_lists} -> {target_lists}")
+    with connection.cursor() as cursor:
+        # A failed concurrent build leaves an invalid index behind
+        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {new_index}')
+        cursor.execute(
+            f'CREATE INDEX CONCURRENTLY {new_index} ON {table} '
+            f'USING ivfflat (embedding vector_cosine_ops) WITH (lists = {int(target_lists)})'
+        )
+        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {EMBEDDING_INDEX_NAME}')
+        cursor.execute(f'ALTER INDEX {new_index} RENAME TO {EMBEDDING_INDEX_NAME}')
+    return True
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from core.tasks import backfill_journalist_search_vectors, backfill_news_page_search_vectors
+
+class Command(BaseCommand):
+    help = 'Populate full-text search vectors for news pages and journalists that do not have one yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows to update per batch'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Backfilling news page search vectors...')
+        updated = backfill_news_page_search_vectors(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated {updated} news pages'))
+
+        self.stdout.write('Backfilling journalist search vectors...')
+        updated = backfill_journalist_search_vectors(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated {updated} journalists'))
@@ -0,0 +1,91 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from core.embeddings import FakeEmbedder, embed_texts, nearest_journalists
+from core.models import NewsPage
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ANN journalist search latency (p50/p95) and recall@k against exact search'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=50,
+            help='Number of sample queries, taken from recent article titles'
+        )
+        parser.add_argument(
+            '--probes',
+            type=str,
+            default='1,5,10,20,40',
+            help='Comma-separated ivfflat.probes values to compare'
+        )
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=10,
+            help='Number of neighbours to compare for recall@k'
+        )
+        parser.add_argument(
+            '--fake',
+            action='store_true',
+            default=False,
+            help='Use the offline fake embedder instead of the API'
+        )
+
+    def handle(self, *args, **options):
+        k = options['k']
+        probes_values = [int(value) for value in options['probes'].split(',') if value.strip()]
+
+        recent_titles = list(
+            NewsPage.objects.filter(is_news_article=True, title__isnull=False)
+            .order_by('-id').values_list('title', flat=True)[:5000]
+        )
+        queries = random.sample(recent_titles, min(options['queries'], len(recent_titles)))
+        if not queries:
+            self.stdout.write(self.style.WARNING('No article titles to use as queries'))
+            return
+
+        # Embed up front so timings only cover retrieval
+        embedder = FakeEmbedder() if options['fake'] else None
+        vectors = embed_texts(queries, embedder=embedder)
+
+        exact_latencies = []
+        exact_results = []
+        for vector in vectors:
+            start_time = time.perf_counter()
+            neighbours = nearest_journalists(vector, k, exact=True)
+            exact_latencies.append(time.perf_counter() - start_time)
+            exact_results.append({journalist_id for journalist_id, _ in neighbours})
+
+        self.stdout.write(f'{len(queries)} queries, recall@{k} against exact search')
+        self.stdout.write(self.report_line('exact', exact_latencies, 1.0))
+
+        for probes in probes_values:
+            latencies = []
+            recalls = []
+            for vector, exact in zip(vectors, exact_results):
+                start_time = time.perf_counter()
+                neighbours = nearest_journalists(vector, k, probes=probes)
+                latencies.append(time.perf_counter() - start_time)
+                if exact:
+                    found = {journalist_id for journalist_id, _ in neighbours}
+                    recalls.append(len(found & exact) / len(exact))
+            recall = sum(recalls) / len(recalls) if recalls else 0.0
+            self.stdout.write(self.report_line(f'probes={probes}', latencies, recall))
+
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+
+    def report_line(self, label, latencies, recall):
+        return (
+            f'{label:>12}  p50 {percentile(latencies, 50) * 1000:8.1f}ms  '
+            f'p95 {percentile(latencies, 95) * 1000:8.1f}ms  recall {recall:.3f}'
+        )
@@ -1,46 +1,90 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from core.models import Journalist, NewsPageCategory, NewsPage
+from core.utils.batching import iter_keyset_batches
+from core.utils.typesense_utils import delete_journalists_from_typesense
 from urllib.parse import urlparse
 
 class Command(BaseCommand):
     help = 'Clean database: remove unwanted journalists and mark root domain pages'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            default=False,
+            help='Only report what would be changed'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows to load and write per batch'
+        )
+
     def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.batch_size = options['batch_size']
+        if self.dry_run:
+            self.stdout.write(self.style.WARNING('Dry run: no changes will be written'))
+
+        self.remove_unwanted_journalists()
+        self.remove_unwanted_categories()
+        self.mark_root_domain_pages()
+
+    def remove_unwanted_journalists(self):
         # List of partial strings to check for
         unwanted_terms = ['.com', 'staff', 'team', 'reporters', 'press']
-        
+
         # Keep track of how many journalists are removed
         removed_count = 0
-        
+
         # Check each term
         for term in unwanted_terms:
-            # Find and delete journalists with the term in their name
+            count = 0
+            # Only ids are loaded; each batch is one DELETE plus one Typesense request
             journalists = Journalist.objects.filter(name__icontains=term)
-            count = journalists.count()
-            journalists.delete()
+            for batch in iter_keyset_batches(journalists, self.batch_size, fields=()):
+                journalist_ids = [journalist_id for journalist_id, in batch]
+                count += len(journalist_ids)
+                if self.dry_run:
+                    continue
+                with transaction.atomic():
+                    Journalist.objects.filter(pk__in=journalist_ids).delete()
+                delete_journalists_from_typesense(journalist_ids)
+
             removed_count += count
-            self.stdout.write(f'Removed {count} journalists containing "{term}"')
-            
-        self.stdout.write(self.style.SUCCESS(f'Successfully removed {removed_count} total journalists'))
-        
+            verb = 'Would remove' if self.dry_run else 'Removed'
+            self.stdout.write(f'{verb} {count} journalists containing "{term}"')
+
+        verb = 'would remove' if self.dry_run else 'removed'
+        self.stdout.write(self.style.SUCCESS(f'Successfully {verb} {removed_count} total journalists'))
+
+    def remove_unwanted_categories(self):
         # Remove specific NewsPageCategory
-        try:
-            category = NewsPageCategory.objects.get(name='New Categories Needed')
-            category.delete()
-            self.stdout.write('Removed NewsPageCategory "New Categories Needed"')
-        except NewsPageCategory.DoesNotExist:
+        categories = NewsPageCategory.objects.filter(name='New Categories Needed')
+        if not categories.exists():
             self.stdout.write('NewsPageCategory "New Categories Needed" not found')
+            return
+        if not self.dry_run:
+            categories.delete()
+        verb = 'Would remove' if self.dry_run else 'Removed'
+        self.stdout.write(f'{verb} NewsPageCategory "New Categories Needed"')
 
-        # Update root domain pages
+    def mark_root_domain_pages(self):
+        # Update root domain pages. Only id and url are read, never the page content.
         updated_count = 0
-        for page in NewsPage.objects.all():
-            parsed_url = urlparse(page.url)
-            path = parsed_url.path.rstrip('/')
-            
-            if path == '' or path == '/':
-                page.is_news_article = False
-                page.save(update_fields=['is_news_article'])
-                updated_count += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'Updated {updated_count} root domain pages'))
+        pages = NewsPage.objects.filter(is_news_article=True)
+        for batch in iter_keyset_batches(pages, self.batch_size, fields=['url']):
+            root_page_ids = []
+            for page_id, url in batch:
+                path = urlparse(url).path.rstrip('/')
+                if path == '':
+                    root_page_ids.append(page_id)
+
+            if root_page_ids and not self.dry_run:
+                NewsPage.objects.filter(pk__in=root_page_ids).update(is_news_article=False)
+            updated_count += len(root_page_ids)
 
+        verb = 'Would update' if self.dry_run else 'Updated'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {updated_count} root domain pages'))
@@ -15,8 +15,8 @@ class Command(BaseCommand):
         parser.add_argument(
             '--page-limit',
             type=int,
-            default=2000,
-            help='Limit the number of pages to crawl per domain',
+            default=None,
+            help='Pages to crawl per domain, defaults to the budget planned for each source',
         )
         parser.add_argument(
             '--interval',
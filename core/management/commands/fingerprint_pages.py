@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from core.models import NewsPage
+from core.utils.batching import iter_keyset_batches
+from core.utils.near_duplicates import fingerprint_pages
+
+
+class Command(BaseCommand):
+    help = 'Fingerprint stored pages so new copies of them are detected as near-duplicates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of pages to load and fingerprint per batch'
+        )
+
+    def handle(self, *args, **options):
+        pages = NewsPage.objects.filter(
+            canonical__isnull=True,
+            fingerprint__isnull=True
+        ).exclude(content='').only('id', 'content')
+
+        total = 0
+        for batch in iter_keyset_batches(pages, options['batch_size']):
+            total += fingerprint_pages(batch)
+            self.stdout.write(f'Fingerprinted {total} pages')
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully fingerprinted {total} pages'))
@@ -1,8 +1,30 @@
-from core.tasks import create_social_sharing_image
+from core.models import BlogPost
+from core.utils.social_images import create_blog_og_image, create_social_sharing_image
 from django.core.management.base import BaseCommand
 
 class Command(BaseCommand):
     help = 'Generate the social sharing image'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render even if the journalist and outlet counts have not changed'
+        )
+        parser.add_argument(
+            '--blog',
+            action='store_true',
+            help='Also render OG images for blog posts that do not have one yet'
+        )
+
     def handle(self, *args, **kwargs):
-        create_social_sharing_image()
\ No newline at end of file
+        if create_social_sharing_image(force=kwargs['force']):
+            self.stdout.write(self.style.SUCCESS('Rendered social sharing image'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Social sharing image already up to date'))
+
+        if kwargs['blog']:
+            posts = BlogPost.objects.only('slug', 'title')
+            for post in posts:
+                create_blog_og_image(post, force=kwargs['force'])
+            self.stdout.write(self.style.SUCCESS(f'Checked OG images for {len(posts)} blog posts'))
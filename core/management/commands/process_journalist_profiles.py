@@ -17,7 +17,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'Starting to process {limit} journalist profiles...'))
         
         try:
-            process_journalist_descriptions_sync(limit=limit)
-            self.stdout.write(self.style.SUCCESS('Successfully processed journalist profiles'))
+            saved = process_journalist_descriptions_sync(limit=limit)
+            self.stdout.write(self.style.SUCCESS(f'Successfully processed journalist profiles, saved {saved} descriptions'))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error processing journalist profiles: {str(e)}'))
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.utils.crawl_archive import prune_crawl_archive
+
+
+class Command(BaseCommand):
+    help = 'Delete archived crawl responses, and their WARC files, older than the archive retention'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.CRAWL_ARCHIVE_RETENTION_DAYS,
+            help='Keep captures fetched within this many days'
+        )
+
+    def handle(self, *args, **options):
+        rows, files = prune_crawl_archive(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Pruned {rows} archived pages and {files} WARC files older than {options['days']} days"
+        ))
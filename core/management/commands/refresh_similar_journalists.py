@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from core.utils.similar_journalists import refresh_similar_journalists
+
+
+class Command(BaseCommand):
+    help = 'Precompute similar journalists from embeddings, or shared sources and categories'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            default=False,
+            help='Recompute every journalist instead of only stale ones'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of journalists to refresh'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Refreshing similar journalists...')
+        refreshed = refresh_similar_journalists(limit=options['limit'], full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed neighbours for {refreshed} journalists'))
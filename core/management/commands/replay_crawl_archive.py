@@ -0,0 +1,111 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.models import ArchivedPage, NewsSource
+from core.utils.batching import iter_keyset_batches
+from core.utils.crawl_archive import replay_archived_pages
+
+STAGES = ('read', 'clean', 'store', 'extract', 'categorize')
+
+
+class Command(BaseCommand):
+    help = 'Reprocess archived crawl responses from the WARC archive without fetching anything from the web'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            type=str,
+            default=None,
+            help='Only replay pages from the news source with this slug'
+        )
+        parser.add_argument(
+            '--url',
+            type=str,
+            default=None,
+            help='Only replay captures of this URL'
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            default=None,
+            help='Only replay captures fetched on or after this date (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--until',
+            type=str,
+            default=None,
+            help='Only replay captures fetched before this date (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Stop after this many captures'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of captures to replay per batch'
+        )
+        parser.add_argument(
+            '--clean-only',
+            action='store_true',
+            default=False,
+            help='Only re-run clean_html and update page content, no LLM calls'
+        )
+        parser.add_argument(
+            '--no-categorize',
+            action='store_true',
+            default=False,
+            help='Re-extract journalists but leave categorization to the usual queue'
+        )
+
+    def _date(self, value):
+        try:
+            return timezone.make_aware(datetime.strptime(value, '%Y-%m-%d'))
+        except ValueError:
+            raise CommandError(f'Invalid date {value}, expected YYYY-MM-DD')
+
+    def handle(self, *args, **options):
+        captures = ArchivedPage.objects.select_related('source').only(
+            'id', 'url', 'source', 'fetched_at', 'warc_file', 'offset', 'length'
+        )
+        if options['source']:
+            source = NewsSource.objects.filter(slug=options['source']).first()
+            if not source:
+                raise CommandError(f"No news source with slug {options['source']}")
+            captures = captures.filter(source=source)
+        if options['url']:
+            captures = captures.filter(url=options['url'])
+        if options['since']:
+            captures = captures.filter(fetched_at__gte=self._date(options['since']))
+        if options['until']:
+            captures = captures.filter(fetched_at__lt=self._date(options['until']))
+
+        extract = not options['clean_only']
+        categorize = extract and not options['no_categorize']
+        totals = dict.fromkeys(STAGES, 0.0)
+        totals.update(captures=0, pages=0, extracted=0, categorized=0)
+
+        for batch in iter_keyset_batches(captures, options['batch_size']):
+            if options['limit']:
+                batch = batch[:options['limit'] - totals['captures']]
+            stats = replay_archived_pages(batch, extract=extract, categorize=categorize)
+            totals['captures'] += len(batch)
+            for key, value in stats.items():
+                totals[key] += value
+            self.stdout.write(
+                f"Replayed {totals['captures']} captures: {totals['pages']} pages, "
+                f"{totals['extracted']} extracted, {totals['categorized']} categorized"
+            )
+            if options['limit'] and totals['captures'] >= options['limit']:
+                break
+
+        elapsed = sum(totals[stage] for stage in STAGES)
+        self.stdout.write(self.style.SUCCESS(
+            f"Replayed {totals['captures']} captures into {totals['pages']} pages in {elapsed:.1f}s"
+        ))
+        for stage in STAGES:
+            rate = totals['pages'] / totals[stage] if totals[stage] else 0
+            self.stdout.write(f"{stage:<12} {totals[stage]:>8.2f}s {rate:>10.1f} pages/s")
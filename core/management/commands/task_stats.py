@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand
+from core.utils.task_telemetry import get_recent_tasks, get_task_stats
+
+
+class Command(BaseCommand):
+    help = 'Show Celery task counts, failures and runtimes, and recently run tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=24,
+            help='Aggregate stats over this many hours'
+        )
+        parser.add_argument(
+            '--recent',
+            type=int,
+            default=0,
+            help='Also list this many recently started tasks'
+        )
+        parser.add_argument(
+            '--state',
+            type=str,
+            default=None,
+            help='Only list recent tasks in this state, e.g. FAILURE or STARTED'
+        )
+
+    def handle(self, *args, **options):
+        stats = get_task_stats(hours=options['hours'])
+        self.stdout.write(self.style.SUCCESS(f"Tasks over the last {options['hours']} hours"))
+        self.stdout.write(f"{'task':<50} {'count':>8} {'failed':>8} {'retries':>8} {'avg s':>8} {'max s':>8}")
+        for task_name, values in sorted(stats.items(), key=lambda item: -item[1]['count']):
+            self.stdout.write(
+                f"{task_name:<50} {int(values['count']):>8} {int(values['failures']):>8} "
+                f"{int(values['retries']):>8} {values['runtime_avg']:>8.2f} {values['runtime_max']:>8.2f}"
+            )
+
+        if options['recent']:
+            self.stdout.write(self.style.SUCCESS('\nRecent tasks'))
+            for task in get_recent_tasks(limit=options['recent'], state=options['state']):
+                started = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(float(task['started_at'])))
+                runtime = f"{float(task['runtime']):.2f}s" if task.get('runtime') else '-'
+                self.stdout.write(f"{started} {task['state']:<8} {runtime:>8} {task['name']} [{task['queue']}] {task['worker']} {task['id']}")
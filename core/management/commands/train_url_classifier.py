@@ -0,0 +1,50 @@
+from collections import Counter
+from django.core.management.base import BaseCommand
+from core.models import NewsPage
+from core.utils.batching import iter_keyset_batches
+from core.utils.url_classifier import get_url_classifier, train_url_classifier
+
+
+class Command(BaseCommand):
+    help = 'Learn which URL patterns are news articles from pages the LLM has labelled'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--evaluate',
+            action='store_true',
+            default=False,
+            help='Report what the classifier would skip or defer among the labelled pages'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of pages to read per batch'
+        )
+
+    def handle(self, *args, **options):
+        trained = train_url_classifier(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Trained URL classifier on {trained} labelled pages'))
+
+        if options['evaluate']:
+            self.evaluate(options['batch_size'])
+
+    def evaluate(self, batch_size):
+        # Scored on the training pages, so this shows what the thresholds cut, not held-out accuracy
+        classifiers = {}
+        decisions = Counter()
+        pages = NewsPage.objects.filter(processed=True)
+        for batch in iter_keyset_batches(pages, batch_size, fields=['source_id', 'url', 'is_news_article']):
+            for _, source_id, url, is_news_article in batch:
+                if source_id not in classifiers:
+                    classifiers[source_id] = get_url_classifier(source_id)
+                label = 'articles' if is_news_article else 'other pages'
+                decisions[(label, classifiers[source_id].decide(url))] += 1
+
+        for label in ('articles', 'other pages'):
+            total = sum(count for (page_label, _), count in decisions.items() if page_label == label)
+            summary = ', '.join(
+                f'{decision} {decisions[(label, decision)]} ({decisions[(label, decision)] / total:.1%})'
+                for decision in ('fetch', 'defer', 'skip')
+            ) if total else 'none'
+            self.stdout.write(f'{label}: {summary}')
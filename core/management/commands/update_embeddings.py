@@ -1,11 +1,35 @@
 from django.core.management.base import BaseCommand
-from core.tasks import update_page_embeddings_sync
+from core.embeddings import FakeEmbedder, rebuild_embedding_index, update_journalist_embeddings
 
 
 class Command(BaseCommand):
-    help = 'Updates embeddings for NewsPages that do not have them yet'
+    help = 'Updates embeddings for journalists that are missing or stale'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of journalists to process'
+        )
+        parser.add_argument(
+            '--fake',
+            action='store_true',
+            default=False,
+            help='Use the offline fake embedder instead of the API'
+        )
+        parser.add_argument(
+            '--rebuild-index',
+            action='store_true',
+            default=False,
+            help='Force an ivfflat index rebuild even if the lists setting still fits'
+        )
 
     def handle(self, *args, **options):
         self.stdout.write('Starting embedding updates...')
-        update_page_embeddings_sync(limit=100)  # Process 100 pages at a time
-        self.stdout.write(self.style.SUCCESS('Successfully updated embeddings'))
+        embedder = FakeEmbedder() if options['fake'] else None
+        written = update_journalist_embeddings(limit=options['limit'], embedder=embedder)
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated {written} embeddings'))
+
+        if rebuild_embedding_index(force=options['rebuild_index']):
+            self.stdout.write(self.style.SUCCESS('Rebuilt the embedding index'))
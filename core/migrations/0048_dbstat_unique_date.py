@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-19 09:00
+
+import django.utils.timezone
+from datetime import datetime, time, timezone
+from django.db import migrations, models
+
+
+def normalize_dbstat_dates(apps, schema_editor):
+    """Keep the newest row per day and move it to midnight UTC"""
+    DbStat = apps.get_model('core', 'DbStat')
+    seen_days = set()
+    for stat in DbStat.objects.order_by('-id'):
+        day = stat.date.astimezone(timezone.utc).date()
+        if day in seen_days:
+            stat.delete()
+            continue
+        seen_days.add(day)
+        midnight = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        if stat.date != midnight:
+            DbStat.objects.filter(pk=stat.pk).update(date=midnight)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0047_alter_blogpost_slug'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dbstat',
+            name='date',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(normalize_dbstat_dates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dbstat',
+            constraint=models.UniqueConstraint(fields=('date',), name='unique_dbstat_date'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# Keep NewsPage.search_vector in sync with title/content on every write.
+# Mirrors NewsPage.update_search_vector (title weighted A, content weighted B).
+# Content is capped so very large pages can't exceed the 1MB tsvector limit.
+# Existing rows are filled in by the backfill_search_vectors command.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0048_dbstat_unique_date'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION core_newspage_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector(COALESCE(NEW.title, '')), 'A') ||
+                    setweight(to_tsvector(COALESCE(LEFT(NEW.content, 400000), '')), 'B');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS core_newspage_search_vector_trigger ON core_newspage;
+            CREATE TRIGGER core_newspage_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, content ON core_newspage
+            FOR EACH ROW EXECUTE FUNCTION core_newspage_search_vector_update();
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS core_newspage_search_vector_trigger ON core_newspage;
+            DROP FUNCTION IF EXISTS core_newspage_search_vector_update();
+            """
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0049_newspage_search_vector_trigger'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journalist',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_journa_search__79d463_gin'),
+        ),
+    ]
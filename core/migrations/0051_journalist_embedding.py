@@ -0,0 +1,45 @@
+# Generated by Django 5.1.3 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import pgvector.django
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0050_journalist_core_journa_search__79d463_gin'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE EXTENSION IF NOT EXISTS vector;',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddField(
+            model_name='journalist',
+            name='embedding',
+            field=pgvector.django.VectorField(blank=True, dimensions=1536, null=True),
+        ),
+        migrations.AddField(
+            model_name='journalist',
+            name='embedding_text_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='journalist',
+            name='embedding_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Lists are resized by core.embeddings.rebuild_embedding_index as the table grows
+        migrations.RunSQL(
+            sql="""
+            DROP INDEX IF EXISTS journalist_embedding_idx;
+            CREATE INDEX journalist_embedding_idx
+            ON core_journalist USING ivfflat (embedding vector_cosine_ops)
+            WITH (lists = 100);
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS journalist_embedding_idx;
+            """
+        ),
+    ]
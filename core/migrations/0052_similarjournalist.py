@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-19 12:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0051_journalist_embedding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarJournalist',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('method', models.CharField(choices=[('embedding', 'Embedding similarity'), ('cooccurrence', 'Shared sources and categories')], max_length=16)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('journalist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_journalists', to='core.journalist')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.journalist')),
+            ],
+            options={
+                'ordering': ['journalist', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('journalist', 'rank'), name='unique_similar_journalist_rank')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0052_similarjournalist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalist',
+            name='email_confidence',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='DomainEmailPattern',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=255, unique=True)),
+                ('email_domain', models.CharField(max_length=255)),
+                ('pattern', models.CharField(max_length=32)),
+                ('confidence', models.FloatField()),
+                ('sample_size', models.PositiveIntegerField(default=0)),
+                ('method', models.CharField(choices=[('learned', 'Learned from known emails'), ('smtp', 'Accepted by mail server')], default='learned', max_length=16)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
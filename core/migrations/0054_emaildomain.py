@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0053_domainemailpattern_journalist_email_confidence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailDomain',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=255, unique=True)),
+                ('mx_hosts', models.JSONField(blank=True, default=list)),
+                ('smtp_reachable', models.BooleanField(blank=True, null=True)),
+                ('is_catch_all', models.BooleanField(blank=True, null=True)),
+                ('is_failed', models.BooleanField(default=False)),
+                ('last_error', models.CharField(blank=True, default='', max_length=255)),
+                ('last_checked_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0056_listenrichmentjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='seobot_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='seobot_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
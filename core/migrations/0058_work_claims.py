@@ -0,0 +1,61 @@
+# Generated by Django 5.1.3 on 2026-10-19 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0057_blogpost_seobot_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newspage',
+            name='categorized',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='newspage',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='newspage',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='journalist',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='journalist',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        # Pages categorized before this migration
+        migrations.RunSQL(
+            sql="""
+                UPDATE core_newspage SET categorized = TRUE
+                WHERE EXISTS (
+                    SELECT 1 FROM core_newspage_categories
+                    WHERE core_newspage_categories.newspage_id = core_newspage.id
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='newspage',
+            index=models.Index(condition=models.Q(('processed', False)), fields=['id'], name='newspage_unprocessed'),
+        ),
+        migrations.AddIndex(
+            model_name='newspage',
+            index=models.Index(condition=models.Q(('categorized', False), ('is_news_article', True), ('processed', True)), fields=['id'], name='newspage_uncategorized'),
+        ),
+        migrations.AddIndex(
+            model_name='journalist',
+            index=models.Index(condition=models.Q(('description__isnull', True), ('profile_url__isnull', False)), fields=['id'], name='journalist_describe_pending'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.3 on 2026-10-19 18:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0058_work_claims'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssource',
+            name='crawl_budget',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='crawl_yield',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='next_crawl_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='crawl_plan',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.CreateModel(
+            name='SourceYield',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.localdate)),
+                ('pages_fetched', models.IntegerField(default=0)),
+                ('pages_new', models.IntegerField(default=0)),
+                ('pages_processed', models.IntegerField(default=0)),
+                ('news_articles', models.IntegerField(default=0)),
+                ('new_journalists', models.IntegerField(default=0)),
+                ('llm_tokens', models.BigIntegerField(default=0)),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='yields', to='core.newssource')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('source', 'date'), name='unique_source_yield_date')],
+            },
+        ),
+    ]
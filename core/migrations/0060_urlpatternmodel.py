@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0059_crawl_planner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UrlPatternModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('articles', models.PositiveIntegerField(default=0)),
+                ('others', models.PositiveIntegerField(default=0)),
+                ('feature_counts', models.JSONField(default=dict)),
+                ('trained_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('source', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='url_pattern_model', to='core.newssource')),
+            ],
+        ),
+    ]
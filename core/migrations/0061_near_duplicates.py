@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-19 20:00
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0060_urlpatternmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newspage',
+            name='canonical',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='core.newspage'),
+        ),
+        migrations.CreateModel(
+            name='PageFingerprint',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fingerprint', serialize=False, to='core.newspage')),
+                ('minhash', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None)),
+                ('bands', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), size=None)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['bands'], name='pagefingerprint_bands')],
+            },
+        ),
+    ]
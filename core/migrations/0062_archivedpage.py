@@ -0,0 +1,34 @@
+# Generated by Django 5.1.3 on 2026-10-19 21:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0061_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=2000)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('warc_file', models.CharField(max_length=255)),
+                ('offset', models.BigIntegerField()),
+                ('length', models.PositiveIntegerField()),
+                ('source', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_pages', to='core.newssource')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['url', '-fetched_at'], name='archivedpage_url_fetched'),
+                    models.Index(fields=['source', 'fetched_at'], name='archivedpage_source_fetched'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 22:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0062_archivedpage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='domainemailpattern',
+            name='method',
+            field=models.CharField(choices=[('learned', 'Learned from known emails'), ('smtp', 'Accepted by mail server'), ('hunter', 'Reported by Hunter.io')], default='learned', max_length=16),
+        ),
+    ]
@@ -1,16 +1,24 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
 from django.contrib.auth.models import AbstractUser
 from django.contrib.postgres.search import SearchVectorField
 from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.search import SearchVector
+from django.db.models.functions import Left
+from django.db.models import F, OuterRef, Subquery
+from django.contrib.postgres.aggregates import StringAgg
 import logging
 from django.utils import timezone
+from django.conf import settings
+from datetime import timedelta
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from core.utils.typesense_utils import update_journalist_in_typesense
+from core.utils.page_cache import invalidate_public_pages
 import re
 from tenacity import retry, stop_after_attempt, wait_exponential
+from pgvector.django import VectorField
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +34,11 @@ class NewsSource(models.Model):
     language = models.CharField(max_length=255, null=True, blank=True)
     priority = models.BooleanField(default=False)
     categories = models.ManyToManyField('NewsPageCategory', related_name='sources', blank=True)
+    # Set by the crawl planner, see core/utils/crawl_planner.py
+    crawl_budget = models.PositiveIntegerField(null=True, blank=True)
+    crawl_yield = models.FloatField(null=True, blank=True)
+    next_crawl_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    crawl_plan = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return self.name
@@ -64,9 +77,16 @@ class Journalist(models.Model):
     )
     categories = models.ManyToManyField('NewsPageCategory', related_name='journalists', blank=True)
     email_search_with_hunter_tried = models.BooleanField(default=False)
+    email_confidence = models.FloatField(null=True, blank=True)  # Set when the email was guessed from a domain pattern
     created_at = models.DateTimeField(default=timezone.now)
     
     search_vector = SearchVectorField(null=True)
+    embedding = VectorField(dimensions=1536, null=True, blank=True)
+    embedding_text_hash = models.CharField(max_length=64, null=True, blank=True)
+    embedding_updated_at = models.DateTimeField(null=True, blank=True)
+    # Lease on description enrichment, see core/utils/work_queue.py
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.CharField(max_length=100, null=True, blank=True)
 
     def __str__(self):
         return self.name
@@ -108,22 +128,32 @@ class Journalist(models.Model):
         ).distinct()
         logger.info(f"Found categories: {[c.name for c in article_categories]}")
         self.categories.set(article_categories)
+        # Category names are part of the search vector
+        self.update_search_vector()
+
+    @classmethod
+    def search_vector_expression(cls):
+        """Weighted search vector over name, description, source and category names"""
+        source_names = Journalist.sources.through.objects.filter(
+            journalist_id=OuterRef('pk')
+        ).values('journalist_id').annotate(
+            names=StringAgg('newssource__name', ' ')
+        ).values('names')
+        category_names = Journalist.categories.through.objects.filter(
+            journalist_id=OuterRef('pk')
+        ).values('journalist_id').annotate(
+            names=StringAgg('newspagecategory__name', ' ')
+        ).values('names')
+
+        return SearchVector('name', weight='A') + \
+               SearchVector('description', weight='B') + \
+               SearchVector(Subquery(source_names), weight='C') + \
+               SearchVector(Subquery(category_names), weight='D')
 
     def update_search_vector(self):
         """Update the search vector field"""
         try:
-            # First get the related field values
-            source_names = ' '.join(self.sources.values_list('name', flat=True))
-            category_names = ' '.join(self.categories.values_list('name', flat=True))
-            
-            # Create concatenated text fields
-            vector = SearchVector('name', weight='A') + \
-                     SearchVector('description', weight='B') + \
-                     SearchVector(models.Value(source_names), weight='C') + \
-                     SearchVector(models.Value(category_names), weight='D')
-            
-            # Update the search vector
-            Journalist.objects.filter(pk=self.pk).update(search_vector=vector)
+            Journalist.objects.filter(pk=self.pk).update(search_vector=Journalist.search_vector_expression())
         except Exception as e:
             logger.error(f"Error updating search vector for journalist {self.pk}: {str(e)}")
 
@@ -248,6 +278,12 @@ class Journalist(models.Model):
             models.Index(fields=['country']),
             models.Index(fields=['name']),
             models.Index(fields=['description']),
+            GinIndex(fields=['search_vector']),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(description__isnull=True, profile_url__isnull=False),
+                name='journalist_describe_pending',
+            ),
         ]
 
 
@@ -275,13 +311,26 @@ class NewsPage(models.Model):
     search_vector = SearchVectorField(null=True, blank=True)
     published_date = models.DateField(null=True, blank=True)
     crawled_at = models.DateTimeField(null=True, blank=True, auto_now_add=True)
+    categorized = models.BooleanField(default=False)
+    # Lease on whichever stage the page is waiting for, see core/utils/work_queue.py
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.CharField(max_length=100, null=True, blank=True)
+    # Set on syndicated copies of another page; their body isn't stored, see core/utils/near_duplicates.py
+    canonical = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='duplicates')
 
     def __str__(self):
         return self.title
     
+    # Kept in sync with the search vector trigger from migration 0049
+    SEARCH_VECTOR_CONTENT_LIMIT = 400_000
+
+    @classmethod
+    def search_vector_expression(cls):
+        return SearchVector('title', weight='A') + \
+               SearchVector(Left('content', cls.SEARCH_VECTOR_CONTENT_LIMIT), weight='B')
+
     def update_search_vector(self):
-        vector = SearchVector('title', weight='A') + SearchVector('content', weight='B')
-        NewsPage.objects.filter(pk=self.pk).update(search_vector=vector)
+        NewsPage.objects.filter(pk=self.pk).update(search_vector=NewsPage.search_vector_expression())
 
     #def save(self, *args, **kwargs):
     #    super().save(*args, **kwargs)
@@ -289,7 +338,48 @@ class NewsPage(models.Model):
     
     class Meta:
         indexes = [
-            GinIndex(fields=['search_vector'])
+            GinIndex(fields=['search_vector']),
+            models.Index(fields=['id'], condition=models.Q(processed=False), name='newspage_unprocessed'),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(processed=True, is_news_article=True, categorized=False),
+                name='newspage_uncategorized',
+            ),
+        ]
+
+
+class ArchivedPage(models.Model):
+    """Where a raw crawl response sits in the WARC archive, see core/utils/crawl_archive.py"""
+    url = models.URLField(max_length=2000)
+    source = models.ForeignKey(NewsSource, null=True, blank=True, on_delete=models.SET_NULL, related_name='archived_pages')
+    fetched_at = models.DateTimeField(default=timezone.now)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    warc_file = models.CharField(max_length=255)  # Relative to CRAWL_ARCHIVE_DIR
+    offset = models.BigIntegerField()
+    length = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.url} @ {self.fetched_at}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['url', '-fetched_at'], name='archivedpage_url_fetched'),
+            models.Index(fields=['source', 'fetched_at'], name='archivedpage_source_fetched'),
+        ]
+
+
+class PageFingerprint(models.Model):
+    """MinHash signature of a canonical page's text, with LSH band hashes for finding near-duplicates"""
+    page = models.OneToOneField(NewsPage, primary_key=True, on_delete=models.CASCADE, related_name='fingerprint')
+    minhash = ArrayField(models.IntegerField())
+    bands = ArrayField(models.BigIntegerField())
+
+    def __str__(self):
+        return f"Fingerprint of page {self.page_id}"
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['bands'], name='pagefingerprint_bands'),
         ]
 
 
@@ -378,6 +468,32 @@ class SavedList(models.Model):
         return f"{self.name} ({self.journalists.count()} journalists)"
 
 
+class SimilarJournalist(models.Model):
+    """Precomputed nearest neighbours of a journalist, one row per rank"""
+    journalist = models.ForeignKey(Journalist, on_delete=models.CASCADE, related_name='similar_journalists')
+    similar = models.ForeignKey(Journalist, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    method = models.CharField(
+        max_length=16,
+        choices=[
+            ('embedding', 'Embedding similarity'),
+            ('cooccurrence', 'Shared sources and categories')
+        ]
+    )
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['journalist', 'rank']
+        constraints = [
+            # Also serves as the (journalist, rank) lookup index
+            models.UniqueConstraint(fields=['journalist', 'rank'], name='unique_similar_journalist_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.journalist_id} -> {self.similar_id} (#{self.rank})"
+
+
 class DigitalPRExample(models.Model):
     news_page = models.ForeignKey('NewsPage', on_delete=models.CASCADE, related_name='pr_examples')
     title = models.CharField(max_length=255)
@@ -402,10 +518,48 @@ class DbStat(models.Model):
     num_journalists_added_today = models.IntegerField(default=0)
     num_news_articles = models.IntegerField(default=0)
     num_news_articles_added_today = models.IntegerField(default=0)
-    date = models.DateTimeField(auto_now_add=True)
+    # One row per day, stored at midnight so rollups can upsert on it
+    date = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
         return f"{self.date} - {self.num_journalists_added_today} journalists added"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date'], name='unique_dbstat_date'),
+        ]
+
+
+class SourceYield(models.Model):
+    """Daily crawl and extraction counters per source, the input to the crawl planner"""
+    source = models.ForeignKey(NewsSource, on_delete=models.CASCADE, related_name='yields')
+    date = models.DateField(default=timezone.localdate)
+    pages_fetched = models.IntegerField(default=0)
+    pages_new = models.IntegerField(default=0)
+    pages_processed = models.IntegerField(default=0)
+    news_articles = models.IntegerField(default=0)
+    new_journalists = models.IntegerField(default=0)
+    llm_tokens = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.source} {self.date}: {self.new_journalists} new journalists"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'date'], name='unique_source_yield_date'),
+        ]
+
+
+class UrlPatternModel(models.Model):
+    """URL feature counts by is_news_article label, per source; the row without a source covers all sources"""
+    source = models.OneToOneField(NewsSource, null=True, blank=True, on_delete=models.CASCADE, related_name='url_pattern_model')
+    articles = models.PositiveIntegerField(default=0)
+    others = models.PositiveIntegerField(default=0)
+    feature_counts = models.JSONField(default=dict)  # {feature: [articles, others]}
+    trained_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.source or 'All sources'}: {self.articles} articles, {self.others} other pages"
     
 
 #@receiver(m2m_changed, sender=NewsPage.journalists.through)
@@ -451,6 +605,203 @@ class EmailDiscovery(models.Model):
     def __str__(self):
         return f"{self.journalist.name} - {self.email}"
 
+
+class EmailLookupJob(models.Model):
+    """
+    Queued Hunter.io lookup for one journalist, polled by the find-email button.
+    The user's credit is taken when the job is queued and refunded unless an email is found.
+    """
+    IN_FLIGHT_STATUSES = ['pending', 'running']
+
+    journalist = models.ForeignKey(Journalist, on_delete=models.CASCADE, related_name='email_lookup_jobs')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='email_lookup_jobs')
+    status = models.CharField(
+        max_length=16,
+        choices=[
+            ('pending', 'Pending'),
+            ('running', 'Running'),
+            ('found', 'Found'),
+            ('not_found', 'Not Found'),
+            ('failed', 'Failed')
+        ],
+        default='pending'
+    )
+    source_domain = models.CharField(max_length=255)
+    email = models.EmailField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # At most one lookup per journalist in flight, concurrent clicks share it
+            models.UniqueConstraint(
+                fields=['journalist'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='unique_in_flight_email_lookup',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.journalist_id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status not in self.IN_FLIGHT_STATUSES
+
+    @classmethod
+    def finish(cls, job_id, user_id, status, email=None):
+        """
+        Move an in-flight lookup to its final status, refunding the credit taken
+        when it was queued unless an email was found. Returns False if the job
+        had already finished, so a lookup is never settled twice.
+        """
+        with transaction.atomic():
+            if not cls.objects.filter(id=job_id, status__in=cls.IN_FLIGHT_STATUSES).update(
+                status=status, email=email, finished_at=timezone.now()
+            ):
+                return False
+            if status != 'found':
+                CustomUser.objects.filter(id=user_id).update(credits=F('credits') + 1)
+        return True
+
+    @classmethod
+    def expire_stale(cls, **filters):
+        """Fail and refund in-flight lookups older than EMAIL_LOOKUP_TIMEOUT_SECONDS, their task was lost"""
+        cutoff = timezone.now() - timedelta(seconds=settings.EMAIL_LOOKUP_TIMEOUT_SECONDS)
+        stale = cls.objects.filter(
+            status__in=cls.IN_FLIGHT_STATUSES, created_at__lt=cutoff, **filters
+        ).values_list('id', 'user_id')
+        return sum(cls.finish(job_id, user_id, 'failed') for job_id, user_id in stale)
+
+
+class ListEnrichmentJob(models.Model):
+    """
+    Bulk find-emails run over a saved list. Credits for every member we look up
+    are reserved when the job is queued and the unused ones refunded at the end.
+    """
+    IN_FLIGHT_STATUSES = ['pending', 'running']
+
+    saved_list = models.ForeignKey(SavedList, on_delete=models.CASCADE, related_name='enrichment_jobs')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='list_enrichment_jobs')
+    status = models.CharField(
+        max_length=16,
+        choices=[
+            ('pending', 'Pending'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('failed', 'Failed')
+        ],
+        default='pending'
+    )
+    journalist_ids = models.JSONField(default=list)
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    found = models.IntegerField(default=0)
+    reserved_credits = models.IntegerField(default=0)
+    refunded_credits = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # One enrichment per list at a time, so credits are never reserved twice
+            models.UniqueConstraint(
+                fields=['saved_list'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='unique_in_flight_list_enrichment',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.saved_list_id} ({self.status}, {self.processed}/{self.total})"
+
+    @property
+    def is_finished(self):
+        return self.status not in self.IN_FLIGHT_STATUSES
+
+    @property
+    def progress_percent(self):
+        return int(100 * self.processed / self.total) if self.total else 100
+
+    @classmethod
+    def settle_credits(cls, job_id):
+        """Refund the credits a bulk enrichment reserved but didn't use. Safe to call twice."""
+        with transaction.atomic():
+            job = cls.objects.select_for_update().get(id=job_id)
+            if job.refunded_credits is not None:
+                return job.refunded_credits
+            job.refunded_credits = max(job.reserved_credits - job.found, 0)
+            job.save(update_fields=['refunded_credits'])
+            CustomUser.objects.filter(id=job.user_id).update(credits=F('credits') + job.refunded_credits)
+            if job.found:
+                CustomUser.objects.filter(id=job.user_id).update(has_retrieved_email=True)
+        return job.refunded_credits
+
+    @classmethod
+    def expire_stale(cls, **filters):
+        """
+        Fail in-flight enrichments older than LIST_ENRICHMENT_TIMEOUT_SECONDS, their task
+        was lost or killed before it could settle, and refund the unused reservation
+        """
+        cutoff = timezone.now() - timedelta(seconds=settings.LIST_ENRICHMENT_TIMEOUT_SECONDS)
+        stale = list(cls.objects.filter(
+            status__in=cls.IN_FLIGHT_STATUSES, created_at__lt=cutoff, **filters
+        ).values_list('id', flat=True))
+        expired = 0
+        for job_id in stale:
+            if cls.objects.filter(id=job_id, status__in=cls.IN_FLIGHT_STATUSES).update(
+                status='failed', finished_at=timezone.now()
+            ):
+                cls.settle_credits(job_id)
+                expired += 1
+        return expired
+
+
+class EmailDomain(models.Model):
+    """What we know about a domain's mail setup, shared by every worker"""
+    domain = models.CharField(max_length=255, unique=True)
+    mx_hosts = models.JSONField(default=list, blank=True)
+    smtp_reachable = models.BooleanField(null=True, blank=True)
+    is_catch_all = models.BooleanField(null=True, blank=True)
+    is_failed = models.BooleanField(default=False)  # No point guessing here until re-checked
+    last_error = models.CharField(max_length=255, blank=True, default='')
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.domain} ({'failed' if self.is_failed else 'ok'})"
+
+    def is_fresh(self):
+        """Whether the verdict is recent enough to trust without re-checking"""
+        from core.utils.email_domains import DOMAIN_VERDICT_TTL, FAILED_DOMAIN_TTL
+        if not self.last_checked_at:
+            return False
+        ttl = FAILED_DOMAIN_TTL if self.is_failed else DOMAIN_VERDICT_TTL
+        return timezone.now() - self.last_checked_at < ttl
+
+
+class DomainEmailPattern(models.Model):
+    """Email format used by a news source domain, e.g. first.last"""
+    domain = models.CharField(max_length=255, unique=True)  # Source domain, without www.
+    email_domain = models.CharField(max_length=255)  # Domain the addresses are on, may differ from the site
+    pattern = models.CharField(max_length=32)  # Key of core.utils.email_patterns.EMAIL_PATTERNS
+    confidence = models.FloatField()
+    sample_size = models.PositiveIntegerField(default=0)
+    method = models.CharField(
+        max_length=16,
+        choices=[
+            ('learned', 'Learned from known emails'),
+            ('smtp', 'Accepted by mail server'),
+            ('hunter', 'Reported by Hunter.io')
+        ],
+        default='learned'
+    )
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.domain}: {self.pattern} ({self.confidence:.0%})"
+
 @receiver(post_save, sender=Journalist)
 def update_typesense_on_save(sender, instance, created, **kwargs):
     """
@@ -460,35 +811,35 @@ def update_typesense_on_save(sender, instance, created, **kwargs):
     update_journalist_in_typesense(instance)
 
 
+def record_journalists_created(count=1):
+    """Add newly created journalists to today's stats; also called after bulk creates, which skip signals"""
+    if count <= 0:
+        return
+    # Get today's date and create a timezone-aware datetime for the start of the day
+    today = timezone.now().date()
+    today_start = timezone.make_aware(timezone.datetime.combine(today, timezone.datetime.min.time()))
+    
+    try:
+        # Cheap in-place increment, no table count per new journalist
+        updated = DbStat.objects.filter(date=today_start).update(
+            num_journalists=models.F('num_journalists') + count,
+            num_journalists_added_today=models.F('num_journalists_added_today') + count,
+        )
+        
+        if not updated:
+            # First journalist of the day, roll up any missed days including today
+            from core.utils.stats_rollup import rollup_db_stats_incremental
+            rollup_db_stats_incremental()
+            # Daily stats rolled over, refresh the public pages showing them
+            invalidate_public_pages()
+    except Exception as e:
+        logger.error(f"Error tracking journalist creation: {str(e)}")
+
+
 @receiver(post_save, sender=Journalist)
 def track_journalist_creation(sender, instance, created, **kwargs):
     if created:
-        # Get today's date and create timezone-aware datetime objects for start/end of day
-        today = timezone.now().date()
-        today_start = timezone.make_aware(timezone.datetime.combine(today, timezone.datetime.min.time()))
-        today_end = timezone.make_aware(timezone.datetime.combine(today, timezone.datetime.max.time()))
-        
-        # Get or create today's stat with precise datetime filtering
-        try:
-            stat = DbStat.objects.filter(
-                date__gte=today_start,
-                date__lte=today_end
-            ).first()
-            
-            if stat:
-                # Update existing stat
-                stat.num_journalists_added_today += 1
-                stat.num_journalists = Journalist.objects.count()
-                stat.save()
-            else:
-                # Create new stat
-                DbStat.objects.create(
-                    date=today_start,
-                    num_journalists=Journalist.objects.count(),
-                    num_journalists_added_today=1
-                )
-        except Exception as e:
-            logger.error(f"Error tracking journalist creation: {str(e)}")
+        record_journalists_created()
 
 
 class BlogPost(models.Model):
@@ -496,6 +847,10 @@ class BlogPost(models.Model):
     slug = models.SlugField(unique=True, max_length=255)
     html_content = models.TextField()
     featured_image = models.ImageField(upload_to='blog_images/', blank=True, null=True)
+    # Set by the SEObot sync to skip articles that haven't changed since the last run
+    seobot_id = models.CharField(max_length=64, blank=True, default='')
+    seobot_version = models.CharField(max_length=64, blank=True, default='')
+    content_hash = models.CharField(max_length=64, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -0,0 +1,338 @@
+import time
+import logging
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchHeadline
+from django.db.models import F, Max
+from core.models import Journalist, NewsPage, NewsSource, NewsPageCategory
+from core.typesense_config import get_typesense_client
+from typesense.exceptions import TypesenseClientError
+from core.embeddings import embed_query, get_query_embedder, nearest_journalists
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker state lives in the shared cache so all web workers agree
+BREAKER_FAILURES_KEY = 'search_breaker_failures'
+BREAKER_OPEN_UNTIL_KEY = 'search_breaker_open_until'
+
+# Only these count against Typesense; anything else is our bug or bad input, not an outage
+TYPESENSE_ERRORS = (TypesenseClientError, requests.exceptions.RequestException)
+
+NO_RESULTS = {'found': 0, 'hits': []}
+
+
+def resolve_filter_names(source_id='', category_id=''):
+    """
+    Source and category names for the Typesense filters, looked up once before
+    any backend is called. Returns None if either id is not a known row.
+    """
+    names = {'source': None, 'category': None}
+    for key, model, object_id in (('source', NewsSource, source_id), ('category', NewsPageCategory, category_id)):
+        if not object_id:
+            continue
+        if not str(object_id).isdigit():
+            return None
+        names[key] = model.objects.filter(id=object_id).values_list('name', flat=True).first()
+        if names[key] is None:
+            return None
+    return names
+
+
+class SearchBackend:
+    """
+    Journalist search backend interface.
+    search() returns a Typesense-shaped dict: {'found': int, 'hits': [{'document': {'id': str}, ...}]}
+    so the view can render results the same way whichever backend answered.
+    """
+    name = None
+
+    def search(self, query, country='', source_id='', category_id='', page=1, per_page=10):
+        raise NotImplementedError
+
+
+class TypesenseSearchBackend(SearchBackend):
+    name = 'typesense'
+
+    def __init__(self, timeout_seconds=None, exhaustive_search=True, full_highlights=True, filter_names=None):
+        self.timeout_seconds = timeout_seconds
+        self.exhaustive_search = exhaustive_search
+        self.full_highlights = full_highlights
+        # Pre-resolved by search_journalists, so the guarded call only talks to Typesense
+        self.filter_names = filter_names
+
+    def search(self, query, country='', source_id='', category_id='', page=1, per_page=10):
+        if self.timeout_seconds:
+            # No retries on the web path, the breaker decides what to do on failure
+            client = get_typesense_client(connection_timeout_seconds=self.timeout_seconds, num_retries=0)
+        else:
+            client = get_typesense_client()
+
+        search_parameters = {
+            'q': query,
+            'query_by': 'name,description,sources,categories,article_titles,article_content',
+            'query_by_weights': '8,4,2,2,6,1',  # Weight name highest, then article titles, then other fields
+            'per_page': per_page,
+            'page': page,
+            'highlight_fields': 'article_titles,article_content',  # Highlight matching content
+            'prefix': False,  # Disable prefix search for exact matching
+            'typo_tolerance': False,  # Disable typo tolerance for exact matching
+            'min_len_1typo': 4,  # Minimum length for 1 typo
+            'min_len_2typo': 8,  # Minimum length for 2 typos
+            'exhaustive_search': self.exhaustive_search,  # Exhaustive is slower but more accurate
+        }
+
+        if self.full_highlights:
+            # Return full field content for highlighting
+            search_parameters['highlight_full_fields'] = 'article_titles,article_content'
+
+        # Add filters if specified
+        filter_rules = []
+        if country:
+            filter_rules.append(f'country:{country}')
+        filter_names = self.filter_names
+        if filter_names is None and (source_id or category_id):
+            filter_names = resolve_filter_names(source_id, category_id)
+            if filter_names is None:
+                return NO_RESULTS
+        if source_id:
+            filter_rules.append(f"sources:[{filter_names['source']}]")
+        if category_id:
+            filter_rules.append(f"categories:[{filter_names['category']}]")
+
+        if filter_rules:
+            search_parameters['filter_by'] = ' && '.join(filter_rules)
+
+        logger.info(f"Searching Typesense with parameters: {search_parameters}")
+        return client.collections['journalists'].documents.search(search_parameters)
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Full-text fallback over Journalist.search_vector and NewsPage.search_vector.
+    Both lookups hit GIN indexes; candidates are merged and ranked in Python.
+    """
+    name = 'postgres'
+
+    # Upper bound on candidates per side, keeps ranking cheap for broad queries
+    MAX_CANDIDATES = 1000
+
+    def search(self, query, country='', source_id='', category_id='', page=1, per_page=10):
+        search_query = SearchQuery(query, search_type='websearch')
+
+        journalists = Journalist.objects.all()
+        if country:
+            journalists = journalists.filter(country=country)
+        if source_id:
+            journalists = journalists.filter(sources__id=source_id)
+        if category_id:
+            journalists = journalists.filter(categories__id=category_id)
+
+        # Journalists whose own name/description/sources/categories match
+        scores = dict(
+            journalists.filter(search_vector=search_query).annotate(
+                rank=SearchRank(F('search_vector'), search_query)
+            ).order_by('-rank').values_list('id', 'rank').distinct()[:self.MAX_CANDIDATES]
+        )
+
+        # Journalists who wrote matching articles, ranked by their best article
+        # values('journalists') is a LEFT JOIN, keep articles without journalists out of the groups
+        articles = NewsPage.objects.filter(search_vector=search_query, is_news_article=True, journalists__isnull=False)
+        if country or source_id or category_id:
+            articles = articles.filter(journalists__in=journalists)
+        article_matches = articles.values('journalists').annotate(
+            rank=Max(SearchRank(F('search_vector'), search_query))
+        ).order_by('-rank').values_list('journalists', 'rank')[:self.MAX_CANDIDATES]
+
+        for journalist_id, rank in article_matches:
+            scores[journalist_id] = scores.get(journalist_id, 0) + rank
+
+        ranked_ids = sorted(scores, key=lambda journalist_id: (-scores[journalist_id], journalist_id))
+        page_ids = ranked_ids[(page - 1) * per_page:page * per_page]
+
+        return {
+            'found': len(ranked_ids),
+            'hits': [
+                {'document': {'id': str(journalist_id)}, 'highlights': highlights}
+                for journalist_id, highlights in self._highlights(page_ids, search_query)
+            ],
+        }
+
+    def _highlights(self, journalist_ids, search_query):
+        """Yield (journalist_id, highlights) with matching article titles marked up"""
+        headlines = {}
+        matching_articles = NewsPage.objects.filter(
+            journalists__in=journalist_ids,
+            search_vector=search_query,
+            is_news_article=True,
+        ).annotate(
+            headline=SearchHeadline('title', search_query, start_sel='<mark>', stop_sel='</mark>', highlight_all=True)
+        ).values_list('journalists', 'headline')
+
+        for journalist_id, headline in matching_articles:
+            headlines.setdefault(journalist_id, []).append(headline)
+
+        for journalist_id in journalist_ids:
+            yield journalist_id, [
+                {'field': 'article_titles', 'snippets': [headline]}
+                for headline in headlines.get(journalist_id, [])[:3]
+            ]
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """
+    Merge ranked id lists: each list contributes 1 / (k + rank) per id.
+    Returns ids sorted by fused score, best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0) + 1 / (k + rank)
+    return sorted(scores, key=lambda item_id: (-scores[item_id], item_id))
+
+
+class HybridSearchBackend(SearchBackend):
+    """
+    Keyword hits (Typesense BM25, or the Postgres fallback) fused with
+    semantic nearest neighbours from the pgvector ivfflat index.
+    """
+    name = 'hybrid'
+
+    def __init__(self, keyword_backend, probes=None, candidates=None, rrf_k=None, embed_timeout_seconds=None):
+        self.keyword_backend = keyword_backend
+        # The query is embedded on the web request path, so no retries and a timeout within the SLO
+        self.embedder = get_query_embedder(embed_timeout_seconds or settings.SEARCH_LATENCY_SLO_SECONDS)
+        self.probes = probes or settings.SEARCH_IVFFLAT_PROBES
+        self.candidates = candidates or settings.SEARCH_HYBRID_CANDIDATES
+        self.rrf_k = rrf_k or settings.SEARCH_RRF_K
+
+    def search(self, query, country='', source_id='', category_id='', page=1, per_page=10):
+        filter_args = dict(country=country, source_id=source_id, category_id=category_id)
+        try:
+            keyword_results = self.keyword_backend.search(query, page=1, per_page=self.candidates, **filter_args)
+        except Exception as e:
+            logger.error(f"Hybrid keyword retrieval failed, using Postgres: {str(e)}")
+            keyword_results = PostgresSearchBackend().search(query, page=1, per_page=self.candidates, **filter_args)
+
+        keyword_ids = [int(hit['document']['id']) for hit in keyword_results['hits']]
+        highlights = {int(hit['document']['id']): hit.get('highlights', []) for hit in keyword_results['hits']}
+
+        journalists = Journalist.objects.all()
+        if country or source_id or category_id:
+            filtered = journalists
+            if country:
+                filtered = filtered.filter(country=country)
+            if source_id:
+                filtered = filtered.filter(sources__id=source_id)
+            if category_id:
+                filtered = filtered.filter(categories__id=category_id)
+            # Subquery keeps the m2m joins from duplicating neighbours
+            journalists = journalists.filter(pk__in=filtered.values('pk'))
+
+        semantic_ids = [
+            journalist_id for journalist_id, _ in
+            nearest_journalists(embed_query(query, embedder=self.embedder), self.candidates, probes=self.probes, queryset=journalists)
+        ]
+
+        ranked_ids = reciprocal_rank_fusion([keyword_ids, semantic_ids], k=self.rrf_k)
+        page_ids = ranked_ids[(page - 1) * per_page:page * per_page]
+
+        return {
+            'found': len(ranked_ids),
+            'hits': [
+                {'document': {'id': str(journalist_id)}, 'highlights': highlights.get(journalist_id, [])}
+                for journalist_id in page_ids
+            ],
+        }
+
+
+class CircuitBreaker:
+    """
+    Opens after repeated failures or SLO breaches of the primary backend and
+    routes traffic to the fallback. Once the cooldown passes, the next request
+    tries the primary again and a success closes the breaker.
+    """
+
+    def __init__(self, failure_threshold, cooldown_seconds):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+    def is_open(self):
+        open_until = cache.get(BREAKER_OPEN_UNTIL_KEY)
+        return open_until is not None and time.time() < open_until
+
+    def record_success(self):
+        cache.delete_many([BREAKER_FAILURES_KEY, BREAKER_OPEN_UNTIL_KEY])
+
+    def record_failure(self):
+        # Failures only count towards opening within one cooldown window
+        cache.add(BREAKER_FAILURES_KEY, 0, self.cooldown_seconds)
+        try:
+            failures = cache.incr(BREAKER_FAILURES_KEY)
+        except ValueError:
+            failures = 1
+            cache.set(BREAKER_FAILURES_KEY, failures, self.cooldown_seconds)
+
+        if failures >= self.failure_threshold:
+            logger.warning(f"Opening search circuit breaker for {self.cooldown_seconds}s after {failures} failures")
+            cache.set(BREAKER_OPEN_UNTIL_KEY, time.time() + self.cooldown_seconds, self.cooldown_seconds)
+
+
+def search_journalists(query, country='', source_id='', category_id='', page=1, per_page=10, mode='keyword'):
+    """
+    Search journalists on Typesense, failing over to Postgres when Typesense
+    errors, breaches the latency SLO too often, or the breaker is open.
+    mode='hybrid' fuses keyword and semantic results, and drops back to
+    keyword search if the embedding side fails.
+    Returns (backend_name, results).
+    """
+    slo_seconds = settings.SEARCH_LATENCY_SLO_SECONDS
+    breaker = CircuitBreaker(
+        failure_threshold=settings.SEARCH_BREAKER_FAILURE_THRESHOLD,
+        cooldown_seconds=settings.SEARCH_BREAKER_COOLDOWN_SECONDS,
+    )
+    fallback = PostgresSearchBackend()
+    # Bad filter ids from the query string are answered here, outside the breaker's watch
+    filter_names = resolve_filter_names(source_id, category_id)
+    if filter_names is None:
+        logger.info(f"Unknown search filter: source {source_id!r}, category {category_id!r}")
+        return fallback.name, NO_RESULTS
+    primary = TypesenseSearchBackend(timeout_seconds=slo_seconds, filter_names=filter_names)
+    search_args = dict(
+        query=query, country=country, source_id=source_id,
+        category_id=category_id, page=page, per_page=per_page,
+    )
+
+    if mode == 'hybrid':
+        # Fusion only needs the top candidates, so skip Typesense's exhaustive mode,
+        # and full article bodies for every candidate when only a page is shown
+        keyword_backend = fallback if breaker.is_open() else TypesenseSearchBackend(
+            timeout_seconds=slo_seconds, exhaustive_search=False, full_highlights=False, filter_names=filter_names
+        )
+        hybrid = HybridSearchBackend(keyword_backend, embed_timeout_seconds=slo_seconds)
+        try:
+            return hybrid.name, hybrid.search(**search_args)
+        except Exception as e:
+            # Includes the embedding API timing out or rate limiting us
+            logger.error(f"Hybrid search failed, falling back to keyword search: {str(e)}")
+
+    if not breaker.is_open():
+        start_time = time.monotonic()
+        try:
+            results = primary.search(**search_args)
+        except TYPESENSE_ERRORS as e:
+            logger.error(f"Typesense search failed, falling back to Postgres: {str(e)}")
+            breaker.record_failure()
+        except Exception as e:
+            logger.error(f"Typesense search raised {type(e).__name__}, falling back to Postgres: {str(e)}")
+        else:
+            elapsed = time.monotonic() - start_time
+            if elapsed > slo_seconds:
+                # Still serve the answer we already paid for, but count the breach
+                logger.warning(f"Typesense search took {elapsed:.2f}s, over the {slo_seconds}s SLO")
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return primary.name, results
+
+    return fallback.name, fallback.search(**search_args)
@@ -4,7 +4,7 @@ import os
 from django.utils import timezone
 import openai
 from tqdm import tqdm
-from core.models import DigitalPRExample, NewsPage, NewsPageCategory, NewsSource, Journalist
+from core.models import DigitalPRExample, NewsPage, NewsPageCategory, NewsSource, Journalist, CustomUser, EmailDiscovery, EmailLookupJob, ListEnrichmentJob, BlogPost, record_journalists_created
 from spider_rs import Website 
 from django.db import close_old_connections, IntegrityError
 from asgiref.sync import sync_to_async
@@ -12,19 +12,17 @@ from django.utils.text import slugify
 from openai import AzureOpenAI
 from dotenv import load_dotenv
 import logging
-from PIL import Image, ImageDraw, ImageFont
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import F, Q
+from django.contrib.postgres.search import SearchQuery
 import lunary
 import uuid
 from markdownify import markdownify
 from django.db import transaction
 from mailscout import Scout
-from functools import lru_cache
 from datetime import datetime
 import requests
 from typing import Optional
-import requests_cache
 from urllib.parse import urlparse, urlunparse
 from tenacity import (
     retry,
@@ -38,6 +36,27 @@ from core.celery import app  # Import the Celery app instance
 from celery import shared_task
 from core.typesense_config import get_typesense_client
 from core.utils.typesense_utils import sync_recent_journalists
+from core.utils.journalist_pool import refresh_example_journalist_pool
+from core.utils.stats_rollup import rollup_db_stats_incremental
+from core.utils.page_cache import invalidate_public_pages
+from core.utils.batching import iter_keyset_batches
+from core.utils.task_batching import get_page_batcher
+from core.utils.work_queue import WORKER_ID, claim_work, reclaim_work
+from core.utils.crawl_archive import archive_pages, prune_crawl_archive
+from core.utils.near_duplicates import create_news_page, sync_duplicates
+from core.utils.url_classifier import DEFER, SKIP, get_url_classifier, train_url_classifier
+from core.utils.crawl_planner import due_sources, page_budget, plan_crawl_budgets, record_source_yield, schedule_next_crawl
+from core.embeddings import update_journalist_embeddings, rebuild_embedding_index
+from core.utils.similar_journalists import refresh_similar_journalists
+from core.utils.profile_descriptions import process_journalist_descriptions
+from core.utils.social_images import create_social_sharing_image
+from core.utils.seobot import generate_featured_image, shorten_title, sync_seobot_posts
+from core.utils.email_patterns import build_email, get_domain_pattern, group_journalists_by_domain, learn_domain_patterns, normalize_domain, record_smtp_pattern
+from core.utils.email_domains import get_domain_intel, get_or_check_domain
+from core.utils.email_guessing import guess_emails_concurrently
+from core.utils.hunter import DOMAIN_SEARCH_MIN_JOURNALISTS, domain_search_max_results, get_hunter_client, match_domain_emails, record_hunter_pattern
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
 import time
 import socket
 
@@ -101,30 +120,12 @@ def validate_azure_endpoint():
 if not validate_azure_endpoint():
     logger.error("Failed to validate Azure OpenAI endpoint")
 
-# Cache failed domains to avoid rechecking
-failed_domains = set()
-
-@lru_cache(maxsize=1000)
-def is_failed_domain(domain: str) -> bool:
-    """Check if domain is in failed set"""
-    return domain in failed_domains
-
 async def crawl_news_sources(domain_limit: int = None, page_limit: int = None, max_concurrent_tasks: int = 2):
     try:
         logger.info(f"Starting crawl at {timezone.now()}")
         
         # Use sync_to_async with thread_sensitive=False to avoid holding connections
-        news_sources = await sync_to_async(list, thread_sensitive=False)(
-            NewsSource.objects.filter(
-                Q(last_crawled__lt=timezone.now() - timezone.timedelta(days=7)) |
-                Q(last_crawled__isnull=True)
-            ).filter(
-                url__isnull=False
-            ).order_by(
-                '-priority',
-                'last_crawled'
-            )[:domain_limit]
-        )
+        news_sources = await sync_to_async(list, thread_sensitive=False)(due_sources(domain_limit))
         
         logger.info(f"Found {len(news_sources)} news sources to crawl")
         
@@ -133,7 +134,7 @@ async def crawl_news_sources(domain_limit: int = None, page_limit: int = None, m
         
         tasks = []
         for news_source in news_sources:
-            tasks.append(crawl_single_news_source(news_source, limit=page_limit, semaphore=semaphore))
+            tasks.append(crawl_single_news_source(news_source, limit=page_budget(news_source, page_limit), semaphore=semaphore))
         
         await asyncio.gather(*tasks)
                 
@@ -157,6 +158,7 @@ async def crawl_single_news_source(news_source, limit, semaphore):
                 with transaction.atomic():
                     news_source.refresh_from_db()
                     news_source.last_crawled = timezone.now()
+                    schedule_next_crawl(news_source)
                     news_source.save()
                 
             await update_news_source()
@@ -210,12 +212,17 @@ async def fetch_website(url: str, limit: int = 1000_000, depth: int = 3) -> Webs
             return NewsSource.objects.get(url=url)
             
         news_source = await get_news_source()
+        await sync_to_async(archive_pages)(pages, news_source)
+        url_classifier = await sync_to_async(get_url_classifier)(news_source.id)
+        pages_new = 0
         
         for page in pages:
             await asyncio.sleep(0.1)
+            if url_classifier.decide(page.url) == SKIP:
+                continue
             try:
                 @sync_to_async
-                def create_news_page():
+                def save_news_page():
                     with transaction.atomic():
                         # Skip if page already exists
                         if NewsPage.objects.filter(url=page.url).exists():
@@ -223,8 +230,8 @@ async def fetch_website(url: str, limit: int = 1000_000, depth: int = 3) -> Webs
 
                         cleaned_content = clean_html(page.content)
 
-                        # Create new page only if it doesn't exist
-                        news_page = NewsPage.objects.create(
+                        # Create new page only if it doesn't exist, near-duplicates are linked to their canonical page
+                        news_page, _ = create_news_page(
                             url=page.url,
                             title=str(page.title()),  # Convert title to string
                             content=cleaned_content,
@@ -232,7 +239,8 @@ async def fetch_website(url: str, limit: int = 1000_000, depth: int = 3) -> Webs
                         )
                         return news_page, True
 
-                await create_news_page()
+                _, created = await save_news_page()
+                pages_new += created
                 
             except Exception as e:
                 logger.error(f"Error processing page {page.url}: {str(e)}", exc_info=True)
@@ -240,6 +248,8 @@ async def fetch_website(url: str, limit: int = 1000_000, depth: int = 3) -> Webs
             finally:
                 close_old_connections()
 
+        await sync_to_async(record_source_yield)(news_source.id, pages_fetched=len(pages), pages_new=pages_new)
+
     except Exception as e:
         logger.error(f"Error in fetch_website for {url}: {str(e)}", exc_info=True)
         raise
@@ -349,6 +359,8 @@ def extract_journalists_with_gpt(content: str) -> dict:
 
         result = response.choices[0].message.content
         journalists_data = json.loads(result)
+        if isinstance(journalists_data, dict) and response.usage:
+            journalists_data['llm_tokens'] = response.usage.total_tokens  # Feeds the crawl planner's cost per source
         logger.info(f"Successfully extracted journalists for run {run_id}")
         return journalists_data
 
@@ -408,7 +420,9 @@ async def process_all_pages_journalists(limit: int = 10, re_process: bool = Fals
     if re_process:
         pages = await sync_to_async(list)(NewsPage.objects.exclude(content='').all()[:limit])
     else:
-        pages = await sync_to_async(list)(NewsPage.objects.exclude(content='').filter(processed=False)[:limit])
+        # Claim the pages so the Celery sweep and other loops don't send them to GPT too
+        page_ids = await sync_to_async(claim_work)('journalists', limit)
+        pages = await sync_to_async(list)(NewsPage.objects.filter(id__in=page_ids))
     
     # Add all pages to the GPT queue
     for page in pages:
@@ -445,6 +459,7 @@ async def process_all_pages_journalists(limit: int = 10, re_process: bool = Fals
                 # Write to DB synchronously
                 @sync_to_async
                 def save_to_db():
+                    new_journalists = 0
                     with transaction.atomic():
                         # Save the is_news_article value
                         page.is_news_article = journalists_data.get('content_is_full_news_article', False)
@@ -477,6 +492,7 @@ async def process_all_pages_journalists(limit: int = 10, re_process: bool = Fals
                                                 'image_url': image_url
                                             }
                                         )
+                                        new_journalists += created
                                         page.journalists.add(journalist)
                                     except IntegrityError:
                                         # Log duplicate journalist as info instead of error
@@ -489,7 +505,17 @@ async def process_all_pages_journalists(limit: int = 10, re_process: bool = Fals
                                             logger.warning(f"Could not find existing journalist with slug: {journalist_slug}")
                         
                         page.processed = True
+                        page.claimed_at = None
+                        page.claimed_by = None
                         page.save()
+                        sync_duplicates([page.id])
+                    record_source_yield(
+                        page.source_id,
+                        pages_processed=1,
+                        news_articles=int(page.is_news_article),
+                        new_journalists=new_journalists,
+                        llm_tokens=journalists_data.get('llm_tokens', 0),
+                    )
                 
                 await save_to_db()
                 
@@ -526,15 +552,8 @@ def process_all_journalists_sync(limit: int = 10, re_process: bool = False):
 
 
 
-@app.task(
-    bind=True,
-    name='categorize_news_page_with_gpt'
-)
-def categorize_news_page_with_gpt(self, page: NewsPage):
-    """Add this transaction wrapper and explicit category sync"""
-    available_categories = NewsPageCategory.objects.all()
-    
-    available_categories_str = ', '.join([f"{category.name}" for category in available_categories])
+def suggest_page_categories(page: NewsPage, available_categories_str: str) -> str:
+    """Ask the LLM for a page's categories. Returns the raw JSON string it answered with."""
     json_schema = {
         "categories": [
             "category_name"
@@ -569,7 +588,18 @@ def categorize_news_page_with_gpt(self, page: NewsPage):
         temperature=0.3,
         response_format={"type": "json_object"}
     )
-    result = response.choices[0].message.content
+    return response.choices[0].message.content
+
+
+@app.task(
+    bind=True,
+    name='categorize_news_page_with_gpt'
+)
+def categorize_news_page_with_gpt(self, page: NewsPage):
+    """Add this transaction wrapper and explicit category sync"""
+    available_categories = NewsPageCategory.objects.all()
+    available_categories_str = ', '.join([f"{category.name}" for category in available_categories])
+    result = suggest_page_categories(page, available_categories_str)
     try:
         categories_data = json.loads(result)
         logger.info(f"Categories from GPT: {categories_data}")
@@ -584,6 +614,9 @@ def categorize_news_page_with_gpt(self, page: NewsPage):
                 logger.info(f"Adding category {category.name} to page {page.title}")
                 page.categories.add(category)
             
+            NewsPage.objects.filter(id=page.id).update(categorized=True, claimed_at=None, claimed_by=None)
+            sync_duplicates([page.id])
+
             # The signals should handle the rest, but let's force sync just in case
             page.source.sync_categories()
             for journalist in page.journalists.all():
@@ -612,94 +645,6 @@ def categorize_pages_task(limit=1000):
         categorize_page_task.delay(page.id)
 
 
-def create_social_sharing_image():
-    logger.info("Starting social sharing image creation")
-    try:
-        media_outlets_count = NewsSource.objects.count()
-        journalists_count = Journalist.objects.count()
-        logger.info(f"Found {media_outlets_count:,} media outlets and {journalists_count:,} journalists")
-        
-        # Create gradient background
-        width = 1200
-        height = 630
-        image = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(image)
-        logger.debug(f"Created new image with dimensions {width}x{height}")
-
-        # Draw gradient from dark green to light green
-        for y in range(height):
-            r = int(22 + (y/height) * 20)  # Slight red variation
-            g = int(163 + (y/height) * 20)  # Green variation from ~163 to ~183
-            b = int(74 + (y/height) * 20)   # Slight blue variation
-            for x in range(width):
-                draw.point((x, y), fill=(r, g, b))
-
-        # Load and paste logo
-        logo_path = os.path.join(settings.STATIC_ROOT, 'img', 'logo.png')
-        logger.debug(f"Loading logo from: {logo_path}")
-        try:
-            logo = Image.open(logo_path)
-            logger.info(f"Successfully loaded logo with dimensions {logo.size}")
-        except Exception as e:
-            logger.error(f"Failed to load logo from {logo_path}: {str(e)}")
-            raise
-
-        # Resize logo to reasonable size (e.g. 200px height)
-        logo_height = 200
-        aspect_ratio = logo.size[0] / logo.size[1]
-        logo_width = int(logo_height * aspect_ratio)
-        logo = logo.resize((logo_width, logo_height))
-        
-        # Add text on right side
-        try:
-            font_path = os.path.join(settings.STATIC_ROOT, 'fonts', 'SpaceMono-Bold.ttf')
-            logger.debug(f"Loading font from: {font_path}")
-            font = ImageFont.truetype(font_path, 60)
-            # Create larger font for NachoPR
-            nacho_font = ImageFont.truetype(font_path, 120)
-            logger.info("Successfully loaded custom fonts")
-        except Exception as e:
-            logger.warning(f"Failed to load custom font, falling back to default: {str(e)}")
-            font = ImageFont.load_default()
-            nacho_font = font
-
-        # Calculate vertical position for logo and text to be aligned
-        content_y = 200  # Common starting position for logo and text
-        
-        # Add NachoPR text centered at top
-        nacho_text = "NachoPR"
-        nacho_bbox = draw.textbbox((0, 0), nacho_text, font=nacho_font)
-        nacho_width = nacho_bbox[2] - nacho_bbox[0]
-        nacho_x = (width - nacho_width) // 2
-        nacho_y = 40  # Padding from top
-        draw.text((nacho_x, nacho_y), nacho_text, font=nacho_font, fill=(255, 255, 255))
-
-        # Paste logo on left side with padding
-        logo_x = 100
-        logo_y = content_y - 20
-        image.paste(logo, (logo_x, logo_y), logo if logo.mode == 'RGBA' else None)
-
-        # Add main text aligned with logo
-        text = f"Connect with\n{journalists_count:,} Journalists\nfrom {media_outlets_count:,}\nMedia Outlets"
-        text_x = logo_x + logo_width + 100
-        text_y = content_y
-        
-        # Draw text with white color
-        draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255))
-
-        # Save the image
-        output_path = os.path.join(settings.STATIC_ROOT, 'img', 'social_share.png')
-        logger.debug(f"Saving image to: {output_path}")
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        image.save(output_path, 'PNG')
-        logger.info("Successfully created and saved social sharing image")
-
-    except Exception as e:
-        logger.error(f"Failed to create social sharing image: {str(e)}", exc_info=True)
-        raise
-
-
-
 def search_google_for_digital_pr_examples(domain_limit: int = 2, query: str = ''):
     """Search Google for digital PR examples"""
 
@@ -725,9 +670,46 @@ def search_google_for_digital_pr_examples(domain_limit: int = 2, query: str = ''
     pass
 
 
-def find_digital_pr_examples(search_google: bool = False):
+def backfill_news_page_search_vectors(batch_size: int = 500) -> int:
+    """
+    Populate search_vector for pages written before the search vector trigger existed.
+    Runs one UPDATE per keyset batch so it can be stopped and resumed at any point.
+    """
+    updated = 0
+    pages = NewsPage.objects.filter(search_vector__isnull=True)
+    for batch in iter_keyset_batches(pages, batch_size, fields=()):
+        page_ids = [page_id for page_id, in batch]
+        updated += NewsPage.objects.filter(pk__in=page_ids).update(
+            search_vector=NewsPage.search_vector_expression()
+        )
+        logger.info(f"Backfilled search vectors for {updated} pages")
+    return updated
+
+
+def backfill_journalist_search_vectors(batch_size: int = 500, since=None) -> int:
+    """
+    Populate search_vector for journalists, used by the Postgres search fallback.
+    With since, journalists created after that time are refreshed as well.
+    Category and description changes refresh the vector where they are written.
+    """
+    updated = 0
+    journalists = Journalist.objects.filter(search_vector__isnull=True)
+    if since:
+        journalists = Journalist.objects.filter(Q(search_vector__isnull=True) | Q(created_at__gte=since))
+    for batch in iter_keyset_batches(journalists, batch_size, fields=()):
+        journalist_ids = [journalist_id for journalist_id, in batch]
+        # update() skips Journalist.save(), so no Typesense writes here
+        updated += Journalist.objects.filter(pk__in=journalist_ids).update(
+            search_vector=Journalist.search_vector_expression()
+        )
+        logger.info(f"Backfilled search vectors for {updated} journalists")
+    return updated
+
+
+def find_digital_pr_examples(search_google: bool = False, batch_size: int = 500):
     """
     Find news pages that match digital PR patterns and create DigitalPRExample entries.
+    Matching runs as a full-text query against the GIN-indexed search_vector.
     """
     pr_queries = [
         "expert reveals",
@@ -737,180 +719,53 @@ def find_digital_pr_examples(search_google: bool = False):
         'professor',
     ]
 
-    # Build Q objects for positive and negative queries
-    positive_q = Q()
+    # Any of the PR phrases, and none of the negative terms
+    search_query = None
     for query in pr_queries:
-        positive_q |= (
-            Q(content__icontains=query) | 
-            Q(title__icontains=query)
-        )
-
-    negative_q = Q()
+        phrase_query = SearchQuery(query, search_type='phrase')
+        search_query = phrase_query if search_query is None else search_query | phrase_query
     for query in negative_queries:
-        negative_q |= (
-            Q(content__icontains=query) | 
-            Q(title__icontains=query)
-        )
+        search_query &= ~SearchQuery(query)
 
     # Find matching news pages that don't already have PR examples
     matching_pages = NewsPage.objects.filter(
-        positive_q  # Must match positive queries
-    ).exclude(
-        negative_q  # Must not match negative queries
-    ).exclude(
-        pr_examples__isnull=False  # Must not already have PR examples
-    ).exclude(
-        is_news_article=False # Has to be a news article, not category or something
-    )
+        search_vector=search_query,
+        is_news_article=True,  # Has to be a news article, not category or something
+        pr_examples__isnull=True,  # Must not already have PR examples
+    ).only('id', 'title', 'url', 'published_date')
 
     # Create PR examples for matching pages
-    for page in matching_pages:
-        DigitalPRExample.objects.create(
-            news_page=page,
-            title=page.title,
-            url=page.url,
-            published_date=page.published_date or timezone.now().date(),
-            confirmed=False
-        )
-        logger.info(f"Created digital PR example for: {page.title}")
+    created_count = 0
+    for batch in iter_keyset_batches(matching_pages, batch_size):
+        examples = [
+            DigitalPRExample(
+                news_page=page,
+                title=page.title[:255],
+                url=page.url,
+                published_date=page.published_date or timezone.now().date(),
+                confirmed=False
+            )
+            for page in batch
+        ]
+        DigitalPRExample.objects.bulk_create(examples)
+        created_count += len(examples)
+    logger.info(f"Created {created_count} digital PR examples")
     
     if search_google:
         search_google_for_digital_pr_examples(domain_limit=2)
     
 
-async def process_journalist_descriptions(limit: int = 10):
-    """Process descriptions for journalists that have profile URLs but no descriptions"""
-    # Create queues for processing
-    scrape_queue = asyncio.Queue()  # Queue of journalists to scrape
-    gpt_queue = asyncio.Queue()     # Queue of content to process with GPT
-    db_queue = asyncio.Queue()      # Queue of results to write to DB
-    
-    # Get journalists to process
-    journalists = await sync_to_async(list)(
-        Journalist.objects.filter(
-            profile_url__isnull=False,
-            description__isnull=True
-        )[:limit]
-    )
-    
-    # Add all journalists to the scrape queue
-    for journalist in journalists:
-        await scrape_queue.put(journalist)
-
-    async def scrape_worker():
-        """Async worker to scrape profile pages"""
-        while True:
-            try:
-                journalist = await scrape_queue.get()
-                
-                # Scrape the profile page
-                website = (
-                    Website(journalist.profile_url)
-                    .with_user_agent("Mozilla/5.0")
-                    .with_request_timeout(30000)
-                    .with_respect_robots_txt(False)
-                    .with_depth(0)
-                )
-                
-                website.scrape()
-                pages = website.get_pages()
-                
-                if pages:
-                    # Put content in GPT queue
-                    await gpt_queue.put((journalist, pages[0].content))
-                
-                scrape_queue.task_done()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error scraping {journalist.profile_url}: {str(e)}")
-                scrape_queue.task_done()
-
-    async def gpt_worker():
-        """Async worker to process GPT requests"""
-        while True:
-            try:
-                journalist, content = await gpt_queue.get()
-                
-                prompt = f"""
-                Extract a professional description of the journalist from their profile page.
-                Return a JSON object with a single 'description' field containing a 2-3 sentence summary.
-                
-                Profile content:
-                {clean_html(content)}
-                """
-
-                response = azure_openai_client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": "You are a professional bio writer."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=500,
-                    temperature=0.3,
-                    response_format={"type": "json_object"}
-                )
-
-                result = json.loads(response.choices[0].message.content)
-                
-                # Put results in DB queue
-                await db_queue.put((journalist, result.get('description')))
-                
-                gpt_queue.task_done()
-            except Exception as e:
-                logger.error(f"Error in GPT processing: {str(e)}")
-                gpt_queue.task_done()
-
-    async def db_worker():
-        """Sequential worker to handle DB writes"""
-        while True:
-            try:
-                journalist, description = await db_queue.get()
-                
-                @sync_to_async
-                def save_to_db():
-                    with transaction.atomic():
-                        journalist.description = description
-                        journalist.save()
-                
-                await save_to_db()
-                
-                db_queue.task_done()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in DB worker: {str(e)}")
-                db_queue.task_done()
-            finally:
-                close_old_connections()
-
-    # Create workers
-    scrape_workers = [asyncio.create_task(scrape_worker()) for _ in range(5)]
-    gpt_workers = [asyncio.create_task(gpt_worker()) for _ in range(3)]
-    db_worker_task = asyncio.create_task(db_worker())
-    
-    # Wait for all journalists to be processed
-    await scrape_queue.join()
-    await gpt_queue.join()
-    await db_queue.join()
-    
-    # Cancel workers
-    for worker in scrape_workers:
-        worker.cancel()
-    for worker in gpt_workers:
-        worker.cancel()
-    db_worker_task.cancel()
-    
-    # Wait for workers to finish
-    await asyncio.gather(*scrape_workers, *gpt_workers, db_worker_task, return_exceptions=True)
-
 def process_journalist_descriptions_sync(limit: int = 10):
     """Sync wrapper for processing journalist descriptions"""
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(process_journalist_descriptions(limit))
+    return asyncio.run(process_journalist_descriptions(limit))
 
 
 def guess_journalist_email_address(journalist: Journalist):
-    """Guess an email address for a journalist based on their first linked publication"""
+    """
+    Guess an email address for a journalist based on their first linked publication.
+    Uses the domain's learned email pattern when there is one and only falls
+    back to SMTP probing for domains we know nothing about.
+    """
     try:
         # Skip if email already exists
         if journalist.email_address:
@@ -922,35 +777,48 @@ def guess_journalist_email_address(journalist: Journalist):
             return
             
         # Extract domain from source URL and remove www if present
-        domain = first_source.url.split('//')[1].split('/')[0]
-        domain = domain.replace('www.', '')
+        domain = normalize_domain(first_source.url)
+
+        # A known pattern answers without touching the network
+        domain_pattern = get_domain_pattern(domain)
+        if domain_pattern:
+            email = build_email(journalist.name, domain_pattern.email_domain, domain_pattern.pattern)
+            if not email:
+                return None
+            if Journalist.objects.filter(email_address=email).exists():
+                logger.debug(f"Pattern email {email} already belongs to another journalist")
+                return None
+            with transaction.atomic():
+                journalist.email_address = email
+                journalist.email_status = 'guessed'
+                journalist.email_confidence = domain_pattern.confidence
+                journalist.save()
+            return email
         
-        # Skip if domain previously failed
-        if is_failed_domain(domain):
-            logger.debug(f"Skipping known failed domain: {domain}")
+        # Shared verdict first: MX, reachability and catch-all are checked once per TTL
+        domain_intel = get_or_check_domain(domain)
+        if domain_intel.is_failed:
+            logger.debug(f"Skipping known failed domain: {domain} ({domain_intel.last_error})")
             return
             
-        # Initialize mailscout with shorter timeout
+        # Initialize mailscout with shorter timeout.
+        # Catch-all status is already in the domain verdict.
         scout = Scout(
             check_variants=False,  # We'll handle variants ourselves
             check_prefixes=False,
-            check_catchall=True,
+            check_catchall=False,
             normalize=True,
             smtp_timeout=2
         )
         
         # Split journalist name into parts
         name_parts = journalist.name.split()
-        first_name = name_parts[0].lower()
         
-        # Try a single email first to validate domain
-        test_email = f"{first_name}@{domain}"
         try:
             valid_emails = scout.find_valid_emails(domain, name_parts)
             if not valid_emails:
-                # If no valid emails found, mark domain as failed
-                failed_domains.add(domain)
-                logger.warning(f"Adding {domain} to failed domains - no valid emails found")
+                # A miss for one name says nothing about the domain, other journalists there may still verify
+                logger.debug(f"No valid emails found for {journalist.name} at {domain}")
                 return None
                 
             # Save first valid email found
@@ -958,12 +826,14 @@ def guess_journalist_email_address(journalist: Journalist):
                 journalist.email_address = valid_emails[0]
                 journalist.email_status = 'guessed'
                 journalist.save()
+
+            # Later journalists at this domain can use the pattern instead of SMTP
+            record_smtp_pattern(journalist.name, valid_emails[0], domain)
                 
             return valid_emails[0]
             
         except Exception as e:
-            # Handle any other exceptions
-            failed_domains.add(domain)
+            # Not stored as a domain verdict; MX, SMTP and catch-all checks come from get_or_check_domain
             logger.error(f"Error guessing email for {journalist.name}: {str(e)}")
             return None
             
@@ -974,20 +844,16 @@ def guess_journalist_email_address(journalist: Journalist):
 
 def guess_journalist_email_addresses(limit: int = 10):
     """Guess email addresses for journalists that have no email addresses"""
-    journalists = Journalist.objects.filter(email_address__isnull=True)[:limit]
-    for journalist in tqdm(journalists, desc="Guessing emails"):
-        guess_journalist_email_address(journalist)
+    # Refresh patterns from the emails we already trust before guessing
+    learn_domain_patterns()
+    saved = guess_emails_concurrently(limit=limit)
+    logger.info(f"Saved {saved} guessed email addresses")
+    return saved
 
 
-def find_single_email_with_hunter_io(name: str, domain: str) -> Optional[str]:
-    """Find a single email with Hunter.io"""
+def _hunter_email_finder(name: str, domain: str) -> Optional[str]:
+    """Hunter.io email-finder call only, no database access so it is safe to run in a thread"""
     try:
-        # Initialize cached session (expires after 1 week)
-        session = requests_cache.CachedSession(
-            'hunter_cache',
-            expire_after=604800  # 7 days in seconds
-        )
-
         # Split name into first and last
         name_parts = name.strip().split()
         if len(name_parts) < 2:
@@ -997,51 +863,98 @@ def find_single_email_with_hunter_io(name: str, domain: str) -> Optional[str]:
         first_name = name_parts[0]
         last_name = ' '.join(name_parts[1:])  # Handle multi-word last names
 
-        # Clean domain (remove www. and any paths)
-        domain = domain.replace('www.', '').split('/')[0]
+        email = get_hunter_client().email_finder(domain, first_name, last_name)
+        logger.info(f"Hunter.io result for {name} at {domain}: {email}")
+        return email
 
-        # Make request to Hunter.io
-        response = session.get(
-            'https://api.hunter.io/v2/email-finder',
-            params={
-                'domain': domain,
-                'first_name': first_name,
-                'last_name': last_name,
-                'api_key': os.getenv('HUNTER_API_KEY')
-            }
-        )
+    except Exception as e:
+        logger.error(f"Error finding email for {name} at {domain}: {str(e)}")
+        return None
 
-        # Log raw response for debugging
-        logger.info(f"Raw Hunter.io response for {name} at {domain}: {response.text}")
 
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('data', {}).get('email'):
-                return data['data']['email']
-            else:
-                return None
-        else:
-            logger.error(f"Hunter.io API error: {response.status_code} - {response.text}")
+def _cannot_receive_mail(domain_intel) -> bool:
+    """True if a fresh verdict says the domain has no mail server, so a Hunter.io credit would be wasted"""
+    return bool(domain_intel and domain_intel.is_failed and not domain_intel.mx_hosts)
+
+
+def find_single_email_with_hunter_io(name: str, domain: str) -> Optional[str]:
+    """Find a single email with Hunter.io"""
+    try:
+        # Clean domain (remove www. and any paths)
+        domain = domain.replace('www.', '').split('/')[0]
+
+        # Don't spend a Hunter.io credit on a domain that can't receive mail
+        domain_intel = get_domain_intel(domain)
+        if _cannot_receive_mail(domain_intel):
+            logger.info(f"Skipping Hunter.io lookup for {domain}: {domain_intel.last_error}")
             return None
 
+        return _hunter_email_finder(name, domain)
+
     except Exception as e:
         logger.error(f"Error finding email for {name} at {domain}: {str(e)}")
         return None
 
 
-def find_emails_with_hunter_io(limit: int = 1):
-    """Find emails for journalists using Hunter.io until we find the requested number of emails"""
+def iter_hunter_lookups(journalists_by_domain, concurrency: int = 8):
+    """
+    Look up emails on Hunter.io for journalists grouped by domain, yielding
+    {journalist_id: email} as each domain search or single lookup completes.
+    Domains with several journalists get one domain search matched locally;
+    the rest go through email-finder concurrently.
+    """
+    single_lookups = []
+    for domain, members in journalists_by_domain.items():
+        if len(members) >= DOMAIN_SEARCH_MIN_JOURNALISTS:
+            domain_emails, hunter_pattern = get_hunter_client().domain_search(
+                domain, max_results=domain_search_max_results(len(members))
+            )
+            record_hunter_pattern(domain, hunter_pattern, len(domain_emails))
+            matches = match_domain_emails(members, domain_emails)
+            yield {journalist_id: matches.get(journalist_id) for journalist_id, _ in members}
+        else:
+            single_lookups.extend((journalist_id, name, domain) for journalist_id, name in members)
+
+    if not single_lookups:
+        return
+
+    # Domain verdicts are read here, the worker threads only talk to Hunter.io and never open a DB connection
+    dead_domains = {
+        domain for domain in {domain for _, _, domain in single_lookups}
+        if _cannot_receive_mail(get_domain_intel(domain))
+    }
+    if dead_domains:
+        logger.info(f"Skipping Hunter.io lookups for {len(dead_domains)} domains that can't receive mail")
+        yield {journalist_id: None for journalist_id, _, domain in single_lookups if domain in dead_domains}
+        single_lookups = [lookup for lookup in single_lookups if lookup[2] not in dead_domains]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(_hunter_email_finder, name, domain): journalist_id
+            for journalist_id, name, domain in single_lookups
+        }
+        for future in as_completed(futures):
+            yield {futures[future]: future.result()}
+
+
+def find_emails_with_hunter_io(limit: int = 1, concurrency: int = 8):
+    """
+    Find emails for journalists using Hunter.io until we find the requested number of emails.
+    Domains with several pending journalists are harvested with one domain search
+    and matched locally; the rest go through email-finder concurrently.
+    Batches are capped at the emails still wanted, so a small limit spends few credits.
+    """
     try:
         emails_found = 0
-        batch_size = 10  # Process journalists in batches to avoid loading too many at once
+        batch_size = 100  # Process journalists in batches to avoid loading too many at once
         
         while emails_found < limit:
-            # Get next batch of journalists without email addresses
-            journalists = Journalist.objects.filter(
+            # Get next batch of journalists without email addresses, no bigger than the emails still needed
+            journalists = dict(Journalist.objects.filter(
                 email_address__isnull=True,  # No email yet
                 email_search_with_hunter_tried=False,  # Haven't tried Hunter.io yet
                 sources__isnull=False  # Must have at least one source
-            ).prefetch_related('sources')[:batch_size]
+            ).distinct().order_by('id').values_list('id', 'name')[:min(batch_size, limit - emails_found)])
             
             # Break if no more journalists to process
             if not journalists:
@@ -1050,36 +963,27 @@ def find_emails_with_hunter_io(limit: int = 1):
                 
             logger.info(f"Processing batch of {len(journalists)} journalists. Found {emails_found}/{limit} emails so far")
 
-            for journalist in journalists:
-                # Get the first source's domain to try
-                first_source = journalist.sources.first()
-                if not first_source:
+            found = {}
+            for found_batch in iter_hunter_lookups(group_journalists_by_domain(journalists), concurrency=concurrency):
+                found.update(found_batch)
+
+            # Use update() to avoid triggering signals
+            taken = set(Journalist.objects.filter(email_address__in=[email for email in found.values() if email]).values_list('email_address', flat=True))
+            for journalist_id, email in found.items():
+                if not email or email in taken:
                     continue
+                taken.add(email)
+                logger.info(f"Found email {email} for {journalists[journalist_id]}")
+                Journalist.objects.filter(id=journalist_id).update(
+                    email_address=email,
+                    email_status='guessed_by_third_party'
+                )
+                emails_found += 1
+            Journalist.objects.filter(id__in=list(journalists)).update(email_search_with_hunter_tried=True)
 
-                # Extract domain from source URL
-                domain = first_source.url.split('//')[1].split('/')[0]
-                
-                # Try to find email
-                email = find_single_email_with_hunter_io(journalist.name, domain)
-                
-                if email:
-                    logger.info(f"Found email {email} for {journalist.name}")
-                    # Use update() to avoid triggering signals
-                    Journalist.objects.filter(id=journalist.id).update(
-                        email_address=email,
-                        email_status='guessed_by_third_party',
-                        email_search_with_hunter_tried=True
-                    )
-                    emails_found += 1
-                    if emails_found >= limit:
-                        logger.info(f"Found requested number of emails ({limit})")
-                        return
-                else:
-                    logger.info(f"No email found for {journalist.name} at {domain}")
-                    # Use update() to avoid triggering signals
-                    Journalist.objects.filter(id=journalist.id).update(
-                        email_search_with_hunter_tried=True
-                    )
+            if emails_found >= limit:
+                logger.info(f"Found requested number of emails ({limit})")
+                return
 
         logger.info(f"Finished processing. Found {emails_found} emails (requested: {limit})")
 
@@ -1118,6 +1022,12 @@ def crawl_single_page_task(self, url, source_id):
         # Skip if page already exists
         if NewsPage.objects.filter(url=url).exists():
             return
+
+        # Don't fetch URLs that look like section fronts, tag pages and the like
+        decision = get_url_classifier(source_id).decide(url)
+        if decision == SKIP:
+            logger.info(f"Skipping likely non-article URL {url}")
+            return
             
         # Create website instance for single page
         website = (
@@ -1135,19 +1045,26 @@ def crawl_single_page_task(self, url, source_id):
             logger.warning(f"No content found for {url}")
             return
             
+        archive_pages(pages, news_source, single=True)
         page = pages[0]
         cleaned_content = clean_html(page.content)
         
         with transaction.atomic():
-            news_page = NewsPage.objects.create(
+            news_page, is_duplicate = create_news_page(
                 url=url,
                 title=str(page.title()),
                 content=cleaned_content,
-                source=news_source
+                source=news_source,
+                # Queued pages are claimed to keep sweeps off them; deferred ones wait for the sweep
+                claimed_at=timezone.now() if decision != DEFER else None,
+                claimed_by=WORKER_ID if decision != DEFER else None
             )
             
-        # Trigger journalist processing for this page
-        process_journalist_task.delay(news_page.id)
+        record_source_yield(source_id, pages_fetched=1, pages_new=1)
+
+        # Queue journalist extraction, batched with other new pages; duplicates reuse their canonical's
+        if decision != DEFER and not is_duplicate:
+            get_page_batcher('process_journalists_batch_task').add([news_page.id])
         
     except Exception as e:
         logger.error(f"Error processing page {url}: {str(e)}")
@@ -1181,41 +1098,64 @@ def crawl_single_source_task(self, source_id, page_limit=None):
             .with_depth(3)
         )
         
-        if page_limit:
-            website = website.with_budget({"*": page_limit})
+        # Explicit limit, or the budget the planner gave this source
+        website = website.with_budget({"*": page_budget(news_source, page_limit)})
         
         # Get pages with content
         website.scrape()
         pages = website.get_pages()
         logger.info(f"Found {len(pages)} pages for {news_source.url}")
+        archive_pages(pages, news_source)
         
         # Process pages in bulk
+        url_classifier = get_url_classifier(news_source.id)
+        new_page_ids = []
+        deferred = skipped = duplicates = 0
         with transaction.atomic():
             for page in pages:
+                # Likely non-article pages are crawled for their links but not stored
+                decision = url_classifier.decide(page.url)
+                if decision == SKIP:
+                    skipped += 1
+                    continue
+
                 # Skip if page already exists
                 if NewsPage.objects.filter(url=page.url).exists():
                     continue
                     
                 cleaned_content = clean_html(page.content)
-                news_page = NewsPage.objects.create(
+                queued = decision != DEFER
+                news_page, is_duplicate = create_news_page(
                     url=page.url,
                     title=str(page.title()),
                     content=cleaned_content,
-                    source=news_source
+                    source=news_source,
+                    # Queued pages are claimed to keep sweeps off them; deferred ones
+                    # are stored unclaimed and wait for the periodic sweep
+                    claimed_at=timezone.now() if queued else None,
+                    claimed_by=WORKER_ID if queued else None
                 )
-                
-                # Queue journalist extraction for this page
-                process_journalist_task.delay(news_page.id)
+                if is_duplicate:
+                    duplicates += 1  # Journalists come from the canonical page, no extraction
+                elif queued:
+                    new_page_ids.append(news_page.id)
+                else:
+                    deferred += 1
             
             # Update source last crawled time
             news_source.last_crawled = timezone.now()
+            schedule_next_crawl(news_source)
             news_source.save()
+            record_source_yield(news_source.id, pages_fetched=len(pages), pages_new=len(new_page_ids) + deferred + duplicates)
+
+            # Queue journalist extraction in batches once the pages are committed
+            transaction.on_commit(lambda: get_page_batcher('process_journalists_batch_task').add(new_page_ids))
             
         # After crawling, get final count and send completion message
         pages_after = NewsPage.objects.filter(source=news_source).count()
         new_pages = pages_after - pages_before
         
-        end_message = f"✅ Finished crawl for {news_source.url}\n• Found {new_pages:,} new pages\n• Total pages: {pages_after:,}"
+        end_message = f"✅ Finished crawl for {news_source.url}\n• Found {new_pages:,} new pages ({deferred:,} deferred, {duplicates:,} near-duplicates, {skipped:,} non-article URLs skipped)\n• Total pages: {pages_after:,}"
         logger.info(end_message)
         #if slack_webhook_url:
         #    requests.post(slack_webhook_url, json={"text": end_message})
@@ -1235,14 +1175,8 @@ def crawl_single_source_task(self, source_id, page_limit=None):
 def crawl_news_sources_task(domain_limit=None, page_limit=None):
     """Distribute crawling tasks across workers"""
     try:
-        # Get sources to crawl
-        news_sources = NewsSource.objects.filter(
-            #Q(last_crawled__lt=timezone.now() - timezone.timedelta(days=7)) |
-            Q(last_crawled__isnull=True)
-        ).order_by(
-            '-priority',
-            'last_crawled'
-        )[:domain_limit]
+        # Sources due for a recrawl according to the crawl planner
+        news_sources = due_sources(domain_limit)
         
         pages_before = NewsPage.objects.count()
 
@@ -1285,7 +1219,7 @@ def continuous_crawl_task(self):
         
         # Chain the crawling tasks with error handling
         chain(
-            crawl_news_sources_task.si(domain_limit=1, page_limit=2000),
+            crawl_news_sources_task.si(domain_limit=1),  # Page budget comes from the crawl planner
             #process_journalists_task.si(limit=1000),
             #categorize_pages_task.si(limit=1000)
         ).apply_async(link_error=handle_chain_error.s())
@@ -1322,78 +1256,227 @@ def handle_chain_error(request, exc, traceback):
     logger.error(f"Task chain error: {exc}", exc_info=True)
     # Notify admins or take other error handling actions as needed
 
-@app.task(bind=True, name='process_journalist_task', track_started=True, ignore_result=False)
+def _extract_journalists_or_none(page):
+    try:
+        return extract_journalists_with_gpt(page.content)
+    except Exception as e:
+        # The page stays unprocessed and is picked up by the next sweep
+        logger.error(f"Error processing page {page.id}: {str(e)}")
+        return None
+
+
+def _record_batch_yield(processed_pages, tokens_by_page, page_slugs, new_slugs):
+    """Credit each new journalist to the source of the first page that surfaced it"""
+    yields = {}
+    credited = set()
+    for page in processed_pages:
+        counts = yields.setdefault(page.source_id, Counter())
+        counts['pages_processed'] += 1
+        counts['news_articles'] += int(bool(page.is_news_article))
+        counts['llm_tokens'] += tokens_by_page.get(page.id, 0)
+        fresh = (page_slugs.get(page.id, set()) & new_slugs) - credited
+        counts['new_journalists'] += len(fresh)
+        credited |= fresh
+    for source_id, counts in yields.items():
+        record_source_yield(source_id, **counts)
+
+
+def process_journalist_pages(page_ids, concurrency: int = None):
+    """
+    Extract journalists for a batch of pages. Pages are loaded with one query,
+    the LLM calls run concurrently, and journalists, page links and page flags
+    are written in bulk. Returns the number of pages processed.
+    """
+    concurrency = concurrency or settings.PAGE_BATCH_LLM_CONCURRENCY
+    # Another batch may have processed some of these since they were claimed
+    page_ids = reclaim_work('journalists', page_ids)
+    pages = list(NewsPage.objects.filter(id__in=page_ids, processed=False).exclude(content='').only('id', 'content', 'published_date', 'source_id'))
+    if not pages:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(pages))) as executor:
+        results = list(executor.map(_extract_journalists_or_none, pages))
+
+    processed_pages = []
+    journalists_by_slug = {}
+    page_slugs = {}
+    tokens_by_page = {}
+    for page, journalists_data in zip(pages, results):
+        if journalists_data is None:
+            continue
+        page.is_news_article = journalists_data.get('content_is_full_news_article', False)
+        published_date_str = journalists_data.get('article_published_date')
+        if published_date_str:
+            try:
+                page.published_date = datetime.strptime(published_date_str, '%Y-%m-%d').date()
+            except ValueError:
+                pass
+        page.processed = True
+        page.claimed_at = None
+        page.claimed_by = None
+        processed_pages.append(page)
+        tokens_by_page[page.id] = journalists_data.get('llm_tokens', 0)
+
+        page_slugs[page.id] = set()
+        for journalist_dict in journalists_data.get('journalists') or []:
+            if 'name' not in journalist_dict:
+                continue
+            name = journalist_dict['name']
+            journalist_slug = slugify(name)
+            if not journalist_slug:
+                continue
+            journalists_by_slug.setdefault(journalist_slug, Journalist(
+                name=name,
+                slug=journalist_slug,
+                profile_url=clean_url(journalist_dict.get('profile_url', '')),
+                image_url=clean_url(journalist_dict.get('image_url', ''))
+            ))
+            page_slugs[page.id].add(journalist_slug)
+
+    slugs = list(journalists_by_slug)
+    with transaction.atomic():
+        existing = set(Journalist.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+        # bulk_create skips save(); the periodic Typesense sync picks new journalists up
+        Journalist.objects.bulk_create(
+            [journalist for slug, journalist in journalists_by_slug.items() if slug not in existing],
+            ignore_conflicts=True
+        )
+        ids_by_slug = dict(Journalist.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+
+        page_journalists = NewsPage.journalists.through
+        page_journalists.objects.bulk_create([
+            page_journalists(newspage_id=page_id, journalist_id=ids_by_slug[slug])
+            for page_id, page_slug_set in page_slugs.items()
+            for slug in page_slug_set
+            if slug in ids_by_slug
+        ], ignore_conflicts=True)
+        NewsPage.objects.bulk_update(processed_pages, ['is_news_article', 'published_date', 'processed', 'claimed_at', 'claimed_by'])
+        sync_duplicates([page.id for page in processed_pages])
+
+    record_journalists_created(len(ids_by_slug) - len(existing))
+    _record_batch_yield(processed_pages, tokens_by_page, page_slugs, set(ids_by_slug) - existing)
+    logger.info(f"Processed {len(processed_pages)}/{len(pages)} pages, {len(ids_by_slug) - len(existing)} new journalists")
+    return len(processed_pages)
+
+
+def _suggest_categories_or_none(page, available_categories_str):
+    try:
+        return json.loads(suggest_page_categories(page, available_categories_str))['categories']
+    except Exception as e:
+        logger.error(f"Error categorizing page {page.id}: {str(e)}")
+        return None
+
+
+def categorize_pages(page_ids, concurrency: int = None):
+    """
+    Categorize a batch of pages. Pages and categories are loaded once, the LLM
+    calls run concurrently, links are written in bulk, and each affected source
+    and journalist re-syncs its categories once per batch rather than per page.
+    Returns the number of pages categorized.
+    """
+    concurrency = concurrency or settings.PAGE_BATCH_LLM_CONCURRENCY
+    # Another batch may have categorized some of these since they were claimed
+    page_ids = reclaim_work('categories', page_ids)
+    pages = list(NewsPage.objects.filter(id__in=page_ids, categorized=False).only('id', 'title', 'content', 'source_id'))
+    if not pages:
+        return 0
+
+    available_categories_str = ', '.join(NewsPageCategory.objects.values_list('name', flat=True))
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(pages))) as executor:
+        results = list(executor.map(lambda page: _suggest_categories_or_none(page, available_categories_str), pages))
+
+    names_by_page = {
+        page.id: {name for name in category_names if isinstance(name, str) and slugify(name)}
+        for page, category_names in zip(pages, results)
+        if category_names
+    }
+    slugs = {slugify(name) for names in names_by_page.values() for name in names}
+
+    with transaction.atomic():
+        existing = set(NewsPageCategory.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+        NewsPageCategory.objects.bulk_create([
+            NewsPageCategory(name=name, slug=slugify(name))
+            for name in {name for names in names_by_page.values() for name in names}
+            if slugify(name) not in existing
+        ], ignore_conflicts=True)
+        ids_by_slug = dict(NewsPageCategory.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+
+        page_categories = NewsPage.categories.through
+        page_categories.objects.bulk_create([
+            page_categories(newspage_id=page_id, newspagecategory_id=ids_by_slug[slugify(name)])
+            for page_id, names in names_by_page.items()
+            for name in names
+            if slugify(name) in ids_by_slug
+        ], ignore_conflicts=True)
+
+        categorized_ids = list(names_by_page)
+        NewsPage.objects.filter(id__in=categorized_ids).update(categorized=True, claimed_at=None, claimed_by=None)
+        categorized_ids += sync_duplicates(categorized_ids)
+        for source in NewsSource.objects.filter(pages__id__in=categorized_ids).distinct():
+            source.sync_categories()
+        for journalist in Journalist.objects.filter(articles__id__in=categorized_ids).distinct():
+            journalist.sync_categories()
+
+    logger.info(f"Categorized {len(names_by_page)}/{len(pages)} pages")
+    return len(names_by_page)
+
+
+@app.task(bind=True, name='process_journalist_task')
 def process_journalist_task(self, page_id):
     """Process journalists for a single page"""
     try:
-        page = NewsPage.objects.get(id=page_id)
-        journalists_data = extract_journalists_with_gpt(page.content)
-        
-        with transaction.atomic():
-            page.is_news_article = journalists_data.get('content_is_full_news_article', False)
-            
-            published_date_str = journalists_data.get('article_published_date')
-            if published_date_str:
-                try:
-                    published_date = datetime.strptime(published_date_str, '%Y-%m-%d').date()
-                    page.published_date = published_date
-                except ValueError:
-                    pass
-            
-            if journalists_data and 'journalists' in journalists_data:
-                for journalist_dict in journalists_data['journalists']:
-                    if 'name' in journalist_dict:
-                        name = journalist_dict['name']
-                        profile_url = clean_url(journalist_dict.get('profile_url', ''))
-                        image_url = clean_url(journalist_dict.get('image_url', ''))
-                        journalist_slug = slugify(name)
-                        
-                        journalist, _ = Journalist.objects.get_or_create(
-                            name=name,
-                            slug=journalist_slug,
-                            defaults={
-                                'profile_url': profile_url,
-                                'image_url': image_url
-                            }
-                        )
-                        page.journalists.add(journalist)
-            
-            page.processed = True
-            page.save()
-            
+        process_journalist_pages([page_id], concurrency=1)
     except Exception as e:
         logger.error(f"Error processing page {page_id}: {str(e)}")
         raise
 
-@app.task(name='process_journalists_task', track_started=True, ignore_result=False)
+@app.task(name='process_journalists_batch_task')
+def process_journalists_batch_task(page_ids):
+    """Process journalists for a batch of pages collected by the page batcher"""
+    try:
+        return process_journalist_pages(page_ids)
+    except Exception as e:
+        logger.error(f"Error processing page batch {page_ids[:5]}...: {str(e)}")
+        raise
+
+@app.task(name='process_journalists_task')
 def process_journalists_task(limit=2):
-    """Distribute journalist processing tasks"""
-    pages = NewsPage.objects.exclude(content='').filter(processed=False)[:limit]
-    
-    for page in pages:
-        process_journalist_task.delay(page.id)
+    """Distribute journalist processing in batches"""
+    page_ids = claim_work('journalists', limit)
+    get_page_batcher('process_journalists_batch_task').add(page_ids)
 
-@app.task(bind=True, name='categorize_page_task', track_started=True, ignore_result=False)
+@app.task(bind=True, name='categorize_page_task')
 def categorize_page_task(self, page_id):
     """Categorize a single news page"""
     try:
-        page = NewsPage.objects.get(id=page_id)
-        categorize_news_page_with_gpt(page)
+        categorize_pages([page_id], concurrency=1)
     except Exception as e:
         logger.error(f"Error categorizing page {page_id}: {str(e)}")
         raise
 
-@app.task(name='categorize_pages_task', track_started=True, ignore_result=False)
+@app.task(name='categorize_pages_batch_task')
+def categorize_pages_batch_task(page_ids):
+    """Categorize a batch of pages collected by the page batcher"""
+    try:
+        return categorize_pages(page_ids)
+    except Exception as e:
+        logger.error(f"Error categorizing page batch {page_ids[:5]}...: {str(e)}")
+        raise
+
+@app.task(name='categorize_pages_task')
 def categorize_pages_task(limit=1000):
-    """Distribute categorization tasks"""
-    pages = NewsPage.objects.filter(
-        categories__isnull=True, 
-        journalists__isnull=False,
-        is_news_article=True
-    ).distinct()[:limit]
-    
-    for page in pages:
-        categorize_page_task.delay(page.id)
+    """Distribute categorization in batches"""
+    page_ids = claim_work('categories', limit)
+    get_page_batcher('categorize_pages_batch_task').add(page_ids)
+
+@app.task(name='core.tasks.flush_page_batch')
+def flush_page_batch_task(task_name):
+    """Dispatch a partial page batch once its time window has passed"""
+    try:
+        return get_page_batcher(task_name).flush()
+    except Exception as e:
+        logger.error(f"Error flushing page batch for {task_name}: {str(e)}")
+        raise
 
 
 
@@ -1552,15 +1635,249 @@ def sync_typesense_index():
     retry_kwargs={'max_retries': 3},
     name='core.tasks.sync_blog_posts'
 )
-def sync_blog_posts(self):
-    """Celery task to sync blog posts from SEObot"""
-    from django.core.management import call_command
-    
+def sync_blog_posts(self, full=False):
+    """Celery task to sync blog posts from SEObot, then queue images for posts without one"""
     try:
         logger.info("Starting blog post sync")
-        call_command('sync_seobot_posts')
+        stats = sync_seobot_posts(full=full)
+        for post_id in stats['missing_images']:
+            generate_blog_post_image_task.delay(post_id)
         logger.info("Blog post sync completed successfully")
         return True
     except Exception as e:
         logger.error(f"Error syncing blog posts: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+@app.task(name='core.tasks.generate_blog_post_image')
+def generate_blog_post_image_task(post_id):
+    """Generate a featured image for one blog post, off the sync's critical path"""
+    try:
+        post = BlogPost.objects.filter(id=post_id).first()
+        if post is None or post.featured_image:
+            return False
+        image_file = generate_featured_image(shorten_title(post.title))
+        if image_file is None:
+            logger.warning(f"No image generated for blog post {post.slug}")
+            return False
+        post.featured_image = image_file
+        post.save(update_fields=['featured_image', 'updated_at'])
+        invalidate_public_pages()
+        logger.info(f"Generated featured image for blog post {post.slug}")
+        return True
+    except Exception as e:
+        logger.error(f"Error generating image for blog post {post_id}: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.refresh_example_journalist_pool')
+def refresh_example_journalist_pool_task():
+    """Periodic task to rebuild the cached pool of homepage example journalists"""
+    try:
+        pool = refresh_example_journalist_pool()
+        return len(pool)
+    except Exception as e:
+        logger.error(f"Error refreshing example journalist pool: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.rollup_db_stats')
+def rollup_db_stats_task():
+    """Nightly task to roll up DbStat rows for any days since the last run"""
+    try:
+        days_written = rollup_db_stats_incremental()
+        invalidate_public_pages()
+        logger.info(f"Rolled up stats for {days_written} days")
+        return days_written
+    except Exception as e:
+        logger.error(f"Error rolling up DB stats: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.plan_crawl_budgets')
+def plan_crawl_budgets_task():
+    """Nightly task to reallocate page budgets and recrawl dates from per-source yield"""
+    try:
+        return plan_crawl_budgets()
+    except Exception as e:
+        logger.error(f"Error planning crawl budgets: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.train_url_classifier')
+def train_url_classifier_task():
+    """Nightly task to relearn which URL patterns are articles from the LLM's labels"""
+    try:
+        return train_url_classifier()
+    except Exception as e:
+        logger.error(f"Error training URL classifier: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.prune_crawl_archive')
+def prune_crawl_archive_task():
+    """Nightly task to drop WARC captures older than the archive retention"""
+    try:
+        return prune_crawl_archive()
+    except Exception as e:
+        logger.error(f"Error pruning crawl archive: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.refresh_journalist_search_vectors')
+def refresh_journalist_search_vectors():
+    """Periodic task to keep journalist search vectors fresh for the Postgres search fallback"""
+    try:
+        # Overlap the hourly schedule so a late run doesn't miss anyone
+        return backfill_journalist_search_vectors(since=timezone.now() - timezone.timedelta(hours=2))
+    except Exception as e:
+        logger.error(f"Error refreshing journalist search vectors: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.update_journalist_embeddings')
+def update_journalist_embeddings_task(limit=None):
+    """Periodic task to embed new or stale journalists and resize the ivfflat index as needed"""
+    try:
+        written = update_journalist_embeddings(limit=limit)
+        rebuild_embedding_index()
+        logger.info(f"Updated {written} journalist embeddings")
+        return written
+    except Exception as e:
+        logger.error(f"Error updating journalist embeddings: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.refresh_similar_journalists')
+def refresh_similar_journalists_task(full=False):
+    """Periodic task to recompute precomputed similar-journalist neighbours"""
+    try:
+        refreshed = refresh_similar_journalists(full=full)
+        logger.info(f"Refreshed similar journalists for {refreshed} journalists")
+        return refreshed
+    except Exception as e:
+        logger.error(f"Error refreshing similar journalists: {str(e)}")
+        raise
+
+
+@app.task(name='core.tasks.lookup_journalist_email')
+def lookup_journalist_email_task(job_id):
+    """Run a queued find-email lookup. The credit taken when it was queued is refunded unless an email is found."""
+    claimed = EmailLookupJob.objects.filter(id=job_id, status='pending').update(status='running')
+    if not claimed:
+        logger.info(f"Email lookup job {job_id} already claimed")
+        return
+
+    job = EmailLookupJob.objects.select_related('journalist').get(id=job_id)
+    journalist = job.journalist
+    try:
+        email = find_single_email_with_hunter_io(journalist.name, job.source_domain)
+        if email and Journalist.objects.filter(email_address=email).exclude(id=journalist.id).exists():
+            logger.warning(f"Hunter.io email {email} for {journalist.name} already belongs to another journalist")
+            email = None
+
+        with transaction.atomic():
+            if not EmailLookupJob.finish(job_id, job.user_id, 'found' if email else 'not_found', email):
+                # Expired while we were looking, its credit was already refunded
+                logger.warning(f"Email lookup job {job_id} expired before it finished")
+                return
+            if email:
+                logger.info(f"Found email {email} for {journalist.name}")
+                # Use direct update to avoid triggering signals
+                Journalist.objects.filter(id=journalist.id).update(
+                    email_address=email,
+                    email_status='guessed_by_third_party',
+                    email_search_with_hunter_tried=True
+                )
+                EmailDiscovery.objects.create(
+                    user_id=job.user_id,
+                    journalist=journalist,
+                    email=email,
+                    source_domain=job.source_domain
+                )
+                CustomUser.objects.filter(id=job.user_id).update(has_retrieved_email=True)
+            else:
+                logger.info(f"No email found for {journalist.name} at {job.source_domain}")
+                Journalist.objects.filter(id=journalist.id).update(email_search_with_hunter_tried=True)
+    except Exception as e:
+        logger.error(f"Error in email lookup job {job_id} for {journalist.name}: {str(e)}")
+        EmailLookupJob.finish(job_id, job.user_id, 'failed')
+        raise
+
+
+def _save_list_enrichment_results(job, found_batch, names, domains):
+    """Store one batch of bulk lookup results and bump the job's counters. Returns the number of emails saved."""
+    emails = [email for email in found_batch.values() if email]
+    taken = set(Journalist.objects.filter(email_address__in=emails).values_list('email_address', flat=True))
+
+    discoveries = []
+    with transaction.atomic():
+        for journalist_id, email in found_batch.items():
+            if not email or email in taken:
+                continue
+            taken.add(email)
+            # Use direct update to avoid triggering signals
+            Journalist.objects.filter(id=journalist_id).update(
+                email_address=email,
+                email_status='guessed_by_third_party'
+            )
+            discoveries.append(EmailDiscovery(
+                user_id=job.user_id,
+                journalist_id=journalist_id,
+                email=email,
+                source_domain=domains[journalist_id]
+            ))
+        EmailDiscovery.objects.bulk_create(discoveries)
+        Journalist.objects.filter(id__in=list(found_batch)).update(email_search_with_hunter_tried=True)
+        ListEnrichmentJob.objects.filter(id=job.id).update(
+            processed=F('processed') + len(found_batch),
+            found=F('found') + len(discoveries)
+        )
+    for discovery in discoveries:
+        logger.info(f"Found email {discovery.email} for {names[discovery.journalist_id]}")
+    return len(discoveries)
+
+
+@app.task(name='core.tasks.enrich_saved_list')
+def enrich_saved_list_task(job_id, concurrency: int = 8):
+    """
+    Find emails for every reserved member of a saved list. Members are grouped by
+    their source domain and looked up concurrently through the shared Hunter.io
+    client, which keeps all workers within the API rate limit. Progress is written
+    to the job after each domain or lookup so the list page can poll it.
+    """
+    claimed = ListEnrichmentJob.objects.filter(id=job_id, status='pending').update(status='running')
+    if not claimed:
+        logger.info(f"List enrichment job {job_id} already claimed")
+        return
+
+    job = ListEnrichmentJob.objects.get(id=job_id)
+    try:
+        names = dict(Journalist.objects.filter(
+            id__in=job.journalist_ids,
+            email_address__isnull=True
+        ).values_list('id', 'name'))
+        journalists_by_domain = group_journalists_by_domain(names)
+        domains = {
+            journalist_id: domain
+            for domain, members in journalists_by_domain.items()
+            for journalist_id, _ in members
+        }
+
+        # Members that gained an email meanwhile, or have no source domain, need no lookup
+        skipped = len(job.journalist_ids) - len(domains)
+        if skipped:
+            ListEnrichmentJob.objects.filter(id=job_id).update(processed=F('processed') + skipped)
+
+        found = 0
+        for found_batch in iter_hunter_lookups(journalists_by_domain, concurrency=concurrency):
+            found += _save_list_enrichment_results(job, found_batch, names, domains)
+
+        ListEnrichmentJob.objects.filter(id=job_id, status='running').update(status='done', finished_at=timezone.now())
+        logger.info(f"List enrichment job {job_id} found {found} emails for {len(domains)} journalists")
+    except Exception as e:
+        logger.error(f"Error in list enrichment job {job_id}: {str(e)}")
+        ListEnrichmentJob.objects.filter(id=job_id, status='running').update(status='failed', finished_at=timezone.now())
+        raise
+    finally:
+        ListEnrichmentJob.settle_credits(job_id)
@@ -1,5 +1,6 @@
 from django import template
 from datetime import timedelta
+from core.utils.social_images import social_share_image_url as _social_share_image_url
 
 register = template.Library()
 
@@ -20,4 +21,10 @@ def time_diff_display(diff):
     if total_seconds < 1:
         return f"{int(total_seconds * 1000)} ms"
     else:
-        return f"{total_seconds:.2f} s"
\ No newline at end of file
+        return f"{total_seconds:.2f} s"
+
+
+@register.simple_tag
+def social_share_image_url():
+    """Current site-wide OG image, re-rendered whenever the journalist counts change"""
+    return _social_share_image_url()
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core.embeddings import FakeEmbedder, build_embedding_texts, text_hash, update_journalist_embeddings
+from core.models import Journalist, NewsPage, NewsSource
+from core.utils.near_duplicates import create_news_page, estimated_similarity, minhash
+
+OFFLINE_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(EMBEDDING_BACKEND='fake', CACHES=OFFLINE_CACHE)
+class UpdateJournalistEmbeddingsTests(TestCase):
+    """update_journalist_embeddings against FakeEmbedder, no network involved"""
+
+    def setUp(self):
+        cache.clear()
+        # bulk_create skips save(), so no Typesense sync is attempted
+        Journalist.objects.bulk_create([
+            Journalist(name='Jane Doe', slug='jane-doe', description='Covers energy policy'),
+            Journalist(name='John Roe', slug='john-roe', description='Covers football'),
+        ])
+        self.jane = Journalist.objects.get(slug='jane-doe')
+        self.john = Journalist.objects.get(slug='john-roe')
+
+    def embed_all(self):
+        embedder = FakeEmbedder()
+        return update_journalist_embeddings(embedder=embedder), embedder
+
+    def expire_embeddings(self):
+        """Push every embedding past EMBEDDING_MAX_AGE_DAYS so all journalists are stale again"""
+        Journalist.objects.update(embedding_updated_at=timezone.now() - timedelta(days=365))
+
+    def test_embeds_journalists_without_embeddings(self):
+        written, embedder = self.embed_all()
+
+        self.assertEqual(written, 2)
+        self.assertEqual(embedder.calls, 1)
+        jane = Journalist.objects.get(id=self.jane.id)
+        texts = build_embedding_texts([jane])
+        self.assertEqual(jane.embedding_text_hash, text_hash(texts[jane.id]))
+        # Stored as float32, so compare approximately
+        for stored, expected in zip(jane.embedding, FakeEmbedder()._vector(texts[jane.id])):
+            self.assertAlmostEqual(float(stored), expected, places=5)
+        self.assertIsNotNone(jane.embedding_updated_at)
+
+    def test_skips_journalists_with_unchanged_text(self):
+        self.embed_all()
+        self.expire_embeddings()
+        cache.clear()  # Unchanged rows must be skipped by their hash, not by the vector cache
+
+        written, embedder = self.embed_all()
+
+        self.assertEqual(written, 0)
+        self.assertEqual(embedder.calls, 0)
+        # Their timestamps are bumped so they stop showing up as stale
+        self.assertFalse(
+            Journalist.objects.filter(embedding_updated_at__lt=timezone.now() - timedelta(days=1)).exists()
+        )
+
+    def test_reembeds_journalists_whose_text_changed(self):
+        self.embed_all()
+        before = Journalist.objects.get(id=self.jane.id)
+        self.expire_embeddings()
+        Journalist.objects.filter(id=self.jane.id).update(description='Covers climate and energy policy')
+
+        written, embedder = self.embed_all()
+
+        self.assertEqual(written, 1)
+        self.assertEqual(embedder.calls, 1)
+        jane = Journalist.objects.get(id=self.jane.id)
+        self.assertNotEqual(jane.embedding_text_hash, before.embedding_text_hash)
+        self.assertNotEqual(list(jane.embedding), list(before.embedding))
+
+    def test_reembeds_journalists_with_new_articles(self):
+        self.embed_all()
+        before = Journalist.objects.get(id=self.john.id)
+        source = NewsSource.objects.create(url='https://example.com', name='Example News', slug='example-news')
+        page = NewsPage.objects.create(
+            url='https://example.com/cup-final', title='Cup final report', content='', source=source,
+            processed=True, is_news_article=True,
+        )
+        page.journalists.add(self.john)
+
+        # Only John has an article crawled since his embedding, Jane is still fresh
+        written, embedder = self.embed_all()
+
+        self.assertEqual(written, 1)
+        john = Journalist.objects.get(id=self.john.id)
+        self.assertNotEqual(john.embedding_text_hash, before.embedding_text_hash)
+        self.assertIn('Cup final report', build_embedding_texts([john])[john.id])
+
+
+# Shared navigation and footer, long enough to dominate the shingles of a short article
+TEMPLATE = ' '.join(
+    f'Home News Sport Business Culture Opinion Weather Newsletters Podcasts Subscribe section {i} of the daily gazette'
+    for i in range(12)
+)
+WIRE_STORY = ' '.join(
+    f'The central bank held interest rates at {i} percent on Thursday as officials weighed slowing inflation '
+    f'against weaker hiring, the governor told reporters in the capital after the meeting'
+    for i in range(10)
+)
+
+
+class NearDuplicateTests(TestCase):
+    """create_news_page against same-source and cross-source page pairs"""
+
+    def setUp(self):
+        self.gazette = NewsSource.objects.create(url='https://gazette.example', name='Gazette', slug='gazette')
+        self.herald = NewsSource.objects.create(url='https://herald.example', name='Herald', slug='herald')
+
+    def test_same_source_articles_sharing_a_template_are_kept_apart(self):
+        first_body = 'Council approves new cycle lanes on the high street after a long consultation.'
+        second_body = 'Local bakery wins regional award for its sourdough loaf and rye bread.'
+        first_content = f'{TEMPLATE} {first_body} {TEMPLATE}'
+        second_content = f'{TEMPLATE} {second_body} {TEMPLATE}'
+        # The template alone is enough to pass the threshold
+        self.assertGreaterEqual(
+            estimated_similarity(minhash(first_content), minhash(second_content)),
+            settings.NEAR_DUPLICATE_SIMILARITY,
+        )
+
+        create_news_page('https://gazette.example/cycle-lanes', 'Cycle lanes', first_content, self.gazette)
+        page, is_duplicate = create_news_page('https://gazette.example/bakery', 'Bakery', second_content, self.gazette)
+
+        self.assertFalse(is_duplicate)
+        self.assertIsNone(page.canonical_id)
+        self.assertEqual(page.content, second_content)
+
+    def test_syndicated_copy_from_another_source_is_linked_to_the_original(self):
+        original, _ = create_news_page('https://gazette.example/rates', 'Rates held', WIRE_STORY, self.gazette)
+        copy, is_duplicate = create_news_page(
+            'https://herald.example/rates', 'Rates held', f'Herald staff. {WIRE_STORY}', self.herald
+        )
+
+        self.assertTrue(is_duplicate)
+        self.assertEqual(copy.canonical_id, original.id)
+        self.assertEqual(copy.content, '')
@@ -20,7 +20,7 @@ JOURNALIST_SCHEMA = {
     'default_sorting_field': 'created_at'
 }
 
-def get_typesense_client():
+def get_typesense_client(connection_timeout_seconds=2, num_retries=3):
     """Get a configured Typesense client"""
     return typesense.Client({
         'api_key': settings.TYPESENSE_API_KEY,
@@ -29,8 +29,8 @@ def get_typesense_client():
             'port': settings.TYPESENSE_PORT,
             'protocol': settings.TYPESENSE_PROTOCOL
         }],
-        'connection_timeout_seconds': 2,
-        'num_retries': 3,
+        'connection_timeout_seconds': connection_timeout_seconds,
+        'num_retries': num_retries,
         'retry_interval_seconds': 1
     })
 
@@ -17,12 +17,17 @@ urlpatterns = [
     path('app/saved_lists/', views.saved_lists, name='saved_lists'),
     path('app/save-to-list/', views.save_to_list, name='save_to_list'),
     path('app/list/<int:id>/', views.single_saved_list, name='single_saved_list'),
+    path('app/list/<int:id>/enrich/', views.enrich_saved_list, name='enrich_saved_list'),
+    path('list-enrichments/<int:job_id>/', views.list_enrichment_status, name='list_enrichment_status'),
+    path('api/lists/<int:id>/similar/', views.saved_list_similar_journalists, name='saved_list_similar_journalists'),
     path('subscription-confirm/', views.subscription_confirm, name='subscription_confirm'),
     path('health/', views.health, name='health'),
     path('subscription-confirm-check/', views.subscription_confirm_check, name='subscription_confirm_check'),
     path('search-v2/', views.search_v2, name='search_v2'),
     path('app/journalist/<int:id>/', views.journalist_detail, name='journalist_detail'),
+    path('api/journalists/<int:id>/similar/', views.similar_journalists, name='similar_journalists'),
     path('journalist/<int:journalist_id>/find-email/', views.find_journalist_email, name='find_journalist_email'),
+    path('email-lookups/<int:job_id>/', views.email_lookup_status, name='email_lookup_status'),
     path('app/email-discoveries/', views.email_discoveries, name='email_discoveries'),
     path('api/lists/', views.get_user_lists, name='get_user_lists'),
     path('save-to-list/', views.save_to_list, name='save_to_list'),
@@ -0,0 +1,31 @@
+def iter_keyset_batches(queryset, batch_size: int = 1000, fields=None):
+    """
+    Iterate a queryset in primary-key order, one batch at a time.
+    Uses keyset pagination (pk > last seen) instead of OFFSET, so every batch
+    is an index range scan and memory stays flat regardless of table size.
+
+    If fields is given (possibly empty), rows are yielded as value tuples with
+    the pk first; otherwise model instances are yielded, so combine it with
+    .only() to keep wide columns out of memory.
+    """
+    last_pk = None
+    while True:
+        batch_qs = queryset.order_by('pk')
+        if last_pk is not None:
+            batch_qs = batch_qs.filter(pk__gt=last_pk)
+
+        if fields is not None:
+            batch = list(batch_qs.values_list('pk', *fields)[:batch_size])
+            if not batch:
+                return
+            last_pk = batch[-1][0]
+        else:
+            batch = list(batch_qs[:batch_size])
+            if not batch:
+                return
+            last_pk = batch[-1].pk
+
+        yield batch
+
+        if len(batch) < batch_size:
+            return
@@ -0,0 +1,323 @@
+import gzip
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from http import HTTPStatus
+from pathlib import Path
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Stored bodies are already decoded, so these no longer describe them
+SKIPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+CHARSET = re.compile(r'charset=([\w-]+)', re.IGNORECASE)
+DAY_PATH = re.compile(r'^\d{4}/\d{2}/\d{2}$')
+
+# Shared daily files are appended to by one writer at a time within a process
+_shared_file_lock = threading.Lock()
+
+
+def _warc_record(warc_type, headers, block: bytes) -> bytes:
+    lines = [
+        'WARC/1.1',
+        f'WARC-Type: {warc_type}',
+        f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>',
+        *(f'{name}: {value}' for name, value in headers.items()),
+        f'Content-Length: {len(block)}',
+    ]
+    return '\r\n'.join(lines).encode() + b'\r\n\r\n' + block + b'\r\n\r\n'
+
+
+def _parse_headers(lines):
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(':')
+        if value:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+class WarcWriter:
+    """
+    Writes crawl responses to one gzipped WARC file, one gzip member per record
+    so any record can be read back on its own from its offset and length.
+    A shared writer appends to one file per worker and day instead, so small
+    captures such as single pages don't each leave a file behind.
+    """
+
+    def __init__(self, name, shared=False):
+        from core.utils.work_queue import WORKER_ID  # Import here to avoid circular imports
+
+        # Files are per worker (and per writer unless shared), so concurrent crawls never share one
+        now = timezone.now()
+        worker = WORKER_ID.replace(':', '-')
+        if shared:
+            self.relative_path = f"{now:%Y/%m/%d}/{name}-{worker}.warc.gz"
+        else:
+            self.relative_path = f"{now:%Y/%m/%d}/{name}-{now:%H%M%S}-{worker}-{uuid.uuid4().hex[:8]}.warc.gz"
+        self.path = Path(settings.CRAWL_ARCHIVE_DIR) / self.relative_path
+        self.shared = shared
+        self.file = None
+
+    def __enter__(self):
+        if self.shared:
+            _shared_file_lock.acquire()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.path, 'ab')
+            if self.file.tell() == 0:
+                self._write(_warc_record('warcinfo', {
+                    'WARC-Date': self._warc_date(timezone.now()),
+                    'Content-Type': 'application/warc-fields',
+                }, b'software: nachopr\r\nformat: WARC File Format 1.1\r\n'))
+        except Exception:
+            self._close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        self._close()
+
+    def _close(self):
+        if self.file:
+            self.file.close()
+        if self.shared:
+            _shared_file_lock.release()
+
+    @staticmethod
+    def _warc_date(moment):
+        return moment.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _write(self, record: bytes):
+        offset = self.file.tell()
+        compressed = gzip.compress(record)
+        self.file.write(compressed)
+        return offset, len(compressed)
+
+    def write_response(self, url, body: bytes, status=200, headers=None, fetched_at=None):
+        """Append one response record. Returns (offset, length) of the record in the file."""
+        fetched_at = fetched_at or timezone.now()
+        status = status or 200
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ''
+        header_lines = [f'HTTP/1.1 {status} {reason}']
+        headers = {name.lower(): value for name, value in (headers or {}).items() if name.lower() not in SKIPPED_HEADERS}
+        headers.setdefault('content-type', 'text/html; charset=utf-8')
+        header_lines += [f'{name}: {value}' for name, value in headers.items()]
+        header_lines.append(f'content-length: {len(body)}')
+        block = '\r\n'.join(header_lines).encode() + b'\r\n\r\n' + body
+        return self._write(_warc_record('response', {
+            'WARC-Target-URI': url,
+            'WARC-Date': self._warc_date(fetched_at),
+            'Content-Type': 'application/http; msgtype=response',
+        }, block))
+
+
+@dataclass
+class ArchivedResponse:
+    url: str
+    fetched_at: datetime
+    status: int
+    headers: dict
+    html: str
+
+
+def read_response(warc_file, offset, length) -> ArchivedResponse:
+    """Read one response record back from the archive, no network involved"""
+    with open(Path(settings.CRAWL_ARCHIVE_DIR) / warc_file, 'rb') as f:
+        f.seek(offset)
+        record = gzip.decompress(f.read(length))
+
+    head, _, block = record.partition(b'\r\n\r\n')
+    warc_headers = _parse_headers(head.decode().split('\r\n')[1:])
+    block = block[:int(warc_headers['content-length'])]
+    http_head, _, body = block.partition(b'\r\n\r\n')
+    status_line, *header_lines = http_head.decode('latin-1').split('\r\n')
+    headers = _parse_headers(header_lines)
+    charset = CHARSET.search(headers.get('content-type', ''))
+    try:
+        html = body.decode(charset.group(1) if charset else 'utf-8', errors='replace')
+    except LookupError:
+        html = body.decode('utf-8', errors='replace')
+    return ArchivedResponse(
+        url=warc_headers['warc-target-uri'],
+        fetched_at=datetime.strptime(warc_headers['warc-date'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=dt_timezone.utc),
+        status=int(status_line.split()[1]),
+        headers=headers,
+        html=html,
+    )
+
+
+def archive_pages(pages, source=None, single=False):
+    """
+    Capture spider_rs pages into a new WARC file and index them by URL and
+    fetch time. Single-page captures are appended to the worker's file for
+    the day instead. Archiving never fails a crawl. Returns the number archived.
+    """
+    from core.models import ArchivedPage  # Import here to avoid circular imports
+
+    if not settings.CRAWL_ARCHIVE_ENABLED or not pages:
+        return 0
+    fetched_at = timezone.now()
+    try:
+        entries = []
+        writer = WarcWriter('pages', shared=True) if single else WarcWriter(source.slug if source else 'crawl')
+        with writer:
+            for page in pages:
+                raw = getattr(page, 'raw_content', None)
+                body = bytes(raw) if raw else (page.content or '').encode()
+                status = getattr(page, 'status_code', None) or 200
+                offset, length = writer.write_response(
+                    page.url, body, status, getattr(page, 'headers', None), fetched_at
+                )
+                entries.append(ArchivedPage(
+                    url=page.url,
+                    source=source,
+                    fetched_at=fetched_at,
+                    status=status,
+                    warc_file=writer.relative_path,
+                    offset=offset,
+                    length=length,
+                ))
+        ArchivedPage.objects.bulk_create(entries, batch_size=1000)
+        return len(entries)
+    except Exception as e:
+        logger.error(f"Error archiving {len(pages)} pages: {str(e)}")
+        return 0
+
+
+def prune_crawl_archive(days=None):
+    """
+    Drop captures older than CRAWL_ARCHIVE_RETENTION_DAYS: their index rows,
+    then every WARC file in the expired day directories that no remaining row
+    points into. Returns (rows deleted, files deleted).
+    """
+    from core.models import ArchivedPage  # Import here to avoid circular imports
+
+    cutoff = timezone.now() - timedelta(days=days or settings.CRAWL_ARCHIVE_RETENTION_DAYS)
+    rows, _ = ArchivedPage.objects.filter(fetched_at__lt=cutoff).delete()
+
+    root = Path(settings.CRAWL_ARCHIVE_DIR)
+    files = 0
+    # Day directories are named for the UTC date their files were started on
+    for day in sorted(root.glob('*/*/*')):
+        relative_day = day.relative_to(root).as_posix()
+        if not day.is_dir() or not DAY_PATH.match(relative_day) or relative_day >= f"{cutoff:%Y/%m/%d}":
+            continue
+        paths = {f"{relative_day}/{path.name}": path for path in day.glob('*.warc.gz')}
+        still_used = set(ArchivedPage.objects.filter(warc_file__in=list(paths)).values_list('warc_file', flat=True).distinct())
+        for relative_path, path in paths.items():
+            if relative_path not in still_used:
+                path.unlink(missing_ok=True)
+                files += 1
+        # Drop emptied day, month and year directories
+        for directory in (day, day.parent, day.parent.parent):
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+
+    logger.info(f"Pruned {rows} archived pages and {files} WARC files older than {cutoff:%Y-%m-%d}")
+    return rows, files
+
+
+def replay_archived_pages(entries, extract=True, categorize=True):
+    """
+    Run archived responses back through cleaning, journalist extraction and
+    categorization, reading pages from disk instead of the web. Existing
+    pages get their content replaced; archived URLs not in the database are
+    stored like fresh crawls. Returns seconds spent per stage and page counts.
+    """
+    from core.models import NewsPage  # Import here to avoid circular imports
+    from core.tasks import categorize_pages, clean_html, process_journalist_pages
+    from core.utils.near_duplicates import create_news_page
+    from core.utils.url_classifier import SKIP, get_url_classifier
+    from core.utils.work_queue import WORKER_ID
+
+    stats = dict.fromkeys(('read', 'clean', 'store', 'extract', 'categorize'), 0.0)
+    stats.update(pages=0, extracted=0, categorized=0)
+
+    # Latest capture of each URL only
+    latest = {}
+    for entry in entries:
+        if entry.url not in latest or entry.fetched_at > latest[entry.url].fetched_at:
+            latest[entry.url] = entry
+
+    started = time.monotonic()
+    responses = [(entry, read_response(entry.warc_file, entry.offset, entry.length)) for entry in latest.values()]
+    stats['read'] = time.monotonic() - started
+
+    started = time.monotonic()
+    cleaned = [(entry, response, clean_html(response.html)) for entry, response in responses if response.status < 400]
+    stats['clean'] = time.monotonic() - started
+
+    started = time.monotonic()
+    # Pages due for LLM work are claimed so the sweeps leave them to the replay
+    claim = {'claimed_at': timezone.now(), 'claimed_by': WORKER_ID} if extract or categorize else {}
+    update_fields = ['content'] + (['processed'] if extract else []) + (['categorized'] if claim else []) + list(claim)
+    existing = {
+        page.url: page
+        for page in NewsPage.objects.filter(
+            url__in=[entry.url for entry, _, _ in cleaned]
+        ).only('id', 'url', 'canonical_id', 'processed', 'categorized')
+    }
+    classifiers = {}
+    updates = []
+    page_ids = []
+    with transaction.atomic():
+        for entry, response, content in cleaned:
+            page = existing.get(entry.url)
+            if page:
+                if page.canonical_id:
+                    continue  # Duplicates keep no body, they follow their canonical page
+                page.content = content
+                page.processed = False
+                page.categorized = False
+                for field, value in claim.items():
+                    setattr(page, field, value)
+                updates.append(page)
+                page_ids.append(page.id)
+                continue
+
+            if entry.source is None:
+                continue
+            if entry.source_id not in classifiers:
+                classifiers[entry.source_id] = get_url_classifier(entry.source_id)
+            if classifiers[entry.source_id].decide(entry.url) == SKIP:
+                continue
+            title_match = re.search(r'<title[^>]*>(.*?)</title>', response.html, re.IGNORECASE | re.DOTALL)
+            page, is_duplicate = create_news_page(
+                url=entry.url,
+                title=title_match.group(1).strip()[:500] if title_match else '',
+                content=content,
+                source=entry.source,
+                **claim
+            )
+            if not is_duplicate:
+                page_ids.append(page.id)
+        NewsPage.objects.bulk_update(updates, update_fields, batch_size=500)
+    stats['store'] = time.monotonic() - started
+    stats['pages'] = len(page_ids)
+
+    if extract and page_ids:
+        started = time.monotonic()
+        stats['extracted'] = process_journalist_pages(page_ids)
+        stats['extract'] = time.monotonic() - started
+
+    if categorize and page_ids:
+        started = time.monotonic()
+        to_categorize = list(NewsPage.objects.filter(
+            id__in=page_ids, is_news_article=True, journalists__isnull=False
+        ).distinct().values_list('id', flat=True))
+        stats['categorized'] = categorize_pages(to_categorize)
+        stats['categorize'] = time.monotonic() - started
+
+    return stats
@@ -0,0 +1,158 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+YIELD_FIELDS = ('pages_fetched', 'pages_new', 'pages_processed', 'news_articles', 'new_journalists', 'llm_tokens')
+PRIOR_PAGES = 100  # Sources with little history are pulled towards the average yield
+
+
+def record_source_yield(source_id, **counts):
+    """Add crawl/extraction counters to today's yield row for a source"""
+    from core.models import SourceYield  # Import here to avoid circular imports
+
+    counts = {field: value for field, value in counts.items() if value}
+    if not source_id or not counts:
+        return
+    today = timezone.localdate()
+    increments = {field: F(field) + value for field, value in counts.items()}
+    try:
+        if SourceYield.objects.filter(source_id=source_id, date=today).update(**increments):
+            return
+        try:
+            with transaction.atomic():
+                SourceYield.objects.create(source_id=source_id, date=today, **counts)
+        except IntegrityError:
+            # Another worker created today's row first
+            SourceYield.objects.filter(source_id=source_id, date=today).update(**increments)
+    except Exception as e:
+        logger.error(f"Error recording yield for source {source_id}: {str(e)}")
+
+
+def source_yield_stats(days=None):
+    """Yield counters per source summed over the planning window. Returns {source_id: {field: total}}."""
+    from core.models import SourceYield  # Import here to avoid circular imports
+
+    since = timezone.localdate() - timedelta(days=days or settings.CRAWL_YIELD_WINDOW_DAYS)
+    rows = SourceYield.objects.filter(date__gte=since).values('source_id').annotate(
+        **{f'total_{field}': Sum(field) for field in YIELD_FIELDS}
+    )
+    return {
+        row['source_id']: {field: row[f'total_{field}'] or 0 for field in YIELD_FIELDS}
+        for row in rows
+    }
+
+
+def _ratio(numerator, denominator, default=0.0):
+    return numerator / denominator if denominator else default
+
+
+def _smoothed(numerator, denominator, prior_rate):
+    return (numerator + prior_rate * PRIOR_PAGES) / (denominator + PRIOR_PAGES)
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def plan_crawl_budgets():
+    """
+    Give every source a page budget and a recrawl date in proportion to its
+    expected marginal yield: new journalists per crawled page, discounted by
+    how many fetched pages were already known (the source is saturating) and
+    by its LLM tokens per page relative to the average. Rates are smoothed
+    towards the network-wide average so new sources get a fair first budget.
+    Returns the number of sources planned.
+    """
+    from core.models import NewsSource  # Import here to avoid circular imports
+
+    stats = source_yield_stats()
+    totals = {field: sum(values[field] for values in stats.values()) for field in YIELD_FIELDS}
+    journalists_per_page = _ratio(totals['new_journalists'], totals['pages_processed'])
+    tokens_per_page = _ratio(totals['llm_tokens'], totals['pages_processed'])
+    novelty = _ratio(totals['pages_new'], totals['pages_fetched'], default=1.0)
+    article_ratio = _ratio(totals['news_articles'], totals['pages_processed'])
+
+    sources = list(NewsSource.objects.filter(url__isnull=False).only('id', 'priority', 'last_crawled'))
+    scores = {}
+    for source in sources:
+        values = stats.get(source.id) or dict.fromkeys(YIELD_FIELDS, 0)
+        source_tokens_per_page = _smoothed(values['llm_tokens'], values['pages_processed'], tokens_per_page)
+        score = (
+            _smoothed(values['pages_new'], values['pages_fetched'], novelty)
+            * _smoothed(values['new_journalists'], values['pages_processed'], journalists_per_page)
+            * _ratio(tokens_per_page, source_tokens_per_page, default=1.0)
+        )
+        if source.priority:
+            score *= settings.CRAWL_PRIORITY_BOOST
+        scores[source.id] = score
+
+    mean_score = _ratio(sum(scores.values()), len(scores))
+    now = timezone.now()
+    for source in sources:
+        values = stats.get(source.id) or dict.fromkeys(YIELD_FIELDS, 0)
+        # 1.0 is an average source; with no yield data yet every source is average
+        relative_yield = _ratio(scores[source.id], mean_score, default=1.0)
+        recrawl_days = _clamp(
+            _ratio(settings.CRAWL_DEFAULT_RECRAWL_DAYS, relative_yield, default=settings.CRAWL_MAX_RECRAWL_DAYS),
+            settings.CRAWL_MIN_RECRAWL_DAYS,
+            settings.CRAWL_MAX_RECRAWL_DAYS,
+        )
+        source.crawl_budget = int(_clamp(
+            round(settings.CRAWL_DEFAULT_PAGE_BUDGET * relative_yield),
+            settings.CRAWL_MIN_PAGE_BUDGET,
+            settings.CRAWL_MAX_PAGE_BUDGET,
+        ))
+        source.crawl_yield = scores[source.id]
+        source.next_crawl_at = source.last_crawled + timedelta(days=recrawl_days) if source.last_crawled else now
+        source.crawl_plan = {
+            'pages_fetched': values['pages_fetched'],
+            'pages_processed': values['pages_processed'],
+            'new_journalists': values['new_journalists'],
+            'article_ratio': _ratio(values['news_articles'], values['pages_processed'], default=article_ratio),
+            'journalists_per_100_pages': 100 * _ratio(values['new_journalists'], values['pages_processed']),
+            'tokens_per_journalist': _ratio(values['llm_tokens'], values['new_journalists'], default=None),
+            'novelty': _ratio(values['pages_new'], values['pages_fetched'], default=None),
+            'relative_yield': relative_yield,
+            'recrawl_days': recrawl_days,
+            'planned_at': now.isoformat(),
+        }
+
+    NewsSource.objects.bulk_update(
+        sources, ['crawl_budget', 'crawl_yield', 'next_crawl_at', 'crawl_plan'], batch_size=500
+    )
+    logger.info(f"Planned crawl budgets for {len(sources)} sources from {len(stats)} with yield data")
+    return len(sources)
+
+
+def due_sources(limit=None):
+    """Sources whose planned recrawl date has passed, best expected yield first"""
+    from core.models import NewsSource  # Import here to avoid circular imports
+
+    now = timezone.now()
+    unplanned = Q(next_crawl_at__isnull=True) & (
+        Q(last_crawled__isnull=True) |
+        Q(last_crawled__lt=now - timedelta(days=settings.CRAWL_DEFAULT_RECRAWL_DAYS))
+    )
+    return NewsSource.objects.filter(url__isnull=False).filter(
+        Q(next_crawl_at__lte=now) | unplanned
+    ).order_by(
+        '-priority',
+        F('crawl_yield').desc(nulls_first=True),
+        'next_crawl_at',
+    )[:limit]
+
+
+def page_budget(source, page_limit=None):
+    """Pages to crawl from a source: an explicit limit wins over the planned budget"""
+    return page_limit or source.crawl_budget or settings.CRAWL_DEFAULT_PAGE_BUDGET
+
+
+def schedule_next_crawl(source):
+    """Push a just-crawled source's next crawl out by its planned recrawl interval"""
+    recrawl_days = (source.crawl_plan or {}).get('recrawl_days', settings.CRAWL_DEFAULT_RECRAWL_DAYS)
+    source.next_crawl_at = timezone.now() + timedelta(days=recrawl_days)
@@ -0,0 +1,117 @@
+import logging
+import random
+import smtplib
+import string
+from datetime import timedelta
+import dns.exception
+import dns.resolver
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# How long a verdict is trusted before the domain is checked again.
+# Failures are re-checked sooner since mail servers come back.
+DOMAIN_VERDICT_TTL = timedelta(days=30)
+FAILED_DOMAIN_TTL = timedelta(days=7)
+
+SMTP_TIMEOUT = 2
+SMTP_HELO_HOST = 'example.com'
+SMTP_PROBE_SENDER = 'test@example.com'
+
+
+def get_domain_intel(domain: str):
+    """Stored EmailDomain for a domain if its verdict is still fresh, else None"""
+    from core.models import EmailDomain  # Import here to avoid circular imports
+
+    intel = EmailDomain.objects.filter(domain=domain).first()
+    if intel is None or not intel.is_fresh():
+        return None
+    return intel
+
+
+def is_failed_domain(domain: str) -> bool:
+    """True if a fresh verdict says guessing emails at this domain is pointless"""
+    intel = get_domain_intel(domain)
+    return intel is not None and intel.is_failed
+
+
+def resolve_mx(domain: str):
+    """MX hosts for a domain, best preference first. Empty list if there are none."""
+    try:
+        records = dns.resolver.resolve(domain, 'MX', lifetime=SMTP_TIMEOUT * 2)
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.NoNameservers):
+        return []
+    return [
+        str(record.exchange).rstrip('.')
+        for record in sorted(records, key=lambda record: record.preference)
+    ]
+
+
+def probe_catch_all(mx_host: str, domain: str, timeout: int = SMTP_TIMEOUT) -> bool:
+    """True if the mail server accepts a random address, so RCPT answers tell us nothing"""
+    random_local = ''.join(random.choices(string.ascii_lowercase + string.digits, k=16))
+    with smtplib.SMTP(mx_host, 25, timeout=timeout) as server:
+        server.ehlo(SMTP_HELO_HOST)
+        server.mail(SMTP_PROBE_SENDER)
+        code, _ = server.rcpt(f'{random_local}@{domain}')
+    return code == 250
+
+
+def record_domain_verdict(domain: str, **fields):
+    """Create or update the stored verdict for a domain and stamp it as checked now"""
+    from core.models import EmailDomain  # Import here to avoid circular imports
+
+    fields['last_checked_at'] = timezone.now()
+    intel, _ = EmailDomain.objects.update_or_create(domain=domain, defaults=fields)
+    return intel
+
+
+def record_domain_failure(domain: str, error: str):
+    """Mark a domain as failed, keeping whatever else we know about it"""
+    logger.warning(f"Marking {domain} as failed: {error}")
+    return record_domain_verdict(domain, is_failed=True, last_error=error[:255])
+
+
+def probe_domain(domain: str, timeout: int = SMTP_TIMEOUT) -> dict:
+    """
+    Look up MX records, SMTP reachability and catch-all status for a domain.
+    Network only, makes one DNS query and at most one SMTP session; returns
+    the EmailDomain fields to store.
+    """
+    try:
+        mx_hosts = resolve_mx(domain)
+    except dns.exception.DNSException as e:
+        return dict(
+            mx_hosts=[], smtp_reachable=None, is_catch_all=None,
+            is_failed=True, last_error=f'DNS error: {e}'[:255],
+        )
+
+    if not mx_hosts:
+        return dict(
+            mx_hosts=[], smtp_reachable=False, is_catch_all=None,
+            is_failed=True, last_error='No MX records',
+        )
+
+    try:
+        is_catch_all = probe_catch_all(mx_hosts[0], domain, timeout=timeout)
+    except (smtplib.SMTPException, OSError) as e:
+        return dict(
+            mx_hosts=mx_hosts, smtp_reachable=False, is_catch_all=None,
+            is_failed=True, last_error=f'SMTP error: {e}'[:255],
+        )
+
+    return dict(
+        mx_hosts=mx_hosts, smtp_reachable=True, is_catch_all=is_catch_all,
+        # A catch-all server accepts every guess, so SMTP can't verify anything there
+        is_failed=is_catch_all, last_error='Catch-all domain' if is_catch_all else '',
+    )
+
+
+def check_domain(domain: str, timeout: int = SMTP_TIMEOUT):
+    """Probe a domain and store the verdict"""
+    return record_domain_verdict(domain, **probe_domain(domain, timeout=timeout))
+
+
+def get_or_check_domain(domain: str):
+    """Fresh stored verdict for a domain, checking it over the network only when needed"""
+    return get_domain_intel(domain) or check_domain(domain)
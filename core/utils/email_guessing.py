@@ -0,0 +1,258 @@
+import logging
+import random
+import smtplib
+import string
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import dns.exception
+from core.utils.batching import iter_keyset_batches
+from core.utils.email_domains import (
+    SMTP_HELO_HOST, SMTP_PROBE_SENDER, SMTP_TIMEOUT, record_domain_verdict, resolve_mx,
+)
+from core.utils.email_patterns import (
+    EMAIL_PATTERNS, MIN_PATTERN_CONFIDENCE, SMTP_PATTERN_CONFIDENCE,
+    build_email, group_journalists_by_domain, match_patterns, record_smtp_pattern,
+)
+
+logger = logging.getLogger(__name__)
+
+JOURNALIST_BATCH_SIZE = 5000
+DNS_CONCURRENCY = 32
+MAX_SMTP_SESSIONS = 20
+PER_HOST_SESSIONS = 2  # Big providers host many outlets, don't hammer one MX host
+RECIPIENTS_PER_TRANSACTION = 50  # Many servers cap RCPTs per MAIL FROM
+MAX_JOURNALISTS_WITHOUT_MATCH = 3  # Give up on a domain if none of its first few names verify
+MAX_RECONNECTS = 2  # New sessions per work unit after the host drops one
+
+
+class SMTPSession:
+    """One SMTP connection reused for many RCPT checks"""
+
+    def __init__(self, host, timeout=SMTP_TIMEOUT):
+        self.host = host
+        self.timeout = timeout
+        self.server = None
+        self.recipients = 0
+
+    def __enter__(self):
+        self.server = smtplib.SMTP(self.host, 25, timeout=self.timeout)
+        self.server.ehlo(SMTP_HELO_HOST)
+        self._start_transaction()
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    def _start_transaction(self):
+        self.server.mail(SMTP_PROBE_SENDER)
+        self.recipients = 0
+
+    def accepts(self, email):
+        if self.recipients >= RECIPIENTS_PER_TRANSACTION:
+            self.server.rset()
+            self._start_transaction()
+        code, _ = self.server.rcpt(email)
+        self.recipients += 1
+        return code == 250
+
+
+def _verify_domain(session, domain, journalists, check_catch_all):
+    """
+    Verify candidates for one domain's journalists over an open session.
+    Once an address verifies, only that pattern is tried for the rest.
+    Returns (verdict, found, pattern_example, error); error is set if the
+    session dropped part way, with whatever verified before it did.
+    """
+    verdict = None
+    found = {}
+    pattern = None
+    pattern_example = None
+    try:
+        if check_catch_all:
+            random_local = ''.join(random.choices(string.ascii_lowercase + string.digits, k=16))
+            is_catch_all = session.accepts(f'{random_local}@{domain}')
+            verdict = dict(
+                smtp_reachable=True, is_catch_all=is_catch_all, is_failed=is_catch_all,
+                last_error='Catch-all domain' if is_catch_all else '',
+            )
+            if is_catch_all:
+                return verdict, {}, None, None
+
+        for tried, (journalist_id, name) in enumerate(journalists):
+            if pattern is None and tried >= MAX_JOURNALISTS_WITHOUT_MATCH:
+                verdict = dict(is_failed=True, last_error='No valid emails found')
+                break
+            patterns = [pattern] if pattern else list(EMAIL_PATTERNS)
+            for candidate_pattern in patterns:
+                email = build_email(name, domain, candidate_pattern)
+                if email and session.accepts(email):
+                    found[journalist_id] = email
+                    if pattern is None:
+                        pattern = match_patterns(name, email)[0]
+                        pattern_example = (name, email)
+                    break
+    except (smtplib.SMTPException, OSError) as e:
+        return verdict, found, pattern_example, f'SMTP error: {e}'[:255]
+    return verdict, found, pattern_example, None
+
+
+def _verify_on_host(host, domain_jobs):
+    """
+    Work unit for SMTP sessions to one host: verify several domains that share
+    an MX host. A dropped session only fails the domain it was checking (and
+    only if nothing had verified there); the rest go on over a new connection.
+    Domains still unchecked when the host stops answering get no verdict.
+    Returns {domain: (verdict, found, pattern_example)}.
+    """
+    outcomes = {}
+    remaining = list(domain_jobs)
+    connections = 0
+    while remaining and connections <= MAX_RECONNECTS:
+        connections += 1
+        try:
+            with SMTPSession(host) as session:
+                while remaining:
+                    domain, journalists, check_catch_all = remaining.pop(0)
+                    verdict, found, pattern_example, error = _verify_domain(session, domain, journalists, check_catch_all)
+                    if error:
+                        logger.warning(f"SMTP session to {host} dropped while checking {domain}: {error}")
+                        if not found:
+                            verdict = dict(smtp_reachable=False, is_failed=True, last_error=error)
+                        outcomes[domain] = (verdict, found, pattern_example)
+                        break
+                    outcomes[domain] = (verdict, found, pattern_example)
+        except (smtplib.SMTPException, OSError) as e:
+            # Shared hosts throttle reconnects, so a host that never answered tells us nothing about its domains
+            logger.warning(f"Couldn't connect to {host} for {len(remaining)} domains: {str(e)}")
+            break
+    for domain, _, _ in remaining:
+        outcomes[domain] = (None, {}, None)
+    return outcomes
+
+
+def _resolve_unknown_domains(domains):
+    """Resolve MX once per domain, concurrently. Returns {domain: [mx_hosts]} plus DNS failures."""
+    def resolve(domain):
+        try:
+            return domain, resolve_mx(domain), None
+        except dns.exception.DNSException as e:
+            return domain, [], f'DNS error: {e}'[:255]
+
+    if not domains:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(DNS_CONCURRENCY, len(domains))) as executor:
+        return {domain: (mx_hosts, error) for domain, mx_hosts, error in executor.map(resolve, domains)}
+
+
+def _guess_batch(journalists_by_domain):
+    """Guess emails for one batch of journalists grouped by domain. Returns {journalist_id: (email, confidence)}."""
+    from core.models import DomainEmailPattern, EmailDomain  # Import here to avoid circular imports
+
+    domains = list(journalists_by_domain)
+    results = {}
+
+    # Known patterns need no network at all
+    patterns = {
+        domain_pattern.domain: domain_pattern
+        for domain_pattern in DomainEmailPattern.objects.filter(domain__in=domains, confidence__gte=MIN_PATTERN_CONFIDENCE)
+    }
+    for domain, domain_pattern in patterns.items():
+        for journalist_id, name in journalists_by_domain[domain]:
+            email = build_email(name, domain_pattern.email_domain, domain_pattern.pattern)
+            if email:
+                results[journalist_id] = (email, domain_pattern.confidence)
+
+    remaining = [domain for domain in domains if domain not in patterns]
+    verdicts = {
+        intel.domain: intel
+        for intel in EmailDomain.objects.filter(domain__in=remaining)
+        if intel.is_fresh()
+    }
+
+    # One MX lookup per domain we haven't seen recently
+    mx_by_domain = {domain: verdicts[domain].mx_hosts for domain in remaining if domain in verdicts and not verdicts[domain].is_failed}
+    unknown = [domain for domain in remaining if domain not in verdicts]
+    for domain, (mx_hosts, error) in _resolve_unknown_domains(unknown).items():
+        if mx_hosts:
+            mx_by_domain[domain] = mx_hosts
+        else:
+            record_domain_verdict(
+                domain, mx_hosts=[], smtp_reachable=False if not error else None,
+                is_catch_all=None, is_failed=True, last_error=error or 'No MX records',
+            )
+
+    # Group by primary MX host, split into at most PER_HOST_SESSIONS sessions per host
+    domains_by_host = defaultdict(list)
+    for domain, mx_hosts in mx_by_domain.items():
+        if mx_hosts:
+            domains_by_host[mx_hosts[0]].append((domain, journalists_by_domain[domain], domain not in verdicts))
+
+    work_units = []
+    for host, domain_jobs in domains_by_host.items():
+        sessions = min(PER_HOST_SESSIONS, len(domain_jobs))
+        for shard in range(sessions):
+            work_units.append((host, domain_jobs[shard::sessions]))
+
+    if work_units:
+        with ThreadPoolExecutor(max_workers=min(MAX_SMTP_SESSIONS, len(work_units))) as executor:
+            for outcomes in executor.map(lambda unit: _verify_on_host(*unit), work_units):
+                for domain, (verdict, found, pattern_example) in outcomes.items():
+                    if verdict is not None:
+                        record_domain_verdict(domain, mx_hosts=mx_by_domain[domain], **verdict)
+                    if pattern_example:
+                        record_smtp_pattern(*pattern_example, domain)
+                    for journalist_id, email in found.items():
+                        results[journalist_id] = (email, SMTP_PATTERN_CONFIDENCE)
+
+    return results
+
+
+def _save_results(results):
+    """Bulk-write guessed emails, skipping any address another journalist already has"""
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    taken = set(Journalist.objects.filter(
+        email_address__in=[email for email, _ in results.values()]
+    ).values_list('email_address', flat=True))
+
+    updates = []
+    for journalist_id, (email, confidence) in results.items():
+        if email in taken:
+            continue
+        taken.add(email)
+        updates.append(Journalist(
+            id=journalist_id,
+            email_address=email,
+            email_status='guessed',
+            email_confidence=confidence,
+        ))
+
+    # bulk_update skips save(); the periodic Typesense sync picks the changes up
+    Journalist.objects.bulk_update(updates, ['email_address', 'email_status', 'email_confidence'], batch_size=500)
+    return len(updates)
+
+
+def guess_emails_concurrently(limit: int = None) -> int:
+    """
+    Guess emails for journalists without one, grouped by their first source's
+    domain. Each domain costs at most one MX lookup, domains sharing an MX host
+    share SMTP sessions, and results are written in bulk per batch.
+    Returns the number of emails saved.
+    """
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    pending = Journalist.objects.filter(email_address__isnull=True, sources__isnull=False).distinct()
+    if limit:
+        pending = Journalist.objects.filter(pk__in=list(pending.order_by('pk').values_list('pk', flat=True)[:limit]))
+
+    saved = 0
+    for batch in iter_keyset_batches(pending, JOURNALIST_BATCH_SIZE, fields=['name']):
+        journalists_by_domain = group_journalists_by_domain(dict(batch))
+        results = _guess_batch(journalists_by_domain)
+        saved += _save_results(results)
+        logger.info(f"Guessed {len(results)} emails across {len(journalists_by_domain)} domains")
+
+    return saved
@@ -0,0 +1,232 @@
+import logging
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Local-part formats seen at news outlets, keyed by the name stored on DomainEmailPattern
+EMAIL_PATTERNS = {
+    'first.last': lambda first, last: f'{first}.{last}',
+    'firstlast': lambda first, last: f'{first}{last}',
+    'first_last': lambda first, last: f'{first}_{last}',
+    'first-last': lambda first, last: f'{first}-{last}',
+    'flast': lambda first, last: f'{first[0]}{last}',
+    'f.last': lambda first, last: f'{first[0]}.{last}',
+    'firstl': lambda first, last: f'{first}{last[0]}',
+    'first.l': lambda first, last: f'{first}.{last[0]}',
+    'last.first': lambda first, last: f'{last}.{first}',
+    'lastfirst': lambda first, last: f'{last}{first}',
+    'lastf': lambda first, last: f'{last}{first[0]}',
+    'first': lambda first, last: first,
+    'last': lambda first, last: last,
+}
+
+# Emails we trust enough to learn from; plain 'guessed' ones may themselves come from a pattern
+TRUSTED_EMAIL_STATUSES = ('verified', 'guessed_by_third_party')
+
+# Patterns below this confidence are not applied and the domain falls back to SMTP
+MIN_PATTERN_CONFIDENCE = 0.5
+
+# Confidence for a pattern taken from a single SMTP-accepted address
+SMTP_PATTERN_CONFIDENCE = 0.6
+
+# A learned pattern needs at least this many known addresses agreeing on it
+MIN_PATTERN_SAMPLES = 2
+
+# Personal mailboxes say nothing about an outlet's format
+FREEMAIL_DOMAINS = {
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'yahoo.co.uk', 'ymail.com', 'hotmail.com',
+    'hotmail.co.uk', 'outlook.com', 'live.com', 'msn.com', 'aol.com', 'icloud.com', 'me.com',
+    'mac.com', 'protonmail.com', 'proton.me', 'gmx.com', 'gmx.de', 'gmx.net', 'web.de',
+    'mail.com', 'yandex.com', 'yandex.ru', 'zoho.com', 'fastmail.com', 'hey.com', 'substack.com',
+}
+
+# Outlets whose mail is on a domain with a different name from the site
+EMAIL_DOMAIN_ALIASES = {
+    'theguardian.com': {'guardian.co.uk'},
+}
+
+# Second-level labels under country TLDs, e.g. the co of bbc.co.uk
+COUNTRY_SECOND_LEVEL = {'co', 'com', 'org', 'net', 'ac', 'gov', 'edu', 'ltd', 'plc'}
+
+
+def normalize_domain(url_or_domain: str) -> str:
+    """Bare host for a source URL or domain, without scheme, path or www."""
+    host = url_or_domain.split('//')[-1].split('/')[0].lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def domain_brand(domain: str) -> str:
+    """Registrable name of a domain without its suffix: bbc for news.bbc.co.uk and bbc.com"""
+    labels = domain.lower().split('.')
+    if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in COUNTRY_SECOND_LEVEL:
+        labels = labels[:-1]
+    return labels[-2] if len(labels) > 1 else labels[0]
+
+
+def is_outlet_email_domain(email_domain: str, source_domain: str) -> bool:
+    """True if addresses on email_domain can belong to the outlet at source_domain, e.g. bbc.co.uk for bbc.com"""
+    email_domain = email_domain.lower()
+    if email_domain in FREEMAIL_DOMAINS:
+        return False
+    return (
+        email_domain == source_domain
+        or email_domain in EMAIL_DOMAIN_ALIASES.get(source_domain, ())
+        or domain_brand(email_domain) == domain_brand(source_domain)
+    )
+
+
+def group_journalists_by_domain(names):
+    """
+    Group journalists by their first source's domain.
+    names is {journalist_id: name}; returns {domain: [(journalist_id, name)]}.
+    """
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    first_sources = Journalist.sources.through.objects.filter(
+        journalist_id__in=list(names)
+    ).order_by('journalist_id', 'id').values_list('journalist_id', 'newssource__url')
+
+    journalists_by_domain = defaultdict(list)
+    seen = set()
+    for journalist_id, source_url in first_sources:
+        if journalist_id in seen or not source_url:
+            continue
+        seen.add(journalist_id)
+        journalists_by_domain[normalize_domain(source_url)].append((journalist_id, names[journalist_id]))
+    return journalists_by_domain
+
+
+def split_name(name: str):
+    """Return (first, last) as lowercase ASCII, or None if the name has fewer than two parts"""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    parts = [re.sub(r'[^a-z]', '', part) for part in ascii_name.split()]
+    parts = [part for part in parts if part]
+    if len(parts) < 2:
+        return None
+    return parts[0], parts[-1]
+
+
+def build_email(name: str, domain: str, pattern: str):
+    """Email for a name under a pattern, or None if the name can't be split"""
+    name_parts = split_name(name)
+    if not name_parts or pattern not in EMAIL_PATTERNS:
+        return None
+    return f'{EMAIL_PATTERNS[pattern](*name_parts)}@{domain}'
+
+
+def match_patterns(name: str, email: str):
+    """All patterns that turn name into the local part of email"""
+    name_parts = split_name(name)
+    if not name_parts or '@' not in email:
+        return []
+    local_part = email.split('@')[0].lower()
+    return [
+        pattern for pattern, build in EMAIL_PATTERNS.items()
+        if build(*name_parts) == local_part
+    ]
+
+
+def learn_domain_patterns() -> int:
+    """
+    Infer each source domain's email format from trusted addresses we already
+    hold and store it with a confidence score. Only addresses on the outlet's
+    own domain (or an alias of it) count, so freelancers' personal mailboxes
+    and other outlets' addresses are ignored. Confidence is the share of
+    samples matching the winning pattern, damped for small samples, and a
+    pattern needs MIN_PATTERN_SAMPLES agreeing addresses to be stored.
+    Returns the number of domains stored.
+    """
+    from core.models import DomainEmailPattern, Journalist  # Import here to avoid circular imports
+
+    samples = Journalist.objects.filter(
+        email_status__in=TRUSTED_EMAIL_STATUSES,
+        email_address__isnull=False,
+        sources__isnull=False,
+    ).values_list('name', 'email_address', 'sources__url')
+
+    # {domain: {email_domain: {pattern: count}}}
+    pattern_counts = defaultdict(lambda: defaultdict(Counter))
+    sample_sizes = Counter()
+    for name, email, source_url in samples.iterator(chunk_size=2000):
+        domain = normalize_domain(source_url)
+        email_domain = email.split('@')[1].lower()
+        if not is_outlet_email_domain(email_domain, domain):
+            continue
+        patterns = match_patterns(name, email)
+        if not patterns:
+            continue
+        sample_sizes[domain] += 1
+        for pattern in patterns:
+            pattern_counts[domain][email_domain][pattern] += 1
+
+    now = timezone.now()
+    learned = []
+    for domain, counts_by_email_domain in pattern_counts.items():
+        matches, pattern, email_domain = max(
+            (matches, pattern, email_domain)
+            for email_domain, counts in counts_by_email_domain.items()
+            for pattern, matches in counts.items()
+        )
+        if matches < MIN_PATTERN_SAMPLES:
+            continue
+        learned.append(DomainEmailPattern(
+            domain=domain,
+            email_domain=email_domain,
+            pattern=pattern,
+            confidence=round(matches / (sample_sizes[domain] + 1), 3),
+            sample_size=sample_sizes[domain],
+            method='learned',
+            updated_at=now,
+        ))
+
+    with transaction.atomic():
+        # Learned patterns are rebuilt from scratch; drop the ones the samples no longer support
+        DomainEmailPattern.objects.filter(method='learned').exclude(
+            domain__in=[pattern.domain for pattern in learned]
+        ).delete()
+        DomainEmailPattern.objects.bulk_create(
+            learned,
+            update_conflicts=True,
+            unique_fields=['domain'],
+            update_fields=['email_domain', 'pattern', 'confidence', 'sample_size', 'method', 'updated_at'],
+            batch_size=500,
+        )
+    logger.info(f"Learned email patterns for {len(learned)} domains")
+    return len(learned)
+
+
+def get_domain_pattern(domain: str):
+    """Stored pattern for a domain if it's confident enough to apply, else None"""
+    from core.models import DomainEmailPattern  # Import here to avoid circular imports
+
+    return DomainEmailPattern.objects.filter(
+        domain=domain,
+        confidence__gte=MIN_PATTERN_CONFIDENCE,
+    ).first()
+
+
+def record_smtp_pattern(name: str, email: str, domain: str):
+    """
+    Remember the format of an address the mail server accepted, so the rest of
+    the domain can be guessed without probing. Never overrides a learned pattern.
+    """
+    from core.models import DomainEmailPattern  # Import here to avoid circular imports
+
+    patterns = match_patterns(name, email)
+    if not patterns:
+        return None
+    pattern, _ = DomainEmailPattern.objects.get_or_create(
+        domain=domain,
+        defaults={
+            'email_domain': email.split('@')[1].lower(),
+            'pattern': patterns[0],
+            'confidence': SMTP_PATTERN_CONFIDENCE,
+            'sample_size': 1,
+            'method': 'smtp',
+        },
+    )
+    return pattern
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+import redis
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from core.utils.email_patterns import split_name
+
+logger = logging.getLogger(__name__)
+
+HUNTER_API_URL = 'https://api.hunter.io/v2'
+CACHE_TTL = 60 * 60 * 24 * 7  # 7 days, same as the old requests_cache setup
+NEGATIVE_CACHE_TTL = 60 * 60 * 24  # Misses are retried sooner, Hunter keeps learning
+DOMAIN_SEARCH_PAGE_SIZE = 100
+# Domain search is billed per 10 emails returned and email-finder per call, so a
+# domain search only pays off when it replaces many finder calls and fetches few
+# more emails than we have journalists to match
+DOMAIN_SEARCH_MIN_JOURNALISTS = 10
+DOMAIN_SEARCH_RESULTS_PER_JOURNALIST = 2
+DOMAIN_SEARCH_MAX_RESULTS = 500
+
+# Hunter's documented limits: 15 requests per second, 500 per minute, per API key.
+# Windows are counted in Redis so the limit holds across every worker.
+RATE_LIMITS = [(1, 15), (60, 500)]
+
+# Takes a slot in every window at once, or none if any window is full, so callers
+# waiting for room never use up the quota. Returns the 1-based index of a full window, or 0.
+TAKE_RATE_LIMIT_SLOT = '''
+for i, key in ipairs(KEYS) do
+    if tonumber(redis.call('GET', key) or '0') >= tonumber(ARGV[i]) then
+        return i
+    end
+end
+for i, key in ipairs(KEYS) do
+    redis.call('INCR', key)
+    redis.call('EXPIRE', key, ARGV[#KEYS + i])
+end
+return 0
+'''
+
+# Hunter pattern strings mapped onto core.utils.email_patterns.EMAIL_PATTERNS
+HUNTER_PATTERNS = {
+    '{first}.{last}': 'first.last',
+    '{first}{last}': 'firstlast',
+    '{first}_{last}': 'first_last',
+    '{first}-{last}': 'first-last',
+    '{f}{last}': 'flast',
+    '{f}.{last}': 'f.last',
+    '{first}{l}': 'firstl',
+    '{first}.{l}': 'first.l',
+    '{last}.{first}': 'last.first',
+    '{last}{first}': 'lastfirst',
+    '{last}{f}': 'lastf',
+    '{first}': 'first',
+    '{last}': 'last',
+}
+
+
+class HunterClient:
+    """
+    Hunter.io API client shared by the whole process.
+    One pooled HTTP session, a Redis response cache shared between workers,
+    and a Redis rate limiter so all workers together stay within quota.
+    """
+
+    def __init__(self, api_key=None, redis_url=None):
+        self.api_key = api_key or os.getenv('HUNTER_API_KEY')
+        self.redis = redis.Redis.from_url(redis_url or settings.HUNTER_REDIS_URL)
+        self._take_slot = self.redis.register_script(TAKE_RATE_LIMIT_SLOT)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504], allowed_methods=['GET']),
+        )
+        self.session.mount('https://', adapter)
+
+    def _cache_key(self, endpoint, params):
+        # The API key is left out so rotating it doesn't empty the cache
+        payload = json.dumps(sorted(params.items()))
+        return f'hunter:{endpoint}:{hashlib.sha256(payload.encode()).hexdigest()}'
+
+    def _wait_for_rate_limit(self):
+        """Block until every window has room, then take one slot for the request about to go out"""
+        while True:
+            now = time.time()
+            keys = [f'hunter:rate:{window}:{int(now // window)}' for window, _ in RATE_LIMITS]
+            args = [limit for _, limit in RATE_LIMITS] + [window + 1 for window, _ in RATE_LIMITS]
+            full = self._take_slot(keys=keys, args=args)
+            if not full:
+                return
+            window, _ = RATE_LIMITS[full - 1]
+            time.sleep(window - (now % window))
+
+    def get(self, endpoint, params):
+        """GET an endpoint through the shared cache. Returns the parsed JSON body, or None on error."""
+        cache_key = self._cache_key(endpoint, params)
+        try:
+            cached = self.redis.get(cache_key)
+        except redis.RedisError as e:
+            logger.warning(f"Hunter cache unavailable: {str(e)}")
+            cached = None
+        if cached is not None:
+            return json.loads(cached)
+
+        self._wait_for_rate_limit()
+        response = self.session.get(
+            f'{HUNTER_API_URL}/{endpoint}',
+            params={**params, 'api_key': self.api_key},
+            timeout=30,
+        )
+        if response.status_code != 200:
+            logger.error(f"Hunter.io API error: {response.status_code} - {response.text}")
+            return None
+
+        body = response.json()
+        has_result = bool(body.get('data', {}).get('email') or body.get('data', {}).get('emails'))
+        try:
+            self.redis.set(cache_key, json.dumps(body), ex=CACHE_TTL if has_result else NEGATIVE_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"Hunter cache unavailable: {str(e)}")
+        return body
+
+    def email_finder(self, domain: str, first_name: str, last_name: str) -> Optional[str]:
+        """Best email Hunter knows for one person at a domain"""
+        body = self.get('email-finder', {'domain': domain, 'first_name': first_name, 'last_name': last_name})
+        if not body:
+            return None
+        return body.get('data', {}).get('email')
+
+    def domain_search(self, domain: str, max_results: int = DOMAIN_SEARCH_MAX_RESULTS):
+        """
+        Up to max_results emails Hunter knows for a domain, plus its pattern.
+        Billed per 10 emails returned, so keep max_results close to what's needed.
+        Returns (emails, pattern) where emails are Hunter's email dicts.
+        """
+        emails = []
+        pattern = None
+        offset = 0
+        while offset < max_results:
+            page_size = min(DOMAIN_SEARCH_PAGE_SIZE, max_results - offset)
+            body = self.get('domain-search', {
+                'domain': domain,
+                'type': 'personal',
+                'limit': page_size,
+                'offset': offset,
+            })
+            if not body:
+                break
+            data = body.get('data', {})
+            pattern = pattern or data.get('pattern')
+            page = data.get('emails', [])
+            emails.extend(page)
+            total = body.get('meta', {}).get('results', 0)
+            offset += page_size
+            if len(page) < page_size or offset >= total:
+                break
+        return emails, pattern
+
+
+def domain_search_max_results(journalist_count: int) -> int:
+    """Emails to fetch in a domain search for this many journalists, a few per journalist to match against"""
+    return min(DOMAIN_SEARCH_MAX_RESULTS, journalist_count * DOMAIN_SEARCH_RESULTS_PER_JOURNALIST)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_hunter_client() -> HunterClient:
+    """Process-wide client, so every caller shares the same connection pool"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HunterClient()
+    return _client
+
+
+def match_domain_emails(journalists, emails):
+    """
+    Match Hunter domain-search results to our journalists by first and last name.
+    journalists is a list of (id, name); returns {journalist_id: email}.
+    """
+    by_name = {}
+    for entry in emails:
+        if not entry.get('value') or not entry.get('first_name') or not entry.get('last_name'):
+            continue
+        name_parts = split_name(f"{entry['first_name']} {entry['last_name']}")
+        if name_parts:
+            by_name.setdefault(name_parts, entry['value'])
+
+    matches = {}
+    for journalist_id, name in journalists:
+        name_parts = split_name(name)
+        if name_parts and name_parts in by_name:
+            matches[journalist_id] = by_name[name_parts]
+    return matches
+
+
+def record_hunter_pattern(domain: str, hunter_pattern: Optional[str], sample_size: int):
+    """Store the pattern Hunter reports for a domain unless we already learned one ourselves"""
+    from core.models import DomainEmailPattern  # Import here to avoid circular imports
+
+    pattern = HUNTER_PATTERNS.get(hunter_pattern or '')
+    if not pattern:
+        return None
+    domain_pattern, _ = DomainEmailPattern.objects.get_or_create(
+        domain=domain,
+        defaults={
+            'email_domain': domain,
+            'pattern': pattern,
+            'confidence': round(sample_size / (sample_size + 1), 3) if sample_size else 0.5,
+            'sample_size': sample_size,
+            'method': 'hunter',
+        },
+    )
+    return domain_pattern
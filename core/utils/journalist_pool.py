@@ -0,0 +1,53 @@
+import random
+import logging
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+EXAMPLE_JOURNALIST_POOL_KEY = 'example_journalist_pool'
+EXAMPLE_JOURNALIST_POOL_TTL = 60 * 60 * 6  # 6 hours, refreshed hourly by Celery beat
+# Keep the cached list well below memcached's 1MB item limit
+EXAMPLE_JOURNALIST_POOL_SIZE = 5000
+
+
+def refresh_example_journalist_pool():
+    """
+    Rebuild the pool of journalist IDs eligible for the homepage examples.
+    The expensive filtered/distinct query only runs here, never on a page hit.
+    Returns the list of IDs stored in the cache.
+    """
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    pool = list(
+        Journalist.objects.filter(
+            image_url__isnull=False,
+            x_profile_url__isnull=False,  # Must have X profile
+            sources__isnull=False,  # Must have at least one source
+        ).order_by().values_list('id', flat=True).distinct()
+    )
+    if len(pool) > EXAMPLE_JOURNALIST_POOL_SIZE:
+        # Rotate through the full set across refreshes
+        pool = random.sample(pool, EXAMPLE_JOURNALIST_POOL_SIZE)
+    cache.set(EXAMPLE_JOURNALIST_POOL_KEY, pool, EXAMPLE_JOURNALIST_POOL_TTL)
+    logger.info(f"Refreshed example journalist pool with {len(pool)} journalists")
+    return pool
+
+
+def get_example_journalists(count: int = 6):
+    """Pick random example journalists from the cached ID pool"""
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    pool = cache.get(EXAMPLE_JOURNALIST_POOL_KEY)
+    if pool is None:
+        # Cold cache (first hit after deploy or memcached restart)
+        pool = refresh_example_journalist_pool()
+    if not pool:
+        return []
+
+    picked_ids = random.sample(pool, min(count, len(pool)))
+    journalists = {
+        journalist.id: journalist
+        for journalist in Journalist.objects.filter(id__in=picked_ids).prefetch_related('sources', 'categories')
+    }
+    # Keep the random order and skip journalists deleted since the last refresh
+    return [journalists[journalist_id] for journalist_id in picked_ids if journalist_id in journalists]
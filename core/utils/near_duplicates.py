@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import random
+import re
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_WORDS = 4
+MIN_WORDS = 150  # Shorter pages are mostly navigation, too little text to fingerprint reliably
+NUM_HASHES = 64
+BAND_ROWS = 4  # 16 bands of 4 rows: pages sharing ~half their shingles usually share a band
+MAX_CANDIDATES = 200
+PRIME = (1 << 31) - 1  # Signature values fit a Postgres integer
+
+WORD = re.compile(r'\w+')
+LINK = re.compile(r'\]\([^)]*\)|https?://\S+')
+
+# Fixed permutations, signatures must stay comparable across processes and releases
+_random = random.Random(20261019)
+PERMUTATIONS = [(_random.randrange(1, PRIME), _random.randrange(PRIME)) for _ in range(NUM_HASHES)]
+
+
+def _hash(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'big', signed=True)
+
+
+def minhash(text: str):
+    """MinHash signature over word shingles of the normalized text, or None if the text is too short"""
+    words = WORD.findall(LINK.sub(' ', text.lower()))
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = {
+        _hash(' '.join(words[i:i + SHINGLE_WORDS]).encode()) % PRIME
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+    return [min((a * shingle + b) % PRIME for shingle in shingles) for a, b in PERMUTATIONS]
+
+
+def lsh_bands(signature):
+    """One hash per band of BAND_ROWS signature values; similar pages collide in at least one"""
+    return [
+        _hash(f"{start}:{signature[start:start + BAND_ROWS]}".encode())
+        for start in range(0, NUM_HASHES, BAND_ROWS)
+    ]
+
+
+def estimated_similarity(a, b) -> float:
+    """Jaccard similarity of the two pages' shingle sets, estimated from their signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+def find_canonical(signature, source_id=None):
+    """
+    Id of the most similar fingerprinted page above NEAR_DUPLICATE_SIMILARITY, or None.
+    Pages from source_id are never candidates: shingles cover the whole page, so two
+    short articles on one outlet can look alike through its navigation and footer alone.
+    """
+    from core.models import PageFingerprint  # Import here to avoid circular imports
+
+    candidates = PageFingerprint.objects.filter(bands__overlap=lsh_bands(signature))
+    if source_id is not None:
+        candidates = candidates.exclude(page__source_id=source_id)
+    candidates = candidates.values_list('page_id', 'minhash')[:MAX_CANDIDATES]
+    best = max(
+        ((estimated_similarity(signature, candidate), page_id) for page_id, candidate in candidates),
+        default=None
+    )
+    return best[1] if best and best[0] >= settings.NEAR_DUPLICATE_SIMILARITY else None
+
+
+def create_news_page(url, title, content, source, **fields):
+    """
+    Store a crawled page. A near-duplicate of a page we already have from
+    another source (a wire story or syndicated copy) is stored without its
+    body, linked to the canonical page and given its journalists instead of
+    going to the LLM. Returns (page, is_duplicate); duplicates must not be
+    queued for extraction.
+    """
+    from core.models import NewsPage, PageFingerprint  # Import here to avoid circular imports
+
+    signature = minhash(content)
+    canonical_id = find_canonical(signature, source.id) if signature is not None else None
+    if canonical_id:
+        page = NewsPage.objects.create(url=url, title=title, content='', source=source, canonical_id=canonical_id)
+        sync_duplicates([canonical_id])
+        logger.info(f"{url} is a near-duplicate of page {canonical_id}")
+        return page, True
+
+    page = NewsPage.objects.create(url=url, title=title, content=content, source=source, **fields)
+    if signature is not None:
+        PageFingerprint.objects.create(page=page, minhash=signature, bands=lsh_bands(signature))
+    return page, False
+
+
+def sync_duplicates(canonical_ids):
+    """
+    Copy flags, journalists and categories from processed canonical pages to
+    their duplicates. Called whenever canonical pages are processed or
+    categorized. Returns the ids of the duplicates updated.
+    """
+    from core.models import NewsPage  # Import here to avoid circular imports
+
+    canonicals = list(
+        NewsPage.objects.filter(id__in=list(canonical_ids), processed=True, duplicates__isnull=False)
+        .distinct().only('id', 'is_news_article', 'published_date')
+    )
+    if not canonicals:
+        return []
+
+    for canonical in canonicals:
+        # Duplicates have no body to categorize, so they are marked done and get the canonical's categories
+        NewsPage.objects.filter(canonical_id=canonical.id).update(
+            processed=True,
+            is_news_article=canonical.is_news_article,
+            published_date=canonical.published_date,
+            categorized=True,
+            claimed_at=None,
+            claimed_by=None,
+        )
+
+    ids = [canonical.id for canonical in canonicals]
+    duplicates = list(NewsPage.objects.filter(canonical_id__in=ids).values_list('id', 'canonical_id'))
+    for relation, field in ((NewsPage.journalists.through, 'journalist_id'), (NewsPage.categories.through, 'newspagecategory_id')):
+        linked = {}
+        for page_id, linked_id in relation.objects.filter(newspage_id__in=ids).values_list('newspage_id', field):
+            linked.setdefault(page_id, []).append(linked_id)
+        relation.objects.bulk_create([
+            relation(newspage_id=duplicate_id, **{field: linked_id})
+            for duplicate_id, canonical_id in duplicates
+            for linked_id in linked.get(canonical_id, [])
+        ], ignore_conflicts=True)
+
+    return [duplicate_id for duplicate_id, _ in duplicates]
+
+
+def fingerprint_pages(pages):
+    """Fingerprint pages stored before near-duplicate detection. Returns the number fingerprinted."""
+    from core.models import PageFingerprint  # Import here to avoid circular imports
+
+    fingerprints = []
+    for page in pages:
+        signature = minhash(page.content)
+        if signature is not None:
+            fingerprints.append(PageFingerprint(page_id=page.id, minhash=signature, bands=lsh_bands(signature)))
+    PageFingerprint.objects.bulk_create(fingerprints, ignore_conflicts=True)
+    return len(fingerprints)
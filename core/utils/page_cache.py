@@ -0,0 +1,82 @@
+import time
+import hashlib
+import logging
+from functools import wraps
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever public content changes. Memcached can't delete by prefix,
+# so every page/fragment key includes the current generation instead.
+PUBLIC_PAGES_GENERATION_KEY = 'public_pages_generation'
+
+
+def get_public_pages_generation() -> int:
+    """Return the current cache generation for public pages"""
+    generation = cache.get(PUBLIC_PAGES_GENERATION_KEY)
+    if generation is None:
+        generation = int(time.time())
+        # add() so concurrent cold starts agree on a single value
+        cache.add(PUBLIC_PAGES_GENERATION_KEY, generation, None)
+        generation = cache.get(PUBLIC_PAGES_GENERATION_KEY, generation)
+    return generation
+
+
+def invalidate_public_pages():
+    """Invalidate all cached public pages and template fragments"""
+    try:
+        cache.incr(PUBLIC_PAGES_GENERATION_KEY)
+    except ValueError:
+        # Key missing (expired or evicted), start a fresh generation
+        cache.set(PUBLIC_PAGES_GENERATION_KEY, int(time.time()), None)
+    logger.info("Invalidated public page cache")
+
+
+def cache_public_page(ttl: int):
+    """
+    Cache the rendered response of a public view for anonymous visitors.
+    Adds ETag/Last-Modified headers and answers conditional requests with a 304.
+    Authenticated users and non-GET requests always get a freshly rendered page.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            cache_key = f"public_page:{get_public_pages_generation()}:{view_func.__name__}:{path_hash}"
+
+            cached = cache.get(cache_key)
+            if cached is None:
+                response = view_func(request, *args, **kwargs)
+                # Only cache plain successful pages that don't set cookies
+                if response.status_code != 200 or response.streaming or response.cookies:
+                    return response
+
+                cached = {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'etag': quote_etag(hashlib.md5(response.content).hexdigest()),
+                    'last_modified': int(time.time()),
+                }
+                cache.set(cache_key, cached, ttl)
+
+            response = HttpResponse(cached['content'], content_type=cached['content_type'])
+            response['ETag'] = cached['etag']
+            response['Last-Modified'] = http_date(cached['last_modified'])
+            # Let browsers keep the page but revalidate it with the ETag
+            patch_cache_control(response, max_age=0, must_revalidate=True)
+
+            conditional_response = get_conditional_response(
+                request,
+                etag=cached['etag'],
+                last_modified=cached['last_modified'],
+                response=response,
+            )
+            return conditional_response or response
+        return wrapper
+    return decorator
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from urllib.parse import urlparse
+import httpx
+from asgiref.sync import sync_to_async
+from openai import AsyncAzureOpenAI
+from core.utils.work_queue import claim_work
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION_MODEL = 'gpt-4o-mini'
+FETCH_CONCURRENCY = 20  # Profile pages downloading at once, across all hosts
+PER_HOST_CONCURRENCY = 2  # Many profiles live on the same outlet, don't hammer it
+LLM_CONCURRENCY = 3
+NAMES_PER_PROMPT = 10  # Staff pages are split into several prompts so replies fit max_tokens
+MAX_PROFILE_CHARS = 20000  # Markdown sent to the LLM per page
+FETCH_TIMEOUT = 30
+SAVE_BATCH_SIZE = 500
+
+
+def _build_llm_client():
+    return AsyncAzureOpenAI(
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", "").rstrip("/").strip('"').strip("'"),
+        api_version="2024-02-15-preview",
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        max_retries=5,
+        timeout=60.0,
+    )
+
+
+def _build_http_client():
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=FETCH_CONCURRENCY, max_keepalive_connections=FETCH_CONCURRENCY),
+        timeout=FETCH_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": "Mozilla/5.0"},
+    )
+
+
+def pending_profiles(limit: int):
+    """
+    Journalists with a profile URL but no description, grouped by URL so a staff
+    page listing several of them is fetched once. Returns {url: [(id, name)]}.
+    """
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    # Claimed so overlapping runs never pay for the same profile twice
+    journalist_ids = claim_work('descriptions', limit)
+    rows = Journalist.objects.filter(id__in=journalist_ids).values_list('id', 'name', 'profile_url')
+
+    journalists_by_url = defaultdict(list)
+    for journalist_id, name, profile_url in rows:
+        journalists_by_url[profile_url].append((journalist_id, name))
+    return journalists_by_url
+
+
+def save_descriptions(descriptions):
+    """Bulk-write descriptions; bulk_update skips save(), the periodic Typesense sync picks them up"""
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    updates = [
+        Journalist(id=journalist_id, description=description, claimed_at=None, claimed_by=None)
+        for journalist_id, description in descriptions.items()
+    ]
+    Journalist.objects.bulk_update(updates, ['description', 'claimed_at', 'claimed_by'], batch_size=SAVE_BATCH_SIZE)
+    # The description is part of the search vector
+    Journalist.objects.filter(id__in=list(descriptions)).update(search_vector=Journalist.search_vector_expression())
+    return len(updates)
+
+
+async def fetch_profile_page(http_client, host_limits, url: str):
+    """HTML of a profile page, or None if it couldn't be fetched"""
+    async with host_limits[urlparse(url).netloc]:
+        try:
+            response = await http_client.get(url)
+        except httpx.HTTPError as e:
+            logger.error(f"Error scraping {url}: {str(e)}")
+            return None
+    if response.status_code != 200 or 'html' not in response.headers.get('content-type', ''):
+        logger.warning(f"Skipping {url}: {response.status_code} {response.headers.get('content-type', '')}")
+        return None
+    return response.text
+
+
+async def describe_journalists(llm_client, content: str, names):
+    """Ask the LLM for a short bio of each named journalist found in the page. Returns {name: description}."""
+    prompt = f"""
+    Extract a professional description of each of these journalists from their profile page: {json.dumps(names)}.
+    Return a JSON object with a 'descriptions' field mapping each name, exactly as given,
+    to a 2-3 sentence summary, or to null if the page says nothing about them.
+
+    Profile content:
+    {content}
+    """
+
+    response = await llm_client.chat.completions.create(
+        model=DESCRIPTION_MODEL,
+        messages=[
+            {"role": "system", "content": "You are a professional bio writer."},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=200 * len(names) + 100,
+        temperature=0.3,
+        response_format={"type": "json_object"}
+    )
+
+    result = json.loads(response.choices[0].message.content)
+    descriptions = result.get('descriptions') or {}
+    return {name: descriptions.get(name) for name in names if isinstance(descriptions.get(name), str)}
+
+
+async def process_journalist_descriptions(limit: int = 10) -> int:
+    """
+    Fill in descriptions for journalists that have a profile URL but no description.
+    Pages are downloaded over one pooled async HTTP client with per-host limits,
+    each distinct URL once, and the LLM calls overlap with the remaining downloads.
+    Returns the number of descriptions saved.
+    """
+    from core.tasks import clean_html  # Import here to avoid circular imports
+
+    journalists_by_url = await sync_to_async(pending_profiles)(limit)
+    if not journalists_by_url:
+        return 0
+
+    fetch_limit = asyncio.Semaphore(FETCH_CONCURRENCY)
+    llm_limit = asyncio.Semaphore(LLM_CONCURRENCY)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(PER_HOST_CONCURRENCY))
+    descriptions = {}
+
+    async with _build_http_client() as http_client, _build_llm_client() as llm_client:
+
+        async def process_url(url, journalists):
+            async with fetch_limit:
+                html = await fetch_profile_page(http_client, host_limits, url)
+            if not html:
+                return
+            content = clean_html(html)[:MAX_PROFILE_CHARS]
+            ids_by_name = {name: journalist_id for journalist_id, name in journalists}
+            names = list(ids_by_name)
+            for start in range(0, len(names), NAMES_PER_PROMPT):
+                try:
+                    async with llm_limit:
+                        described = await describe_journalists(llm_client, content, names[start:start + NAMES_PER_PROMPT])
+                except Exception as e:
+                    logger.error(f"Error in GPT processing for {url}: {str(e)}")
+                    continue
+                for name, description in described.items():
+                    descriptions[ids_by_name[name]] = description
+
+        await asyncio.gather(*(
+            process_url(url, journalists) for url, journalists in journalists_by_url.items()
+        ))
+
+    saved = await sync_to_async(save_descriptions)(descriptions)
+    shared = sum(1 for journalists in journalists_by_url.values() if len(journalists) > 1)
+    logger.info(f"Saved {saved} descriptions from {len(journalists_by_url)} profile pages ({shared} shared)")
+    return saved
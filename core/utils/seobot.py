@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+import openai
+import replicate
+import requests
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from django.utils.text import slugify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+SEOBOT_CDN_URL = 'https://cdn.seobotai.com'
+FETCH_CONCURRENCY = 8
+FETCH_TIMEOUT = 30
+
+
+def build_session():
+    """Pooled session so concurrent article fetches reuse connections to the CDN"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=FETCH_CONCURRENCY,
+        max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504], allowed_methods=['GET']),
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+def content_hash(title: str, html: str) -> str:
+    return hashlib.sha256(f'{title}\n{html}'.encode()).hexdigest()
+
+
+def fetch_index(session, api_key):
+    """
+    Fetch and decompress the blog index. Each entry carries a version, the
+    article's updated timestamp or its created one if it was never edited.
+    """
+    response = session.get(f'{SEOBOT_CDN_URL}/{api_key}/system/base.json', timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    compressed_index = response.json()
+    if isinstance(compressed_index, str):
+        compressed_index = json.loads(compressed_index)
+
+    index = []
+    for item in compressed_index:
+        if not item.get('id') or not item.get('s'):
+            logger.warning(f"Skipping malformed SEObot index entry: {item}")
+            continue
+        index.append({
+            'id': item['id'],
+            'slug': item['s'],
+            'headline': item.get('h') or '',
+            'created_at': item.get('cr'),
+            'version': str(item.get('up') or item.get('cr') or ''),
+        })
+    return sorted(index, key=lambda entry: entry['created_at'] or '', reverse=True)
+
+
+def fetch_article(session, api_key, article_id):
+    """Full article JSON, or None if it couldn't be fetched"""
+    try:
+        response = session.get(f'{SEOBOT_CDN_URL}/{api_key}/blog/{article_id}.json', timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Error fetching SEObot article {article_id}: {str(e)}")
+        return None
+
+
+def sync_seobot_posts(api_key=None, full=False):
+    """
+    Bring BlogPosts in line with the SEObot index. Only articles that are new or
+    whose index version changed are fetched, concurrently, and the ones whose
+    content actually changed are written in one bulk upsert. An unchanged index
+    costs a single request. Returns a dict of counts plus the ids of posts that
+    still need a featured image.
+    """
+    from core.models import BlogPost  # Import here to avoid circular imports
+    from core.utils.page_cache import invalidate_public_pages  # Import here to avoid circular imports
+
+    api_key = api_key or os.getenv('SEOBOT_API_KEY')
+    session = build_session()
+    index = fetch_index(session, api_key)
+
+    stored = {
+        post['slug']: post
+        for post in BlogPost.objects.values('slug', 'seobot_version', 'content_hash')
+    }
+    changed = [
+        entry for entry in index
+        if full or entry['slug'] not in stored or stored[entry['slug']]['seobot_version'] != entry['version']
+    ]
+
+    with ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY) as executor:
+        articles = list(executor.map(lambda entry: fetch_article(session, api_key, entry['id']), changed))
+
+    posts = []
+    for entry, article in zip(changed, articles):
+        if article is None:
+            continue
+        html = article.get('html', '')
+        digest = content_hash(entry['headline'], html)
+        previous = stored.get(entry['slug'])
+        if previous and previous['content_hash'] == digest and previous['seobot_version'] == entry['version']:
+            continue
+        posts.append(BlogPost(
+            slug=entry['slug'],
+            title=entry['headline'],
+            html_content=html,
+            seobot_id=entry['id'],
+            seobot_version=entry['version'],
+            content_hash=digest,
+        ))
+
+    content_changed = sum(
+        1 for post in posts
+        if post.slug not in stored or stored[post.slug]['content_hash'] != post.content_hash
+    )
+    if posts:
+        # bulk_create skips save(); slugs come from SEObot and auto_now fields are still set
+        BlogPost.objects.bulk_create(
+            posts,
+            update_conflicts=True,
+            unique_fields=['slug'],
+            update_fields=['title', 'html_content', 'seobot_id', 'seobot_version', 'content_hash', 'updated_at'],
+            batch_size=100,
+        )
+    if content_changed:
+        # Make new and updated posts visible on the cached blog pages
+        invalidate_public_pages()
+
+    missing_images = list(BlogPost.objects.filter(
+        Q(featured_image='') | Q(featured_image__isnull=True)
+    ).values_list('id', flat=True))
+
+    stats = {
+        'indexed': len(index),
+        'fetched': len(changed),
+        'failed': sum(1 for article in articles if article is None),
+        'written': len(posts),
+        'content_changed': content_changed,
+        'missing_images': missing_images,
+    }
+    logger.info(f"SEObot sync: {stats['indexed']} indexed, {stats['fetched']} fetched, {stats['content_changed']} changed")
+    return stats
+
+
+def shorten_title(title: str) -> str:
+    """Use OpenAI to generate a 2-4 word shortened title"""
+    try:
+        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        response = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that shortens titles to 2-4 impactful words."},
+                {"role": "user", "content": f"Shorten this title to 2-4 words, keeping the main topic: {title}"}
+            ],
+            max_tokens=20,
+            temperature=0.7
+        )
+        return response.choices[0].message.content.strip().strip('"')
+    except Exception as e:
+        logger.error(f"Error shortening title: {str(e)}")
+        return title[:30]  # Fallback to truncated original title
+
+
+def generate_featured_image(title: str):
+    """Generate a poster for a title with Replicate. Returns a ContentFile, or None."""
+    prompt = f"a beautiful typographic poster with a bright green cat, and the text \"{title}\""
+    output = replicate.run(
+        "ideogram-ai/ideogram-v2",
+        input={
+            "prompt": prompt,
+            "resolution": "None",
+            "style_type": "Anime",
+            "aspect_ratio": "16:9",
+            "magic_prompt_option": "Auto"
+        }
+    )
+    if not output:
+        return None
+
+    response = requests.get(str(output), timeout=60)
+    if response.status_code != 200:
+        logger.error(f"Failed to download generated image: {response.status_code}")
+        return None
+    return ContentFile(response.content, name=f"{slugify(title)[:50]}.png")
@@ -0,0 +1,211 @@
+import logging
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, Sum
+from django.utils import timezone
+from core.utils.batching import iter_keyset_batches
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_JOURNALISTS_K = 10
+QUERY_BLOCK_SIZE = 2000  # Journalists scored at once
+CORPUS_CHUNK_SIZE = 5000  # Embeddings streamed per chunk; block x chunk float32 sims stay ~40MB
+
+# Shared sources count double, they say more about a beat than broad categories do
+COOCCURRENCE_SQL = """
+    SELECT other_id, SUM(weight) AS score
+    FROM (
+        SELECT other.journalist_id AS other_id, 2 AS weight
+        FROM {sources} mine
+        JOIN {sources} other ON other.newssource_id = mine.newssource_id
+        WHERE mine.journalist_id = %s AND other.journalist_id <> %s
+        UNION ALL
+        SELECT other.journalist_id AS other_id, 1 AS weight
+        FROM {categories} mine
+        JOIN {categories} other ON other.newspagecategory_id = mine.newspagecategory_id
+        WHERE mine.journalist_id = %s AND other.journalist_id <> %s
+    ) AS shared
+    GROUP BY other_id
+    ORDER BY score DESC, other_id
+    LIMIT %s
+"""
+
+
+def journalists_needing_neighbours():
+    """
+    Journalists with no stored neighbours, or whose embedding changed after
+    their neighbours were computed. Journalists with neither an embedding nor
+    a source have nothing to compare on and are left out.
+    """
+    from core.models import Journalist, SimilarJournalist  # Import here to avoid circular imports
+
+    computed = SimilarJournalist.objects.filter(journalist_id=OuterRef('pk'))
+    has_source = Journalist.sources.through.objects.filter(journalist_id=OuterRef('pk'))
+    return Journalist.objects.filter(
+        Q(embedding__isnull=False) | Exists(has_source)
+    ).filter(
+        ~Exists(computed) |
+        Exists(computed.filter(computed_at__lt=OuterRef('embedding_updated_at')))
+    )
+
+
+def _normalise(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _embedding_neighbours(query_ids, k):
+    """
+    Top-k cosine neighbours for each query journalist, streaming the corpus in
+    chunks and keeping a running top-k per query. Returns {id: [(other_id, score)]}.
+    """
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    rows = list(Journalist.objects.filter(pk__in=query_ids, embedding__isnull=False).values_list('pk', 'embedding'))
+    query_ids = np.array([pk for pk, _ in rows], dtype=np.int64)
+    if not len(query_ids):
+        return {}
+    queries = _normalise(np.vstack([embedding for _, embedding in rows]).astype(np.float32))
+
+    best_scores = np.full((len(query_ids), k), -np.inf, dtype=np.float32)
+    best_ids = np.full((len(query_ids), k), -1, dtype=np.int64)
+
+    corpus = Journalist.objects.filter(embedding__isnull=False)
+    for chunk in iter_keyset_batches(corpus, CORPUS_CHUNK_SIZE, fields=['embedding']):
+        chunk_ids = np.array([pk for pk, _ in chunk], dtype=np.int64)
+        chunk_vectors = _normalise(np.vstack([embedding for _, embedding in chunk]).astype(np.float32))
+
+        scores = queries @ chunk_vectors.T
+        scores[query_ids[:, None] == chunk_ids[None, :]] = -np.inf  # Never your own neighbour
+
+        combined_scores = np.concatenate([best_scores, scores], axis=1)
+        combined_ids = np.concatenate([best_ids, np.broadcast_to(chunk_ids, scores.shape)], axis=1)
+        top = np.argpartition(-combined_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(combined_scores, top, axis=1)
+        best_ids = np.take_along_axis(combined_ids, top, axis=1)
+
+    order = np.argsort(-best_scores, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_ids = np.take_along_axis(best_ids, order, axis=1)
+
+    neighbours = {}
+    for row, journalist_id in enumerate(query_ids.tolist()):
+        neighbours[journalist_id] = [
+            (other_id, float(score))
+            for other_id, score in zip(best_ids[row].tolist(), best_scores[row].tolist())
+            if other_id != -1 and np.isfinite(score)
+        ]
+    return neighbours
+
+
+def _cooccurrence_neighbours(query_ids, k):
+    """
+    Fallback for journalists without embeddings: rank others by shared sources
+    and categories, scaled to 0..1 by the journalist's own weight.
+    """
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    sources_table = Journalist.sources.through._meta.db_table
+    categories_table = Journalist.categories.through._meta.db_table
+    sql = COOCCURRENCE_SQL.format(
+        sources=connection.ops.quote_name(sources_table),
+        categories=connection.ops.quote_name(categories_table),
+    )
+
+    own_weight = {journalist_id: 0 for journalist_id in query_ids}
+    for journalist_id in Journalist.sources.through.objects.filter(
+        journalist_id__in=query_ids
+    ).values_list('journalist_id', flat=True):
+        own_weight[journalist_id] += 2
+    for journalist_id in Journalist.categories.through.objects.filter(
+        journalist_id__in=query_ids
+    ).values_list('journalist_id', flat=True):
+        own_weight[journalist_id] += 1
+
+    neighbours = {}
+    with connection.cursor() as cursor:
+        for journalist_id in query_ids:
+            if not own_weight[journalist_id]:
+                neighbours[journalist_id] = []
+                continue
+            cursor.execute(sql, [journalist_id, journalist_id, journalist_id, journalist_id, k])
+            neighbours[journalist_id] = [
+                (other_id, score / own_weight[journalist_id])
+                for other_id, score in cursor.fetchall()
+            ]
+    return neighbours
+
+
+def _store_neighbours(neighbours, method):
+    from core.models import SimilarJournalist  # Import here to avoid circular imports
+
+    now = timezone.now()
+    rows = [
+        SimilarJournalist(
+            journalist_id=journalist_id,
+            similar_id=other_id,
+            rank=rank,
+            score=score,
+            method=method,
+            computed_at=now,
+        )
+        for journalist_id, ranked in neighbours.items()
+        for rank, (other_id, score) in enumerate(ranked, start=1)
+    ]
+    with transaction.atomic():
+        SimilarJournalist.objects.filter(journalist_id__in=list(neighbours)).delete()
+        SimilarJournalist.objects.bulk_create(rows, batch_size=1000)
+
+
+def refresh_similar_journalists(limit=None, full=False, k=SIMILAR_JOURNALISTS_K) -> int:
+    """
+    Recompute stored neighbours, by default only for journalists that need it.
+    Incremental runs don't revisit journalists whose neighbours could now
+    include someone new, so schedule an occasional full run as well.
+    Returns the number of journalists refreshed.
+    """
+    from core.models import Journalist  # Import here to avoid circular imports
+
+    journalists = Journalist.objects.all() if full else journalists_needing_neighbours()
+    if limit:
+        journalists = Journalist.objects.filter(pk__in=list(journalists.order_by('pk').values_list('pk', flat=True)[:limit]))
+
+    refreshed = 0
+    for batch in iter_keyset_batches(journalists, QUERY_BLOCK_SIZE, fields=['embedding_updated_at']):
+        embedded_ids = [pk for pk, embedding_updated_at in batch if embedding_updated_at]
+        other_ids = [pk for pk, embedding_updated_at in batch if not embedding_updated_at]
+
+        if embedded_ids:
+            _store_neighbours(_embedding_neighbours(embedded_ids, k), 'embedding')
+        if other_ids:
+            _store_neighbours(_cooccurrence_neighbours(other_ids, k), 'cooccurrence')
+
+        refreshed += len(batch)
+        logger.info(f"Refreshed neighbours for {len(embedded_ids)} embedded and {len(other_ids)} co-occurrence journalists")
+
+    return refreshed
+
+
+def get_similar_journalists(journalist, limit=SIMILAR_JOURNALISTS_K):
+    """Stored neighbours of one journalist, best first"""
+    similar = journalist.similar_journalists.select_related('similar').order_by('rank')[:limit]
+    return [row.similar for row in similar]
+
+
+def get_similar_journalists_for_list(saved_list, limit=SIMILAR_JOURNALISTS_K):
+    """Journalists most similar to a saved list as a whole, excluding its members"""
+    from core.models import Journalist, SimilarJournalist  # Import here to avoid circular imports
+
+    member_ids = list(saved_list.journalists.values_list('id', flat=True))
+    suggestions = SimilarJournalist.objects.filter(
+        journalist_id__in=member_ids
+    ).exclude(
+        similar_id__in=member_ids
+    ).values('similar_id').annotate(
+        total_score=Sum('score')
+    ).order_by('-total_score', 'similar_id')[:limit]
+
+    ranked_ids = [row['similar_id'] for row in suggestions]
+    journalists = Journalist.objects.in_bulk(ranked_ids)
+    return [journalists[journalist_id] for journalist_id in ranked_ids if journalist_id in journalists]
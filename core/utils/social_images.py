@@ -0,0 +1,141 @@
+import hashlib
+import io
+import logging
+import os
+import textwrap
+from functools import lru_cache
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+WIDTH = 1200
+HEIGHT = 630
+GRADIENT_TOP = (22, 163, 74)  # Dark green, fading 20 steps lighter towards the bottom
+GRADIENT_STEP = 20
+LOGO_HEIGHT = 200
+CONTENT_Y = 200  # Common starting position for logo and text
+LOGO_X = 100
+
+# Generated images go to media storage: static files are hashed at deploy time,
+# so anything written there later needs a full collectstatic to be served
+SOCIAL_SHARE_IMAGE_NAME = 'og/social_share.png'
+SOCIAL_SHARE_KEY_CACHE_KEY = 'og:social_share:key'
+BLOG_OG_IMAGE_DIR = 'og/blog'
+
+
+@lru_cache(maxsize=None)
+def _font(size):
+    font_path = os.path.join(settings.STATIC_ROOT, 'fonts', 'SpaceMono-Bold.ttf')
+    try:
+        return ImageFont.truetype(font_path, size)
+    except OSError as e:
+        logger.warning(f"Failed to load custom font, falling back to default: {str(e)}")
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=None)
+def _logo(height=LOGO_HEIGHT):
+    logo_path = os.path.join(settings.STATIC_ROOT, 'img', 'logo.png')
+    logo = Image.open(logo_path)
+    logo.load()
+    width = int(height * logo.size[0] / logo.size[1])
+    return logo.resize((width, height))
+
+
+@lru_cache(maxsize=None)
+def _background(width=WIDTH, height=HEIGHT):
+    """Vertical gradient built from PIL's 256px ramp, one lookup table per channel"""
+    ramp = Image.linear_gradient('L').resize((width, height))
+    channels = [
+        ramp.point(lambda value, start=start: int(start + value / 255 * GRADIENT_STEP))
+        for start in GRADIENT_TOP
+    ]
+    return Image.merge('RGB', channels)
+
+
+def render_og_image(text: str, font_size: int = 60) -> Image.Image:
+    """The NachoPR card: gradient, wordmark on top, logo on the left and text beside it"""
+    image = _background().copy()
+    draw = ImageDraw.Draw(image)
+
+    nacho_font = _font(120)
+    nacho_bbox = draw.textbbox((0, 0), "NachoPR", font=nacho_font)
+    nacho_x = (WIDTH - (nacho_bbox[2] - nacho_bbox[0])) // 2
+    draw.text((nacho_x, 40), "NachoPR", font=nacho_font, fill=(255, 255, 255))
+
+    logo = _logo()
+    logo_y = CONTENT_Y - 20
+    image.paste(logo, (LOGO_X, logo_y), logo if logo.mode == 'RGBA' else None)
+
+    text_x = LOGO_X + logo.size[0] + 100
+    draw.text((text_x, CONTENT_Y), text, font=_font(font_size), fill=(255, 255, 255))
+    return image
+
+
+def _save_png(image: Image.Image, name: str):
+    """Write one PNG to media storage under exactly this name, replacing any previous file"""
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def social_share_key(journalists_count: int, media_outlets_count: int) -> str:
+    return f'{journalists_count}-{media_outlets_count}'
+
+
+def create_social_sharing_image(force: bool = False) -> bool:
+    """
+    Render the site-wide share image with the current journalist and outlet counts.
+    Skipped when the counts haven't changed since the last render.
+    Returns True if a new image was written.
+    """
+    from core.models import Journalist, NewsSource  # Import here to avoid circular imports
+
+    media_outlets_count = NewsSource.objects.count()
+    journalists_count = Journalist.objects.count()
+    key = social_share_key(journalists_count, media_outlets_count)
+
+    if not force and cache.get(SOCIAL_SHARE_KEY_CACHE_KEY) == key and default_storage.exists(SOCIAL_SHARE_IMAGE_NAME):
+        logger.info(f"Social sharing image already up to date for {key}")
+        return False
+
+    text = f"Connect with\n{journalists_count:,} Journalists\nfrom {media_outlets_count:,}\nMedia Outlets"
+    _save_png(render_og_image(text), SOCIAL_SHARE_IMAGE_NAME)
+    cache.set(SOCIAL_SHARE_KEY_CACHE_KEY, key, None)
+    logger.info(f"Created social sharing image for {journalists_count:,} journalists and {media_outlets_count:,} outlets")
+    return True
+
+
+def social_share_image_url() -> str:
+    """URL of the current share image, versioned by its counts so crawlers refetch it"""
+    key = cache.get(SOCIAL_SHARE_KEY_CACHE_KEY)
+    if not key:
+        return static('img/social_share.png')
+    return f'{default_storage.url(SOCIAL_SHARE_IMAGE_NAME)}?v={key}'
+
+
+def blog_og_image_name(post) -> str:
+    """Storage name for a post's OG image; a new title gives a new name"""
+    title_hash = hashlib.sha256(post.title.encode()).hexdigest()[:12]
+    return f'{BLOG_OG_IMAGE_DIR}/{post.slug}-{title_hash}.png'
+
+
+def create_blog_og_image(post, force: bool = False) -> str:
+    """Render a post's OG image unless it already exists. Returns its storage name."""
+    name = blog_og_image_name(post)
+    if force or not default_storage.exists(name):
+        text = '\n'.join(textwrap.wrap(post.title, width=22)[:6])
+        _save_png(render_og_image(text, font_size=44), name)
+        logger.info(f"Created OG image for blog post {post.slug}")
+    return name
+
+
+def blog_og_image_url(post) -> str:
+    return default_storage.url(create_blog_og_image(post))
@@ -0,0 +1,112 @@
+import logging
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Daily added counts plus running totals for a whole table in one pass.
+# The window runs over the full history so totals are correct for any start date.
+DAILY_TOTALS_SQL = """
+    SELECT day, added, SUM(added) OVER (ORDER BY day) AS total
+    FROM (
+        SELECT ({column} AT TIME ZONE %s)::date AS day, COUNT(*) AS added
+        FROM {table}
+        WHERE {column} IS NOT NULL{extra_where}
+        GROUP BY 1
+    ) AS daily
+    ORDER BY day
+"""
+
+
+def _daily_series(table: str, column: str, start_date, end_date, extra_where: str = ''):
+    """
+    Return {date: (added, total)} for every day between start_date and end_date.
+    Days without new rows carry the previous running total forward.
+    """
+    sql = DAILY_TOTALS_SQL.format(
+        table=connection.ops.quote_name(table),
+        column=connection.ops.quote_name(column),
+        extra_where=extra_where,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [settings.TIME_ZONE])
+        rows = cursor.fetchall()
+
+    running_total = 0
+    by_day = {}
+    for day, added, total in rows:
+        if day < start_date:
+            running_total = total
+        elif day <= end_date:
+            by_day[day] = (added, total)
+
+    series = {}
+    day = start_date
+    while day <= end_date:
+        added, running_total = by_day.get(day, (0, running_total))
+        series[day] = (added, running_total)
+        day += timedelta(days=1)
+    return series
+
+
+def rollup_db_stats(start_date, end_date=None) -> int:
+    """
+    Recompute DbStat rows for every day from start_date to end_date (inclusive).
+    Runs one GROUP BY query per table and a single bulk upsert.
+    Returns the number of days written.
+    """
+    from core.models import DbStat, Journalist, NewsPage  # Import here to avoid circular imports
+
+    end_date = end_date or timezone.now().date()
+    if start_date > end_date:
+        return 0
+
+    journalists = _daily_series(Journalist._meta.db_table, 'created_at', start_date, end_date)
+    articles = _daily_series(
+        NewsPage._meta.db_table, 'crawled_at', start_date, end_date,
+        extra_where=' AND is_news_article',
+    )
+
+    stats = []
+    for day, (journalists_added, total_journalists) in journalists.items():
+        articles_added, total_articles = articles[day]
+        stats.append(DbStat(
+            date=timezone.make_aware(datetime.combine(day, time.min)),
+            num_journalists=total_journalists,
+            num_journalists_added_today=journalists_added,
+            num_news_articles=total_articles,
+            num_news_articles_added_today=articles_added,
+        ))
+
+    DbStat.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=['date'],
+        update_fields=[
+            'num_journalists',
+            'num_journalists_added_today',
+            'num_news_articles',
+            'num_news_articles_added_today',
+        ],
+        batch_size=500,
+    )
+    logger.info(f"Rolled up DbStat for {len(stats)} days ({start_date} to {end_date})")
+    return len(stats)
+
+
+def rollup_db_stats_incremental(default_days: int = 30) -> int:
+    """
+    Roll up from the most recent DbStat day through today.
+    The last stored day is recomputed since it may have been written mid-day.
+    """
+    from core.models import DbStat  # Import here to avoid circular imports
+
+    today = timezone.now().date()
+    last_date = DbStat.objects.order_by('-date').values_list('date', flat=True).first()
+    if last_date:
+        start_date = min(timezone.localtime(last_date).date(), today)
+    else:
+        start_date = today - timedelta(days=default_days)
+    return rollup_db_stats(start_date, today)
@@ -0,0 +1,75 @@
+import logging
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PageBatcher:
+    """
+    Collects page ids in a Redis list shared by every worker and hands them to a
+    batch task, either as soon as a full batch is waiting or, for the remainder,
+    once the time window has passed. A trickle of single pages therefore costs
+    one task per batch instead of one per page.
+    """
+
+    def __init__(self, task_name, batch_size, window_seconds):
+        self.task_name = task_name
+        self.batch_size = batch_size
+        self.window_seconds = window_seconds
+        self.key = f'batch:{task_name}'
+        self.timer_key = f'batch:{task_name}:timer'
+        self._redis = None
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.TASK_BATCH_REDIS_URL)
+        return self._redis
+
+    def _pop(self, count):
+        pipe = self.redis.pipeline()  # MULTI/EXEC, so two workers never take the same ids
+        pipe.lrange(self.key, 0, count - 1)
+        pipe.ltrim(self.key, count, -1)
+        page_ids, _ = pipe.execute()
+        return [int(page_id) for page_id in page_ids]
+
+    def _dispatch(self, page_ids):
+        from core.celery import app  # Import here to avoid circular imports
+
+        app.send_task(self.task_name, args=[page_ids])
+        logger.info(f"Dispatched {self.task_name} with {len(page_ids)} pages")
+
+    def add(self, page_ids):
+        """Queue page ids, dispatching every full batch right away"""
+        page_ids = list(page_ids)
+        if not page_ids:
+            return
+        waiting = self.redis.rpush(self.key, *page_ids)
+        while waiting >= self.batch_size:
+            batch = self._pop(self.batch_size)
+            if not batch:
+                break
+            self._dispatch(batch)
+            waiting = self.redis.llen(self.key)
+
+        # One flush timer per window picks up a partial batch
+        if waiting and self.redis.set(self.timer_key, 1, nx=True, ex=self.window_seconds):
+            from core.tasks import flush_page_batch_task  # Import here to avoid circular imports
+            flush_page_batch_task.apply_async((self.task_name,), countdown=self.window_seconds)
+
+    def flush(self):
+        """Dispatch whatever is waiting, in batches. Returns the number of pages dispatched."""
+        self.redis.delete(self.timer_key)
+        dispatched = 0
+        while True:
+            batch = self._pop(self.batch_size)
+            if not batch:
+                return dispatched
+            self._dispatch(batch)
+            dispatched += len(batch)
+
+
+def get_page_batcher(task_name):
+    batch_size, window_seconds = settings.PAGE_BATCHES[task_name]
+    return PageBatcher(task_name, batch_size, window_seconds)
@@ -0,0 +1,200 @@
+import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+import redis
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+RECENT_TASKS_KEY = 'telemetry:recent'
+RECENT_TASKS_LIMIT = 1000
+TASK_STATE_TTL = 60 * 60 * 6  # Recent task state is for inspection, not history
+STATS_TTL = 60 * 60 * 24 * 8  # Hourly aggregates kept for a week
+STATS_FIELDS = ('count', 'failures', 'retries', 'runtime_total', 'runtime_max')
+
+
+def _stats_key(timestamp):
+    return f"telemetry:stats:{time.strftime('%Y%m%d%H', time.gmtime(timestamp))}"
+
+
+_redis = None
+
+
+def get_redis():
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.TASK_TELEMETRY_REDIS_URL)
+    return _redis
+
+
+class TaskTelemetry:
+    """Receives task lifecycle events from the Celery signals in core/celery.py"""
+
+    def task_started(self, task_id, task_name, queue):
+        pass
+
+    def task_finished(self, task_id, task_name, state, runtime):
+        pass
+
+    def flush(self):
+        pass
+
+
+class AggregatingTelemetry(TaskTelemetry):
+    """
+    Counts, failures and runtimes per task name, kept in process memory and
+    added to hourly Redis hashes every flush interval, so a busy worker makes
+    one Redis round trip per interval instead of one per task.
+    """
+
+    def __init__(self, flush_interval=None):
+        self.flush_interval = flush_interval or settings.TASK_TELEMETRY_FLUSH_SECONDS
+        self.lock = threading.Lock()
+        self.stats = defaultdict(lambda: dict.fromkeys(STATS_FIELDS, 0))
+        self.last_flush = time.monotonic()
+
+    def task_finished(self, task_id, task_name, state, runtime):
+        with self.lock:
+            stats = self.stats[task_name]
+            if state == 'RETRY':
+                stats['retries'] += 1
+            else:
+                stats['count'] += 1
+                if state != 'SUCCESS':
+                    stats['failures'] += 1
+            if runtime is not None:
+                stats['runtime_total'] += runtime
+                stats['runtime_max'] = max(stats['runtime_max'], runtime)
+            due = time.monotonic() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            stats, self.stats = self.stats, defaultdict(lambda: dict.fromkeys(STATS_FIELDS, 0))
+            self.last_flush = time.monotonic()
+        if not stats:
+            return
+
+        key = _stats_key(time.time())
+        try:
+            pipe = get_redis().pipeline()
+            for task_name, values in stats.items():
+                pipe.hincrby(key, f'{task_name}:count', values['count'])
+                pipe.hincrby(key, f'{task_name}:failures', values['failures'])
+                pipe.hincrby(key, f'{task_name}:retries', values['retries'])
+                pipe.hincrbyfloat(key, f'{task_name}:runtime_total', values['runtime_total'])
+            pipe.expire(key, STATS_TTL)
+            pipe.execute()
+            # Max can't be incremented, compare-and-set it per task
+            for task_name, values in stats.items():
+                field = f'{task_name}:runtime_max'
+                current = float(get_redis().hget(key, field) or 0)
+                if values['runtime_max'] > current:
+                    get_redis().hset(key, field, values['runtime_max'])
+        except redis.RedisError as e:
+            logger.warning(f"Could not flush task telemetry: {str(e)}")
+
+
+class RedisRecentTasks(TaskTelemetry):
+    """Live state of recently run tasks in Redis, for Flower-style inspection"""
+
+    def __init__(self):
+        self.worker = f'{socket.gethostname()}:{os.getpid()}'
+
+    def _write(self, task_id, fields, push=False):
+        key = f'telemetry:task:{task_id}'
+        try:
+            pipe = get_redis().pipeline()
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, TASK_STATE_TTL)
+            if push:
+                pipe.lpush(RECENT_TASKS_KEY, task_id)
+                pipe.ltrim(RECENT_TASKS_KEY, 0, RECENT_TASKS_LIMIT - 1)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not record task state: {str(e)}")
+
+    def task_started(self, task_id, task_name, queue):
+        self._write(task_id, {
+            'name': task_name,
+            'queue': queue or '',
+            'worker': self.worker,
+            'state': 'STARTED',
+            'started_at': time.time(),
+        }, push=True)
+
+    def task_finished(self, task_id, task_name, state, runtime):
+        self._write(task_id, {
+            'state': state,
+            'finished_at': time.time(),
+            'runtime': runtime if runtime is not None else '',
+        })
+
+
+_backends = None
+_started_at = {}
+
+
+def get_backends():
+    global _backends
+    if _backends is None:
+        _backends = [import_string(path)() for path in settings.TASK_TELEMETRY_BACKENDS]
+    return _backends
+
+
+def record_task_started(task_id, task_name, queue=None):
+    _started_at[task_id] = time.monotonic()
+    for backend in get_backends():
+        backend.task_started(task_id, task_name, queue)
+
+
+def record_task_finished(task_id, task_name, state):
+    started_at = _started_at.pop(task_id, None)
+    runtime = time.monotonic() - started_at if started_at is not None else None
+    for backend in get_backends():
+        backend.task_finished(task_id, task_name, state, runtime)
+
+
+def flush_telemetry():
+    for backend in get_backends():
+        backend.flush()
+
+
+def get_recent_tasks(limit=50, state=None):
+    """Most recently started tasks, newest first, optionally filtered by state"""
+    r = get_redis()
+    task_ids = [task_id.decode() for task_id in r.lrange(RECENT_TASKS_KEY, 0, RECENT_TASKS_LIMIT - 1)]
+    tasks = []
+    for task_id in task_ids:
+        fields = {key.decode(): value.decode() for key, value in r.hgetall(f'telemetry:task:{task_id}').items()}
+        if not fields or (state and fields.get('state') != state):
+            continue
+        tasks.append({'id': task_id, **fields})
+        if len(tasks) >= limit:
+            break
+    return tasks
+
+
+def get_task_stats(hours=24):
+    """Aggregated counts, failures and runtimes per task over the last few hours"""
+    r = get_redis()
+    now = time.time()
+    totals = defaultdict(lambda: dict.fromkeys(STATS_FIELDS, 0))
+    for hour in range(hours):
+        for field, value in r.hgetall(_stats_key(now - hour * 3600)).items():
+            task_name, stat = field.decode().rsplit(':', 1)
+            value = float(value)
+            if stat == 'runtime_max':
+                totals[task_name][stat] = max(totals[task_name][stat], value)
+            else:
+                totals[task_name][stat] += value
+
+    for stats in totals.values():
+        stats['runtime_avg'] = stats['runtime_total'] / stats['count'] if stats['count'] else 0
+    return dict(totals)
+
@@ -1,7 +1,7 @@
 from django.utils import timezone
 from datetime import timedelta
 import logging
-from core.typesense_config import init_typesense
+from core.typesense_config import init_typesense, get_typesense_client
 
 logger = logging.getLogger(__name__)
 
@@ -48,4 +48,27 @@ def sync_recent_journalists():
         
     except Exception as e:
         logger.error(f"Error during Typesense sync: {str(e)}")
-        raise 
\ No newline at end of file
+        raise 
+
+def delete_journalists_from_typesense(journalist_ids, batch_size: int = 250):
+    """
+    Delete many journalists from Typesense with delete-by-filter requests,
+    one request per batch instead of one per journalist.
+    Returns the number of documents Typesense reports as deleted.
+    """
+    journalist_ids = list(journalist_ids)
+    if not journalist_ids:
+        return 0
+
+    client = get_typesense_client()
+    deleted = 0
+    for start in range(0, len(journalist_ids), batch_size):
+        batch = journalist_ids[start:start + batch_size]
+        try:
+            response = client.collections['journalists'].documents.delete({
+                'filter_by': f"id:[{','.join(str(journalist_id) for journalist_id in batch)}]"
+            })
+            deleted += response.get('num_deleted', 0)
+        except Exception as e:
+            logger.error(f"Error bulk deleting {len(batch)} journalists from Typesense: {str(e)}")
+    return deleted
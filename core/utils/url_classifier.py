@@ -0,0 +1,180 @@
+import logging
+import math
+import re
+from collections import defaultdict
+from urllib.parse import urlparse
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from core.utils.batching import iter_keyset_batches
+
+logger = logging.getLogger(__name__)
+
+FETCH = 'fetch'
+DEFER = 'defer'  # Stored, but left to the sweep instead of queued for extraction
+SKIP = 'skip'  # Not stored and never sent to the LLM
+
+PRIOR_SAMPLES = 200  # Pseudo-samples from the all-sources model mixed into each source's counts
+SMOOTHING = 1.0
+
+DATE_SEGMENTS = re.compile(r'/(19|20)\d{2}/\d{1,2}(/\d{1,2})?(/|$)|(19|20)\d{2}-?\d{2}-?\d{2}')
+NUMERIC_ID = re.compile(r'\d{5,}')
+LISTING_WORDS = {
+    'tag', 'tags', 'topic', 'topics', 'category', 'categories', 'section', 'author', 'authors',
+    'search', 'page', 'archive', 'archives', 'video', 'videos', 'gallery', 'about', 'contact',
+    'privacy', 'terms', 'subscribe', 'login', 'newsletter', 'newsletters', 'feed', 'rss',
+}
+
+
+def url_features(url: str):
+    """Path depth, date segments, slug shape and section prefix of a URL, as feature strings"""
+    parsed = urlparse(url)
+    segments = [segment for segment in parsed.path.lower().split('/') if segment]
+    features = {f'depth:{min(len(segments), 5)}'}
+    if segments:
+        features.add(f'prefix:{segments[0][:40]}')
+        last = re.sub(r'\.(s?html?|php|aspx?)$', '', segments[-1])
+        words = [word for word in re.split(r'[-_]', last) if word]
+        features.add(f'slug_words:{min(len(words), 6)}')
+        if segments[-1] != last:
+            features.add('slug:file_extension')
+        if NUMERIC_ID.search(last):
+            features.add('slug:numeric_id')
+        if last.isdigit():
+            features.add('slug:all_digits')
+        for segment in segments:
+            if segment in LISTING_WORDS:
+                features.add(f'listing:{segment}')
+    if DATE_SEGMENTS.search(parsed.path):
+        features.add('date_segment')
+    if parsed.query:
+        features.add('query')
+    return features
+
+
+class UrlClassifier:
+    """
+    Naive Bayes over URL features, estimating how likely a URL is to be a news
+    article. Each source's counts are blended with the all-sources counts, so
+    sources with few labelled pages fall back on network-wide patterns.
+    """
+
+    def __init__(self, global_model, source_model=None, global_counts=None):
+        weight = min(1.0, PRIOR_SAMPLES / max(global_model.articles + global_model.others, 1))
+        self.articles = global_model.articles * weight
+        self.others = global_model.others * weight
+        # The all-sources counts are large, so they are shared between classifiers rather than copied
+        self.global_counts = global_counts if global_counts is not None else weighted_counts(global_model, weight)
+        self.source_counts = source_model.feature_counts if source_model else {}
+        if source_model:
+            self.articles += source_model.articles
+            self.others += source_model.others
+        self.samples = self.articles + self.others
+
+    def feature_count(self, feature):
+        articles, others = self.global_counts.get(feature, (0.0, 0.0))
+        source_articles, source_others = self.source_counts.get(feature, (0, 0))
+        return articles + source_articles, others + source_others
+
+    def article_probability(self, url: str) -> float:
+        log_odds = math.log((self.articles + SMOOTHING) / (self.others + SMOOTHING))
+        for feature in url_features(url):
+            articles, others = self.feature_count(feature)
+            log_odds += math.log((articles + SMOOTHING) / (self.articles + 2 * SMOOTHING))
+            log_odds -= math.log((others + SMOOTHING) / (self.others + 2 * SMOOTHING))
+        return 1 / (1 + math.exp(-max(min(log_odds, 50), -50)))
+
+    def decide(self, url: str) -> str:
+        """FETCH, DEFER or SKIP for a crawled URL"""
+        if self.samples < settings.URL_CLASSIFIER_MIN_SAMPLES:
+            return FETCH  # Not enough labelled pages to trust either way
+        probability = self.article_probability(url)
+        if probability < settings.URL_CLASSIFIER_SKIP_BELOW:
+            return SKIP
+        if probability < settings.URL_CLASSIFIER_DEFER_BELOW:
+            return DEFER
+        return FETCH
+
+
+def weighted_counts(global_model, weight=None):
+    """All-sources feature counts scaled down to PRIOR_SAMPLES pseudo-samples"""
+    if weight is None:
+        weight = min(1.0, PRIOR_SAMPLES / max(global_model.articles + global_model.others, 1))
+    return {feature: (articles * weight, others * weight) for feature, (articles, others) in global_model.feature_counts.items()}
+
+
+class _AlwaysFetch:
+    def decide(self, url: str) -> str:
+        return FETCH
+
+
+# Models and classifiers loaded by this process, valid until the next training run
+_cache = {'trained_at': None, 'global_model': None, 'global_counts': None, 'classifiers': {}}
+
+
+def get_url_classifier(source_id=None):
+    """
+    Classifier for one source's URLs; fetches everything until the first
+    training run. The all-sources model is loaded once per process and each
+    source's classifier once, until the models are retrained, so per-URL
+    callers cost one small query.
+    """
+    from core.models import UrlPatternModel  # Import here to avoid circular imports
+
+    trained_at = UrlPatternModel.objects.filter(source_id__isnull=True).values_list('trained_at', flat=True).first()
+    if trained_at is None:
+        return _AlwaysFetch()
+    if _cache['trained_at'] != trained_at:
+        global_model = UrlPatternModel.objects.filter(source_id__isnull=True).first()
+        if global_model is None:
+            return _AlwaysFetch()
+        _cache.update(
+            trained_at=global_model.trained_at,
+            global_model=global_model,
+            global_counts=weighted_counts(global_model),
+            classifiers={},
+        )
+    classifiers = _cache['classifiers']
+    if source_id not in classifiers:
+        source_model = UrlPatternModel.objects.filter(source_id=source_id).first() if source_id else None
+        classifiers[source_id] = UrlClassifier(_cache['global_model'], source_model, _cache['global_counts'])
+    return classifiers[source_id]
+
+
+def train_url_classifier(batch_size: int = 5000):
+    """
+    Rebuild the URL pattern counts from every page the LLM has labelled.
+    Only ids, source, url and label are read. Returns the number of pages used.
+    """
+    from core.models import NewsPage, UrlPatternModel  # Import here to avoid circular imports
+
+    totals = defaultdict(lambda: [0, 0])  # {source_id: [articles, others]}
+    counts = defaultdict(lambda: defaultdict(lambda: [0, 0]))  # {source_id: {feature: [articles, others]}}
+    pages = NewsPage.objects.filter(processed=True)
+    trained = 0
+    for batch in iter_keyset_batches(pages, batch_size, fields=['source_id', 'url', 'is_news_article']):
+        for _, source_id, url, is_news_article in batch:
+            label = 0 if is_news_article else 1
+            features = url_features(url)
+            for key in {source_id, None}:  # The None key is the all-sources model
+                totals[key][label] += 1
+                for feature in features:
+                    counts[key][feature][label] += 1
+        trained += len(batch)
+
+    now = timezone.now()
+    with transaction.atomic():
+        UrlPatternModel.objects.all().delete()
+        UrlPatternModel.objects.bulk_create([
+            UrlPatternModel(
+                source_id=source_id,
+                articles=articles,
+                others=others,
+                feature_counts=dict(counts[source_id]),
+                trained_at=now,
+            )
+            for source_id, (articles, others) in totals.items()
+        ], batch_size=500)
+
+    logger.info(f"Trained URL classifier on {trained} pages from {len(totals) - 1 if totals else 0} sources")
+    return trained
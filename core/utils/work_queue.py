@@ -0,0 +1,83 @@
+import logging
+import os
+import socket
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _queues():
+    """Model and pending filter for each kind of LLM work"""
+    from core.models import Journalist, NewsPage  # Import here to avoid circular imports
+
+    has_journalists = NewsPage.journalists.through.objects.filter(newspage_id=OuterRef('pk'))
+    return {
+        'journalists': (NewsPage, Q(processed=False) & ~Q(content='')),
+        'categories': (NewsPage, Q(processed=True, is_news_article=True, categorized=False) & Exists(has_journalists)),
+        'descriptions': (Journalist, Q(description__isnull=True, profile_url__isnull=False) & ~Q(profile_url='')),
+    }
+
+
+def pending_work(queue):
+    """Everything waiting in a queue, claimed or not"""
+    model, pending = _queues()[queue]
+    return model.objects.filter(pending)
+
+
+def claim_work(queue, limit, worker=None, lease_seconds=None):
+    """
+    Claim up to limit unclaimed (or lease-expired) rows from a queue and return
+    their ids. Rows are locked with FOR UPDATE SKIP LOCKED while the claim is
+    stamped, so concurrent claimers never wait on each other or take the same
+    rows. Finishing the work clears the claim; if the worker dies the lease
+    expires and the rows are claimable again.
+    """
+    model, pending = _queues()[queue]
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=lease_seconds or settings.WORK_LEASE_SECONDS)
+
+    with transaction.atomic():
+        ids = list(
+            model.objects.filter(pending)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=lease_expired))
+            .order_by('id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:limit]
+        )
+        if ids:
+            model.objects.filter(id__in=ids).update(claimed_at=now, claimed_by=worker or WORKER_ID)
+
+    logger.info(f"Claimed {len(ids)} rows from the {queue} queue")
+    return ids
+
+
+def reclaim_work(queue, ids, worker=None):
+    """
+    Re-stamp the claim on rows a batch task was handed, keeping only those
+    still waiting in the queue. Call at task start: rows finished by another
+    batch meanwhile, or locked by a concurrent claimer, are dropped so the
+    same LLM work is never done twice. Returns the ids to work on.
+    """
+    model, pending = _queues()[queue]
+    with transaction.atomic():
+        ids = list(
+            model.objects.filter(pending, id__in=list(ids))
+            .order_by('id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)
+        )
+        if ids:
+            model.objects.filter(id__in=ids).update(claimed_at=timezone.now(), claimed_by=worker or WORKER_ID)
+    return ids
+
+
+def release_work(queue, ids):
+    """Give claimed rows back without finishing them"""
+    model, _ = _queues()[queue]
+    return model.objects.filter(id__in=list(ids)).update(claimed_at=None, claimed_by=None)
@@ -1,9 +1,14 @@
 import os
-from core.tasks import find_single_email_with_hunter_io
+from core.tasks import enrich_saved_list_task, lookup_journalist_email_task
+from core.utils.journalist_pool import get_example_journalists
+from core.utils.page_cache import cache_public_page, get_public_pages_generation
+from core.search_backends import search_journalists
+from core.utils.similar_journalists import get_similar_journalists, get_similar_journalists_for_list
+from core.utils.social_images import blog_og_image_url
 from dotenv import load_dotenv
 from django.shortcuts import get_object_or_404, render
 import requests
-from core.models import CustomUser, NewsSource, NewsPage, Journalist, NewsPageCategory, PricingPlan, SavedSearch, SavedList, EmailDiscovery, DbStat, BlogPost
+from core.models import CustomUser, NewsSource, NewsPage, Journalist, NewsPageCategory, PricingPlan, SavedSearch, SavedList, EmailDiscovery, EmailLookupJob, ListEnrichmentJob, DbStat, BlogPost
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect
 from django.views.decorators.csrf import csrf_exempt
@@ -14,9 +19,11 @@ from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.core.cache import cache
 # Create a session for the user
 import json
-from django.db import transaction
+from django.db import IntegrityError, transaction
 import random
 import string
 from .polar import PolarClient
@@ -42,20 +49,14 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
-def home(request):
-    journalist_count = Journalist.objects.count()
-    news_sources_count = NewsSource.objects.filter(journalists__isnull=False).count()
-    news_pages_count = NewsPage.objects.filter(is_news_article=True).count()
-    
-    # Get example journalists for the homepage
-    example_journalists = Journalist.objects.filter(
-        image_url__isnull=False,
-        x_profile_url__isnull=False,  # Must have X profile
-        sources__isnull=False,  # Must have at least one source
-    ).distinct().order_by('?')[:6]
-    
-    # Get the last 30 days of stats for the growth graph
+def get_journalist_growth_stats():
+    """Journalists added per day over the last 30 days, cached per generation and day"""
     end_date = timezone.now().date()
+    cache_key = f"journalist_growth_stats:{get_public_pages_generation()}:{end_date}"
+    stats_data = cache.get(cache_key)
+    if stats_data is not None:
+        return stats_data
+
     start_date = end_date - timedelta(days=30)
     
     daily_stats = DbStat.objects.filter(
@@ -82,13 +83,27 @@ def home(request):
         'labels': [date.strftime('%Y-%m-%d') for date in all_dates],
         'values': [existing_data.get(date, 0) for date in all_dates]
     }
+    cache.set(cache_key, stats_data, 60 * 60)
+    return stats_data
+
+
+@cache_public_page(ttl=60 * 5)
+def home(request):
+    journalist_count = Journalist.objects.count()
+    news_sources_count = NewsSource.objects.filter(journalists__isnull=False).count()
+    news_pages_count = NewsPage.objects.filter(is_news_article=True).count()
+    
+    # Get example journalists for the homepage from the cached ID pool
+    example_journalists = get_example_journalists(count=6)
     
     context = {
         'journalist_count': journalist_count,
         'news_sources_count': news_sources_count,
         'news_pages_count': news_pages_count,
         'example_journalists': example_journalists,
-        'stats_data': stats_data,
+        # Lazy so the stats query only runs when the chart fragment isn't cached
+        'stats_data': SimpleLazyObject(get_journalist_growth_stats),
+        'public_cache_generation': get_public_pages_generation(),
     }
     
     return render(request, 'core/home.html', context)
@@ -121,6 +136,7 @@ def search(request):
         'sources': sources,
         'categories': categories,
         'languages': languages,
+        'public_cache_generation': get_public_pages_generation(),
         'turnstile_site_key': os.getenv('CLOUDFLARE_TURNSTILE_SITE_KEY'),
         # Add source-category mapping
         'source_categories': {
@@ -209,6 +225,7 @@ def search_results(request):
     source_id = request.GET.get('source', '')
     category_id = request.GET.get('category', '')
     page_number = int(request.GET.get('page', 1))
+    search_mode = 'hybrid' if request.GET.get('mode') == 'hybrid' else 'keyword'
     
     # If query is empty, return empty results
     if not query:
@@ -223,56 +240,17 @@ def search_results(request):
         })
     
     try:
-        # Get Typesense client
-        from .typesense_config import get_typesense_client
-        client = get_typesense_client()
-        
-        # Build search parameters
-        search_parameters = {
-            'q': query,
-            'query_by': 'name,description,sources,categories,article_titles,article_content',
-            'query_by_weights': '8,4,2,2,6,1',  # Weight name highest, then article titles, then other fields
-            'per_page': 10,
-            'page': page_number,
-            'highlight_fields': 'article_titles,article_content',  # Highlight matching content
-            'highlight_full_fields': 'article_titles,article_content',  # Return full field content for highlighting
-            'prefix': False,  # Disable prefix search for exact matching
-            'typo_tolerance': False,  # Disable typo tolerance for exact matching
-            'min_len_1typo': 4,  # Minimum length for 1 typo
-            'min_len_2typo': 8,  # Minimum length for 2 typos
-            'exhaustive_search': True,  # Enable exhaustive search for better accuracy
-        }
-        
-        logger.info(f"Searching Typesense with parameters: {search_parameters}")
-        logger.info(f"Query: {query}")
-        
-        # Add filters if specified
-        filter_rules = []
-        if country:
-            filter_rules.append(f'country:{country}')
-        if source_id:
-            source = NewsSource.objects.get(id=source_id)
-            filter_rules.append(f'sources:[{source.name}]')
-        if category_id:
-            category = NewsPageCategory.objects.get(id=category_id)
-            filter_rules.append(f'categories:[{category.name}]')
-        
-        if filter_rules:
-            search_parameters['filter_by'] = ' && '.join(filter_rules)
-        
-        logger.info(f"Searching Typesense with parameters: {search_parameters}")
-        
-        # Check if collection exists
-        try:
-            client.collections['journalists'].retrieve()
-        except Exception as e:
-            logger.error(f"Collection 'journalists' not found: {str(e)}")
-            from .typesense_config import init_typesense
-            init_typesense()
-            
-        # Perform the search
-        search_results = client.collections['journalists'].documents.search(search_parameters)
-        logger.info(f"Found {search_results['found']} results")
+        # Typesense, or the Postgres fallback when Typesense is slow or down
+        search_backend, search_results = search_journalists(
+            query,
+            country=country,
+            source_id=source_id,
+            category_id=category_id,
+            page=page_number,
+            per_page=10,
+            mode=search_mode,
+        )
+        logger.info(f"Found {search_results['found']} results using {search_backend}")
         
         # Handle non-subscribers
         if not is_subscriber:
@@ -419,6 +397,7 @@ def search_results(request):
             'time_taken': (timezone.now() - starttime).total_seconds(),
             'unfiltered_results_count': search_results['found'],
             'is_subscriber': is_subscriber,
+            'search_backend': search_backend,
         }
         
         response = render(request, 'core/search_results.html', context=context)
@@ -441,6 +420,7 @@ def search_results(request):
         })
 
 
+@cache_public_page(ttl=60 * 15)
 def free_media_list(request):
     news_sources_count = NewsSource.objects.filter(pages__isnull=False).distinct().count()
     news_pages_count = NewsPage.objects.count()
@@ -452,6 +432,7 @@ def free_media_list(request):
         'news_pages_count': news_pages_count,
         'journalist_count': journalist_count,
         'categories': categories,
+        'public_cache_generation': get_public_pages_generation(),
     }
     return render(request, 'core/free_media_list.html', context=context)
 
@@ -468,6 +449,7 @@ def privacy_policy(request):
 def refund_policy(request):
     return render(request, 'core/refund_policy.html')
 
+@cache_public_page(ttl=60 * 60)
 def pricing(request):
     pricing_plans = PricingPlan.objects.filter(is_archived=False)
     
@@ -790,10 +772,68 @@ def save_to_list(request):
 @login_required
 def single_saved_list(request, id):
     list = get_object_or_404(SavedList, id=id)
-    context = {'list': list}
+    context = {
+        'list': list,
+        'similar_journalists': get_similar_journalists_for_list(list),
+        'enrichment_job': list.enrichment_jobs.first(),
+        'missing_email_count': list.journalists.filter(email_address__isnull=True).count(),
+    }
     return render(request, 'core/single_saved_list.html', context=context)
 
 
+@login_required
+def enrich_saved_list(request, id):
+    """HTMX endpoint to find emails for every list member without one"""
+    if request.method != 'POST':
+        return HttpResponse(status=405)  # Method not allowed
+
+    saved_list = get_object_or_404(SavedList, id=id, user=request.user)
+    ListEnrichmentJob.expire_stale(saved_list=saved_list)
+    job = saved_list.enrichment_jobs.filter(status__in=ListEnrichmentJob.IN_FLIGHT_STATUSES).first()
+    if job is not None:
+        return render(request, 'core/partials/list_enrichment_status.html', {'job': job})
+
+    journalist_ids = list(saved_list.journalists.filter(
+        email_address__isnull=True,
+        sources__isnull=False
+    ).distinct().order_by('id').values_list('id', flat=True))
+    if not journalist_ids:
+        return HttpResponse('<span class="text-green-600">Every journalist in this list has an email</span>', status=200)
+
+    # Reserve a credit per lookup up front so concurrent requests can't overspend;
+    # the task refunds whatever it doesn't find
+    try:
+        with transaction.atomic():
+            user = CustomUser.objects.select_for_update().get(id=request.user.id)
+            reserved = min(user.credits, len(journalist_ids))
+            if reserved <= 0:
+                return HttpResponse('<span class="text-red-600">No credits remaining</span>', status=200)
+            user.credits -= reserved
+            user.save(update_fields=['credits'])
+            job = ListEnrichmentJob.objects.create(
+                saved_list=saved_list,
+                user=user,
+                journalist_ids=journalist_ids[:reserved],
+                total=reserved,
+                reserved_credits=reserved
+            )
+            transaction.on_commit(lambda: enrich_saved_list_task.delay(job.id))
+    except IntegrityError:
+        # Someone else started enriching this list in between
+        job = saved_list.enrichment_jobs.first()
+
+    logger.info(f"Queued enrichment of {job.total} journalists in list {saved_list.id} for {request.user.email}")
+    return render(request, 'core/partials/list_enrichment_status.html', {'job': job})
+
+
+@login_required
+def list_enrichment_status(request, job_id):
+    """HTMX polling endpoint for a bulk list enrichment"""
+    ListEnrichmentJob.expire_stale(id=job_id, user=request.user)
+    job = get_object_or_404(ListEnrichmentJob, id=job_id, user=request.user)
+    return render(request, 'core/partials/list_enrichment_status.html', {'job': job})
+
+
 @login_required
 def health(request):
     if not request.user.is_staff:
@@ -821,11 +861,17 @@ def health(request):
         'values': [stat['total_added'] for stat in daily_stats]
     }
     
+    # Crawl planner decisions, highest expected yield first
+    crawl_plans = NewsSource.objects.exclude(crawl_yield__isnull=True).order_by(
+        F('next_crawl_at').asc(nulls_first=True) if request.GET.get('crawl_order') == 'due' else F('crawl_yield').desc()
+    ).only('name', 'url', 'priority', 'last_crawled', 'crawl_budget', 'crawl_yield', 'next_crawl_at', 'crawl_plan')[:50]
+
     context = {
         'journalist_email_count': journalist_email_count,
         'news_article_count': news_article_count,
         'all_newspage_count': all_newspage_count,
-        'stats_data': stats_data
+        'stats_data': stats_data,
+        'crawl_plans': crawl_plans,
     }
     
     return render(request, 'core/health.html', context)
@@ -833,9 +879,35 @@ def health(request):
 
 def journalist_detail(request, id):
     journalist = get_object_or_404(Journalist, id=id)
-    context = {'journalist': journalist}
+    context = {
+        'journalist': journalist,
+        'similar_journalists': get_similar_journalists(journalist),
+    }
     return render(request, 'core/journalist_detail.html', context=context)
 
+
+def similar_journalists(request, id):
+    """API endpoint returning the precomputed neighbours of a journalist"""
+    journalist = get_object_or_404(Journalist, id=id)
+    return JsonResponse({
+        'journalists': [
+            {'id': similar.id, 'name': similar.name, 'url': reverse('journalist_detail', args=[similar.id])}
+            for similar in get_similar_journalists(journalist)
+        ]
+    })
+
+
+@login_required
+def saved_list_similar_journalists(request, id):
+    """API endpoint suggesting journalists similar to the ones in a saved list"""
+    saved_list = get_object_or_404(SavedList, id=id, user=request.user)
+    return JsonResponse({
+        'journalists': [
+            {'id': similar.id, 'name': similar.name, 'url': reverse('journalist_detail', args=[similar.id])}
+            for similar in get_similar_journalists_for_list(saved_list)
+        ]
+    })
+
 @login_required
 def find_journalist_email(request, journalist_id):
     """HTMX endpoint to find and save journalist email"""
@@ -883,53 +955,42 @@ def find_journalist_email(request, journalist_id):
             status=200
         )
     
-    # Try to find email
-    try:
-        email = find_single_email_with_hunter_io(journalist.name, domain)
-        
-        if email:
-            logger.info(f"Found email {email} for {journalist.name}")
-            # Use direct update to avoid triggering signals
-            Journalist.objects.filter(id=journalist.id).update(
-                email_address=email,
-                email_status='guessed_by_third_party',
-                email_search_with_hunter_tried=True
-            )
-            
-            # Record the email discovery
-            EmailDiscovery.objects.create(
-                user=request.user,
-                journalist=journalist,
-                email=email,
-                source_domain=domain
-            )
-            
-            # Deduct credit using direct update
-            CustomUser.objects.filter(id=request.user.id).update(
-                credits=F('credits') - 1,
-                has_retrieved_email=True
-            )
-            
-            return HttpResponse(
-                f'<span class="text-green-600">{email}</span>',
-                status=200
-            )
-        else:
-            logger.info(f"No email found for {journalist.name} at {domain}")
-            # Use direct update to avoid triggering signals
-            Journalist.objects.filter(id=journalist.id).update(
-                email_search_with_hunter_tried=True
-            )
-            return HttpResponse(
-                '<span class="text-red-600">No email found</span>',
-                status=200
-            )
-    except Exception as e:
-        logger.error(f"Error finding email for {journalist.name}: {str(e)}")
+    # Queue the lookup and let the button poll, so Hunter.io latency never holds a web worker.
+    # Repeat clicks, from anyone, join the lookup already in flight.
+    EmailLookupJob.expire_stale(journalist=journalist)
+    job = EmailLookupJob.objects.filter(journalist=journalist, status__in=EmailLookupJob.IN_FLIGHT_STATUSES).first()
+    if job is None:
+        try:
+            with transaction.atomic():
+                # Take the credit now so queued lookups can't all spend the same one; refunded if nothing is found
+                user = CustomUser.objects.select_for_update().get(id=request.user.id)
+                if user.credits <= 0:
+                    return HttpResponse('<span class="text-red-600">No credits remaining</span>', status=200)
+                user.credits -= 1
+                user.save(update_fields=['credits'])
+                job = EmailLookupJob.objects.create(journalist=journalist, user=user, source_domain=domain)
+                transaction.on_commit(lambda: lookup_journalist_email_task.delay(job.id))
+        except IntegrityError:
+            job = EmailLookupJob.objects.filter(journalist=journalist, status__in=EmailLookupJob.IN_FLIGHT_STATUSES).first()
+            if job is None:
+                # The other lookup finished in between, show its result
+                job = EmailLookupJob.objects.filter(journalist=journalist).first()
+
+    if job.user_id != request.user.id and not job.is_finished:
+        # Status polling is per user, the email shows up here once the other lookup finishes
         return HttpResponse(
-            '<span class="text-red-600">Error finding email</span>',
+            '<span class="text-gray-500">Lookup already in progress, try again shortly</span>',
             status=200
         )
+    return render(request, 'core/partials/email_lookup_status.html', {'job': job})
+
+
+@login_required
+def email_lookup_status(request, job_id):
+    """HTMX polling endpoint for a queued find-email lookup"""
+    EmailLookupJob.expire_stale(id=job_id)
+    job = get_object_or_404(EmailLookupJob, id=job_id, user=request.user)
+    return render(request, 'core/partials/email_lookup_status.html', {'job': job})
 
 @login_required
 def email_discoveries(request):
@@ -1032,10 +1093,16 @@ def create_list(request):
     logger.warning(f"Invalid method: {request.method}")
     return HttpResponse(status=405)
 
+@cache_public_page(ttl=60 * 60)
 def blog_list(request):
     posts = BlogPost.objects.all()
     return render(request, 'core/blog/list.html', {'posts': posts})
 
+@cache_public_page(ttl=60 * 60 * 24)
 def blog_detail(request, slug):
     post = get_object_or_404(BlogPost, slug=slug)
-    return render(request, 'core/blog/detail.html', {'post': post})
\ No newline at end of file
+    context = {
+        'post': post,
+        'og_image_url': blog_og_image_url(post),
+    }
+    return render(request, 'core/blog/detail.html', context)
\ No newline at end of file
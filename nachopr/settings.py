@@ -14,6 +14,7 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 import sentry_sdk
+from celery.schedules import crontab
 
 load_dotenv()
 
@@ -195,6 +196,15 @@ else:
     MEDIA_ROOT = BASE_DIR / 'media'
     MEDIA_URL = '/media/'
 
+# Raw crawl responses as WARC files, for reprocessing without recrawling.
+# Opt-in; captures older than the retention are pruned nightly.
+CRAWL_ARCHIVE_ENABLED = os.getenv('CRAWL_ARCHIVE_ENABLED', 'false').lower() == 'true'
+CRAWL_ARCHIVE_RETENTION_DAYS = int(os.getenv('CRAWL_ARCHIVE_RETENTION_DAYS', '30'))
+if PROD:
+    CRAWL_ARCHIVE_DIR = '/home/persistent/crawl_archive'
+else:
+    CRAWL_ARCHIVE_DIR = BASE_DIR / 'crawl_archive'
+
 # Static files configuration
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [
@@ -369,10 +379,33 @@ SERVER_EMAIL = 'NachoPR <support@updates.nachopr.com>'
 
 # Add Celery settings
 CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+HUNTER_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')  # Hunter.io response cache and rate limiter
 CELERY_RESULT_BACKEND = 'django-db'
 CELERY_CACHE_BACKEND = 'django-cache'
 CELERY_RESULT_EXTENDED = True
-CELERY_TASK_TRACK_STARTED = True
+# Per-task result rows cost several Postgres writes on the hot pipeline, so results
+# are off by default; task counts, runtimes and recent state go to Redis instead
+# (core/utils/task_telemetry.py). Failures are still stored.
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_DURABLE_RESULT_TASKS = [
+    'nachopr.continuous_crawl',
+    'core.tasks.migrate_to_typesense_task',
+    'core.tasks.sync_typesense_index',
+    'core.tasks.sync_blog_posts',
+    'core.tasks.update_journalist_embeddings',
+    'core.tasks.refresh_similar_journalists',
+    'core.tasks.rollup_db_stats',
+]
+CELERY_TASK_ANNOTATIONS = {
+    task_name: {'ignore_result': False, 'track_started': True}
+    for task_name in CELERY_DURABLE_RESULT_TASKS
+}
+TASK_TELEMETRY_BACKENDS = [
+    'core.utils.task_telemetry.AggregatingTelemetry',
+    'core.utils.task_telemetry.RedisRecentTasks',
+]
+TASK_TELEMETRY_FLUSH_SECONDS = 30
+TASK_TELEMETRY_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_TASK_TIME_LIMIT = 900  # 15 minutes
 CELERY_TASK_SOFT_TIME_LIMIT = 800  # ~13 minutes
 CELERY_WORKER_MAX_MEMORY_PER_CHILD = 250000  # 250MB
@@ -382,7 +415,6 @@ CELERY_TASK_ACKS_LATE = True
 CELERY_WORKER_SEND_TASK_EVENTS = True
 CELERY_TASK_SEND_SENT_EVENT = True
 CELERY_TASK_STORE_ERRORS_EVEN_IF_IGNORED = True
-CELERY_TASK_STORE_SUCCESS = True
 
 # Task queues configuration
 CELERY_TASK_DEFAULT_QUEUE = 'default'
@@ -392,6 +424,7 @@ CELERY_TASK_QUEUES = {
     'process': {},
     'categorize': {},
     'typesense': {},  # Add dedicated queue for Typesense tasks
+    'email': {},  # User-facing email lookups, kept clear of long batch jobs
 }
 
 CELERY_TASK_ROUTES = {
@@ -404,7 +437,50 @@ CELERY_TASK_ROUTES = {
     'core.tasks.categorize_pages_task': {'queue': 'categorize'},
     'core.tasks.sync_typesense_index': {'queue': 'typesense'},
     'core.tasks.migrate_to_typesense_task': {'queue': 'typesense'},
+    'core.tasks.lookup_journalist_email': {'queue': 'email'},
+    'core.tasks.enrich_saved_list': {'queue': 'email'},
+    'process_journalists_batch_task': {'queue': 'process'},
+    'categorize_pages_batch_task': {'queue': 'categorize'},
+}
+
+# Per-page work is collected into batches: (batch size, seconds before a partial batch is sent)
+PAGE_BATCHES = {
+    'process_journalists_batch_task': (20, 30),
+    'categorize_pages_batch_task': (50, 60),
 }
+PAGE_BATCH_LLM_CONCURRENCY = 5  # LLM calls in flight per batch task
+TASK_BATCH_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# Crawl planner: page budgets and recrawl intervals scale with each source's
+# yield relative to the average source, within these bounds
+CRAWL_DEFAULT_PAGE_BUDGET = 2000
+CRAWL_MIN_PAGE_BUDGET = 200
+CRAWL_MAX_PAGE_BUDGET = 10000
+CRAWL_DEFAULT_RECRAWL_DAYS = 7
+CRAWL_MIN_RECRAWL_DAYS = 1
+CRAWL_MAX_RECRAWL_DAYS = 60
+CRAWL_YIELD_WINDOW_DAYS = 90
+CRAWL_PRIORITY_BOOST = 2.0
+
+# URL classifier: crawled URLs unlikely to be articles are not stored (skip) or
+# are left for the sweep instead of queued for extraction (defer)
+URL_CLASSIFIER_SKIP_BELOW = 0.05
+URL_CLASSIFIER_DEFER_BELOW = 0.3
+URL_CLASSIFIER_MIN_SAMPLES = 200  # Labelled pages, including the all-sources prior, before URLs are filtered
+
+# Crawled pages whose estimated text similarity to a stored page is at least
+# this are kept as body-less duplicates of it, see core/utils/near_duplicates.py
+NEAR_DUPLICATE_SIMILARITY = 0.7
+
+# Claimed pages/journalists go back to their queue if not finished within this,
+# keep it above the task time limit so a slow batch isn't picked up twice
+WORK_LEASE_SECONDS = 40 * 60
+
+# Find-email lookups still pending or running after this are marked failed, so a
+# lost task doesn't block new lookups for the journalist forever
+EMAIL_LOOKUP_TIMEOUT_SECONDS = 40 * 60
+# Same for bulk list enrichments, which also get their unused credits refunded
+LIST_ENRICHMENT_TIMEOUT_SECONDS = 40 * 60
 
 CELERY_BEAT_SCHEDULE = {
     #'continuous-crawl': {
@@ -440,6 +516,79 @@ CELERY_BEAT_SCHEDULE = {
             'acks_late': True,
         }
     },
+    'refresh-example-journalist-pool': {
+        'task': 'core.tasks.refresh_example_journalist_pool',
+        'schedule': 3600.0,  # Run every hour
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'rollup-db-stats': {
+        'task': 'core.tasks.rollup_db_stats',
+        'schedule': crontab(hour=0, minute=5),  # Run nightly after the day rolls over
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'update-journalist-embeddings': {
+        'task': 'core.tasks.update_journalist_embeddings',
+        'schedule': 3600.0,  # Run every hour
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'refresh-similar-journalists': {
+        'task': 'core.tasks.refresh_similar_journalists',
+        'schedule': 3600.0,  # Run every hour, after embeddings have been updated
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'refresh-similar-journalists-full': {
+        'task': 'core.tasks.refresh_similar_journalists',
+        'schedule': crontab(hour=3, minute=0, day_of_week='sunday'),  # Weekly full rebuild
+        'kwargs': {'full': True},
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'refresh-journalist-search-vectors': {
+        'task': 'core.tasks.refresh_journalist_search_vectors',
+        'schedule': 3600.0,  # Run every hour
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'train-url-classifier': {
+        'task': 'core.tasks.train_url_classifier',
+        'schedule': crontab(hour=1, minute=0),  # Run nightly
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'prune-crawl-archive': {
+        'task': 'core.tasks.prune_crawl_archive',
+        'schedule': crontab(hour=2, minute=0),  # Run nightly
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
+    'plan-crawl-budgets': {
+        'task': 'core.tasks.plan_crawl_budgets',
+        'schedule': crontab(hour=0, minute=30),  # Run nightly, after the day's yield is in
+        'options': {
+            'queue': 'default',
+            'acks_late': True,
+        }
+    },
     'sync-blog-posts': {
         'task': 'core.tasks.sync_blog_posts',
         'schedule': 86400.0,  # Run every 24 hours
@@ -455,6 +604,25 @@ TYPESENSE_HOST = '127.0.0.1'  # Using host networking
 TYPESENSE_PORT = '8108'
 TYPESENSE_PROTOCOL = 'http'
 
+# Search failover: Typesense requests slower than the SLO count as failures,
+# and after enough failures the circuit breaker routes search to Postgres
+SEARCH_LATENCY_SLO_SECONDS = 1.0
+SEARCH_BREAKER_FAILURE_THRESHOLD = 5
+SEARCH_BREAKER_COOLDOWN_SECONDS = 60
+
+# Journalist embeddings. Set EMBEDDING_BACKEND=fake to run without the API.
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'azure')
+EMBEDDING_MODEL = os.getenv('AZURE_OPENAI_EMBEDDING_DEPLOYMENT', 'text-embedding-3-small')
+EMBEDDING_BATCH_SIZE = 256  # Texts per API request
+EMBEDDING_CONCURRENCY = 4  # API requests in flight at once
+EMBEDDING_MAX_AGE_DAYS = 30
+
+# Hybrid search: ivfflat lists scanned per query (recall vs latency, see
+# the benchmark_search command), candidates per retriever, and the RRF constant
+SEARCH_IVFFLAT_PROBES = 10
+SEARCH_HYBRID_CANDIDATES = 100
+SEARCH_RRF_K = 60
+
 # WhiteNoise configuration
 WHITENOISE_AUTOREFRESH = True
 WHITENOISE_USE_FINDERS = True